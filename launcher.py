@@ -6,6 +6,7 @@ Developed by Malinda Prabath
 
 import sys
 import os
+import multiprocessing
 
 def main():
     """Launch the YouTube Video Downloader application"""
@@ -31,4 +32,5 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Benchmark the model, controller and info window against recorded responses
+Runs info lookups and downloads offline (see tests/replay.py) and reports the
+time taken together with counts that do not depend on the machine:
+extractions, HTTP requests and bytes served. Save a run as a baseline and
+compare later runs with it to catch regressions; counts must match exactly,
+times may grow by --tolerance.
+
+    python scripts/benchmark_replay.py --save baseline.json
+    python scripts/benchmark_replay.py --compare baseline.json
+    python scripts/benchmark_replay.py --captures tests/fixtures/replay
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+# Add src directory to Python path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(script_dir), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+tests_dir = os.path.join(os.path.dirname(script_dir), 'tests')
+if tests_dir not in sys.path:
+    sys.path.append(tests_dir)  # The replay harness lives with the tests
+
+from core.controller import YouTubeDownloaderController
+from core.history import DownloadHistory
+from core.model import YouTubeDownloaderModel
+from replay import HeadlessView, Replay, load_captures, synthetic_video
+from utils.settings import Settings
+
+
+COUNTS = ('extractions', 'requests', 'bytes')
+
+
+def make_settings(temp_dir: str) -> Settings:
+    """Settings in a scratch folder (nothing is read from or written to the real ones)"""
+    settings = Settings(os.path.join(temp_dir, 'settings.json'))
+    settings.set('download_path', os.path.join(temp_dir, 'downloads'))
+    settings.set('verify_downloads', False)
+    return settings
+
+
+def measure(replay: Replay, func) -> dict:
+    """Run func once; its time and what it cost the replayed site"""
+    extractions, requests, sent = replay.total_extractions, replay.server.requests, replay.server.bytes_sent
+    started = time.perf_counter()
+    func()
+    return {
+        'seconds': time.perf_counter() - started,
+        'extractions': replay.total_extractions - extractions,
+        'requests': replay.server.requests - requests,
+        'bytes': replay.server.bytes_sent - sent
+    }
+
+
+def scenarios(urls: list) -> list:
+    """(name, setup, run) for every benchmark; setup returns what run needs and what to close"""
+    def model_setup(temp_dir):
+        model = YouTubeDownloaderModel(make_settings(temp_dir))
+        return model, model.shutdown
+    
+    def controller_setup(temp_dir):
+        controller = YouTubeDownloaderController(make_settings(temp_dir), HeadlessView())
+        controller.model.history = DownloadHistory(os.path.join(temp_dir, 'history.jsonl'))
+        
+        def close():
+            controller.queue.stop()
+            controller.model.shutdown()
+        return controller, close
+    
+    def lookups(model):
+        for url in urls:
+            assert model.get_video_info(url).success
+            assert model.get_available_formats(url).success
+    
+    def downloads(backend):
+        def run(model):
+            for url in urls:
+                result = model.download_video(url, backend=backend)
+                assert result.success, result.error_message
+        return run
+    
+    def controller_flow(controller):
+        for url in urls:
+            controller.handle_get_info(url)
+            controller.handle_download(url)
+        assert not controller.view.named('show_error'), controller.view.named('show_error')
+    
+    return [
+        ('model: info + formats', model_setup, lookups),
+        ('model: download (yt-dlp)', model_setup, downloads('yt-dlp')),
+        ('model: download (native)', model_setup, downloads('native')),
+        ('controller: info + download', controller_setup, controller_flow),
+    ]
+
+
+def info_window(replay: Replay, url: str):
+    """Time to build and lay out the info window (None without a display)"""
+    import tkinter as tk
+    from ui.view import VideoInfoWindow
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        return None
+    root.withdraw()
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            model = YouTubeDownloaderModel(make_settings(temp_dir))
+            try:
+                info = dict(model.get_video_info(url).info, url=url, download_path=temp_dir)
+                
+                def show():
+                    window = VideoInfoWindow(root, info, model.thumbnails)
+                    root.update()
+                    window.close_window()
+                return measure(replay, show)
+            finally:
+                model.shutdown()
+    finally:
+        root.destroy()
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Regressions against a saved run"""
+    problems = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        for count in COUNTS:
+            if result[count] > before[count]:
+                problems.append(f"{name}: {count} {before[count]} -> {result[count]}")
+        if result['seconds'] > before['seconds'] * (1 + tolerance):
+            problems.append(f"{name}: {before['seconds']:.3f}s -> {result['seconds']:.3f}s")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--captures', help='folder of recorded captures (default: synthetic videos)')
+    parser.add_argument('--videos', type=int, default=5, help='synthetic videos per run')
+    parser.add_argument('--media-kb', type=int, default=2048, help='largest synthetic format')
+    parser.add_argument('--rate-kb', type=int, help='per-connection rate of the replay server')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per benchmark (best is reported)')
+    parser.add_argument('--save', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='baseline JSON file to check against')
+    parser.add_argument('--verbose', action='store_true', help="show yt-dlp's output")
+    parser.add_argument('--tolerance', type=float, default=0.5, help='allowed slowdown against the baseline')
+    args = parser.parse_args(argv)
+    
+    if args.captures:
+        captures = load_captures(args.captures)
+        if not captures:
+            parser.error(f'No captures in {args.captures}')
+    else:
+        captures = [synthetic_video(f'bench{index:06d}', media_size=args.media_kb * 1024) for index in range(args.videos)]
+    urls = [item.url for item in captures if item.info.get('_type', 'video') == 'video']
+    
+    results = {}
+    output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with output, Replay(captures, rate=args.rate_kb * 1024 if args.rate_kb else None) as replay:
+        for name, setup, run in scenarios(urls):
+            runs = []
+            for _ in range(args.repeat):
+                with tempfile.TemporaryDirectory() as temp_dir:
+                    target, close = setup(temp_dir)
+                    try:
+                        runs.append(measure(replay, lambda: run(target)))
+                    finally:
+                        close()
+            results[name] = min(runs, key=lambda result: result['seconds'])
+        window = info_window(replay, urls[0])
+        if window is not None:
+            results['info window'] = window
+    
+    print(f"{len(urls)} videos, best of {args.repeat}")
+    print(f"{'benchmark':<32}{'seconds':>10}{'extractions':>13}{'requests':>10}{'MB':>10}")
+    for name, result in results.items():
+        print(f"{name:<32}{result['seconds']:>10.3f}{result['extractions']:>13}"
+              f"{result['requests']:>10}{result['bytes'] / 1024 / 1024:>10.1f}")
+    
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as fh:
+            json.dump(results, fh, indent=2)
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as fh:
+            problems = compare(results, json.load(fh), args.tolerance)
+        for problem in problems:
+            print(f"Regression: {problem}")
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark the download write path against a local HTTP server
+Compares block-by-block writes (the old behaviour) with buffered writes,
+preallocation and fsync policies. Point --dir at the drive you download to
+(e.g. a network share) to see the difference there.
+
+    python scripts/benchmark_writes.py --size-mb 512 --connections 4 --dir /mnt/share
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add src directory to Python path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(script_dir), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from core.backends import NativeHttpBackend
+from utils.config import Config
+
+
+# (name, write buffer, preallocate, fsync policy)
+CONFIGURATIONS = [
+    ('block writes (old)', 0, False, 'never'),
+    ('buffered', Config.WRITE_BUFFER_SIZE, False, 'never'),
+    ('buffered + preallocate', Config.WRITE_BUFFER_SIZE, True, 'never'),
+    ('buffered + preallocate + fsync end', Config.WRITE_BUFFER_SIZE, True, 'end'),
+    ('buffered + preallocate + fsync interval', Config.WRITE_BUFFER_SIZE, True, 'interval'),
+]
+
+
+def make_handler(payload: bytes):
+    """Request handler serving payload from memory with range support"""
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        
+        def do_GET(self):
+            start, end = 0, len(payload) - 1
+            header = self.headers.get('Range')
+            if header:
+                first, last = header.split('=', 1)[1].split('-')
+                start, end = int(first), min(int(last), end)
+                self.send_response(206)
+                self.send_header('Content-Range', f'bytes {start}-{end}/{len(payload)}')
+            else:
+                self.send_response(200)
+            self.send_header('Content-Length', str(end - start + 1))
+            self.end_headers()
+            view = memoryview(payload)
+            for offset in range(start, end + 1, 1024 * 1024):
+                self.wfile.write(view[offset:min(offset + 1024 * 1024, end + 1)])
+        
+        def log_message(self, format, *args):
+            pass
+    
+    return StubHandler
+
+
+class CountingBackend(NativeHttpBackend):
+    """Keeps the writers it creates so their write counts can be reported"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.writers = []
+    
+    def _writer(self, part_path, size):
+        writer = super()._writer(part_path, size)
+        self.writers.append(writer)
+        return writer
+
+
+def run(url: str, target: str, connections: int, buffer_size: int, allocate: bool, fsync: str) -> tuple:
+    """One download; returns (seconds, write calls)"""
+    backend = CountingBackend(connections=connections)
+    backend.configure_writes(buffer_size, allocate, fsync)
+    started = time.perf_counter()
+    backend.transfer(url, target)
+    elapsed = time.perf_counter() - started
+    os.remove(target)
+    return elapsed, sum(writer.writes for writer in backend.writers)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size-mb', type=int, default=256, help='size of the test file')
+    parser.add_argument('--connections', type=int, default=Config.NATIVE_HTTP_CONNECTIONS)
+    parser.add_argument('--repeat', type=int, default=3, help='runs per configuration (best is reported)')
+    parser.add_argument('--dir', help='folder to write to (default: a temporary folder)')
+    args = parser.parse_args(argv)
+    
+    payload = os.urandom(args.size_mb * 1024 * 1024)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(payload))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_address[1]}/video.mp4'
+    
+    print(f"{args.size_mb} MB over {args.connections} connections, best of {args.repeat}")
+    print(f"{'configuration':<42}{'MB/s':>10}{'writes':>10}")
+    try:
+        with tempfile.TemporaryDirectory(dir=args.dir) as temp_dir:
+            target = os.path.join(temp_dir, 'video.mp4')
+            for name, buffer_size, allocate, fsync in CONFIGURATIONS:
+                runs = [run(url, target, args.connections, buffer_size, allocate, fsync) for _ in range(args.repeat)]
+                elapsed, writes = min(runs)
+                print(f"{name:<42}{args.size_mb / elapsed:>10.1f}{writes:>10}")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
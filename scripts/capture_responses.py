@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Record extractor responses for offline tests and benchmarks (needs the network)
+Each URL is extracted once; its info dict, the media of the formats picked by
+--format (cut to --max-mb) and its thumbnails are saved under --out, where
+tests/test_app.py and scripts/benchmark_replay.py --captures pick them up.
+
+    python scripts/capture_responses.py https://www.youtube.com/watch?v=... --out tests/fixtures/replay
+"""
+
+import argparse
+import os
+import sys
+
+# Add src directory to Python path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(script_dir), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+tests_dir = os.path.join(os.path.dirname(script_dir), 'tests')
+if tests_dir not in sys.path:
+    sys.path.append(tests_dir)  # The replay harness lives with the tests
+
+from replay import CAPTURE_FORMAT, MAX_CAPTURE_BYTES, capture
+from utils.config import Config
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('urls', nargs='+', help='video or playlist URLs')
+    parser.add_argument('--out', default=os.path.join(os.path.dirname(script_dir), 'tests', 'fixtures', 'replay'))
+    parser.add_argument('--format', default=CAPTURE_FORMAT, help='formats whose media is captured')
+    parser.add_argument('--max-mb', type=float, default=MAX_CAPTURE_BYTES / 1024 / 1024,
+                        help='media beyond this size is cut off')
+    parser.add_argument('--entries', type=int, default=Config.PLAYLIST_PAGE_SIZE, help='playlist entries kept')
+    args = parser.parse_args(argv)
+    
+    failed = 0
+    for url in args.urls:
+        try:
+            item = capture(url, args.format, int(args.max_mb * 1024 * 1024), args.entries)
+            folder = item.save(args.out)
+            size = sum(len(data) for data in item.media.values())
+            print(f"Captured {item.info.get('title', url)} ({size / 1024 / 1024:.1f} MB of media) to {folder}")
+        except Exception as e:
+            failed += 1
+            print(f"Error capturing {url}: {str(e)}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
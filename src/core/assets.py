@@ -0,0 +1,194 @@
+"""
+Asset module for YouTube Video Downloader
+Fetches subtitles and thumbnails for single videos or whole batches,
+reusing metadata already extracted by get_video_info
+"""
+
+import os
+import shutil
+import threading
+import time
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from yt_dlp.utils import sanitize_filename
+
+from core.templates import template_metadata
+from utils.config import Config
+
+
+def _match_language(available: list, wanted: str) -> Optional[str]:
+    """Find a subtitle language matching wanted exactly or by prefix (en -> en-US)"""
+    if wanted in available:
+        return wanted
+    for lang in available:
+        if lang.split('-')[0] == wanted:
+            return lang
+    return None
+
+
+def select_assets(info: dict) -> dict:
+    """Reduce a full yt-dlp info dict to the subtitle and thumbnail URLs we need"""
+    subtitles = {}
+    # Manual subtitles take priority over automatic captions
+    for source in (info.get('automatic_captions') or {}, info.get('subtitles') or {}):
+        for lang, tracks in source.items():
+            formats = [(track.get('ext'), track.get('url')) for track in tracks if track.get('url')]
+            if formats:
+                subtitles[lang] = formats
+    
+    thumbnail = info.get('thumbnail')
+    thumbnails = [thumb for thumb in info.get('thumbnails') or [] if thumb.get('url')]
+    if thumbnails:
+        best = max(thumbnails, key=lambda thumb: (thumb.get('preference') or 0, thumb.get('width') or 0))
+        thumbnail = best['url']
+    
+    # Smallest JPEG that still fills the info window preview
+    preview = thumbnail
+    min_width = Config.THUMBNAIL_PREVIEW_SIZE[0]
+    candidates = [thumb for thumb in thumbnails
+                  if (thumb.get('width') or 0) >= min_width and thumb['url'].split('?')[0].endswith('.jpg')]
+    if candidates:
+        preview = min(candidates, key=lambda thumb: thumb['width'])['url']
+    
+    return {
+        'id': info.get('id'),
+        'title': info.get('title', 'Unknown Title'),
+        'metadata': template_metadata(info),
+        'subtitles': subtitles,
+        'thumbnail': thumbnail,
+        'preview_thumbnail': preview
+    }
+
+
+class AssetCache:
+    """
+    Thread-safe LRU cache of selected assets keyed by video ID and URL
+    Entries expire after max_age seconds, since the media URLs in them are signed
+    """
+    
+    def __init__(self, max_entries: int, max_age: Optional[float] = None):
+        self.max_entries = max_entries
+        self.max_age = Config.ASSET_CACHE_SECONDS if max_age is None else max_age
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[dict]:
+        """Get cached assets and mark them as recently used"""
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None:
+                return None
+            expires, entry = cached
+            if time.monotonic() >= expires:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+    
+    def put(self, keys: list, entry: dict):
+        """Store assets under every key (video ID, original URL)"""
+        expires = time.monotonic() + self.max_age
+        with self._lock:
+            for key in keys:
+                if key:
+                    self._entries[key] = (expires, entry)
+                    self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class AssetFetcher:
+    """
+    Downloads subtitles and thumbnails concurrently, without re-extracting cached videos
+    output_name(metadata) gives the file name (relative, no extension) the video
+    itself gets, so the assets land next to it; the default is the sanitized title
+    """
+    
+    def __init__(self, extractor: Callable[[str], dict], cache_size: Optional[int] = None,
+                 max_workers: Optional[int] = None, output_name: Optional[Callable[[dict], str]] = None):
+        self.extractor = extractor
+        self.cache = AssetCache(cache_size or Config.ASSET_CACHE_SIZE)
+        self.max_workers = max_workers or Config.ASSET_FETCH_WORKERS
+        self.output_name = output_name or (lambda metadata: sanitize_filename(metadata.get('title', 'Unknown Title')))
+    
+    def remember(self, info: dict, url: Optional[str] = None) -> dict:
+        """Cache the assets of an already extracted video"""
+        assets = select_assets(info)
+        self.cache.put([assets['id'], url, info.get('webpage_url')], assets)
+        return assets
+    
+    def get_assets(self, url: str) -> dict:
+        """Get assets for a URL, extracting only on a cache miss"""
+        assets = self.cache.get(url)
+        if assets is None:
+            assets = self.remember(self.extractor(url), url)
+        return assets
+    
+    def fetch(self, url: str, download_path: str, languages: Optional[list] = None,
+              subtitles: bool = True, thumbnail: bool = True) -> dict:
+        """
+        Fetch subtitles and/or thumbnail for one video
+        Returns status dictionary with success/error information
+        """
+        languages = Config.SUBTITLE_LANGUAGES if languages is None else languages
+        try:
+            assets = self.get_assets(url)
+            base = os.path.join(download_path, self.output_name(assets['metadata']))
+            os.makedirs(os.path.dirname(base), exist_ok=True)
+            files = []
+            
+            if subtitles:
+                for wanted in languages:
+                    lang = _match_language(list(assets['subtitles']), wanted)
+                    if lang is None:
+                        continue
+                    ext, sub_url = self._pick_subtitle_format(assets['subtitles'][lang])
+                    files.append(self._download(sub_url, f'{base}.{lang}.{ext}'))
+            
+            if thumbnail and assets['thumbnail']:
+                ext = os.path.splitext(assets['thumbnail'].split('?')[0])[1] or '.jpg'
+                files.append(self._download(assets['thumbnail'], f'{base}{ext}'))
+            
+            return {
+                'success': True,
+                'url': url,
+                'files': files,
+                'message': f'Fetched {len(files)} file(s) for {assets["title"]}'
+            }
+        
+        except Exception as e:
+            return {
+                'success': False,
+                'url': url,
+                'error': f'Asset fetch failed: {str(e)}'
+            }
+    
+    def fetch_batch(self, urls: list, download_path: str, languages: Optional[list] = None,
+                    subtitles: bool = True, thumbnail: bool = True) -> list:
+        """Fetch assets for many videos concurrently, results in input order"""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(
+                lambda url: self.fetch(url, download_path, languages, subtitles, thumbnail),
+                urls
+            ))
+    
+    def _pick_subtitle_format(self, formats: list) -> tuple:
+        """Prefer the configured subtitle format, otherwise take the first one"""
+        for ext, url in formats:
+            if ext == Config.SUBTITLE_FORMAT:
+                return ext, url
+        return formats[0]
+    
+    def _download(self, url: str, path: str) -> str:
+        """Download a file unless it is already on disk, streaming it in blocks"""
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            return path
+        
+        temp_path = f'{path}.{threading.get_ident()}.part'
+        with urllib.request.urlopen(url, timeout=Config.TIMEOUT) as response, open(temp_path, 'wb') as fh:
+            shutil.copyfileobj(response, fh, Config.NATIVE_HTTP_BLOCK_SIZE)
+        os.replace(temp_path, path)
+        return path
@@ -0,0 +1,290 @@
+"""
+Download backends for YouTube Video Downloader
+download_video describes a download as yt-dlp options and hands it to a
+backend; backends differ only in how the bytes are transferred
+"""
+
+import copy
+import os
+import shutil
+import threading
+import time
+import urllib.request
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+import yt_dlp
+from yt_dlp.utils import format_bytes
+
+from core.scheduler import get_scheduler
+from core.writer import DownloadWriter, fsync_file
+from utils.config import Config
+
+
+class DownloadBackend(ABC):
+    """
+    Transfer engine interface
+    download() takes yt-dlp style options (outtmpl, format, progress_hooks, ...)
+    and returns the info dict with requested_downloads[0]['filepath'] set;
+    progress is reported through the options' progress_hooks in yt-dlp's format
+    info, when given, is an unprocessed extraction of url that is reused
+    instead of extracting the video again
+    """
+    
+    name = ''
+    write_buffer = Config.WRITE_BUFFER_SIZE
+    preallocate = Config.PREALLOCATE_DOWNLOADS
+    fsync = Config.FSYNC_POLICY
+    
+    def configure_writes(self, buffer_size: int, preallocate: bool, fsync: str):
+        """Apply the write path settings (buffering and preallocation are used where the engine writes itself)"""
+        self.write_buffer = buffer_size
+        self.preallocate = preallocate
+        self.fsync = fsync
+    
+    def is_available(self) -> bool:
+        """Whether the engine can run on this machine"""
+        return True
+    
+    def extract_info(self, url: str, options: dict) -> dict:
+        """Metadata with the format selected by options['format'] (no download), under the request scheduler"""
+        def extract():
+            with yt_dlp.YoutubeDL(dict(options, quiet=True)) as ydl:
+                return ydl.extract_info(url, download=False)
+        return get_scheduler().run(url, extract, source='download')
+    
+    def select_format(self, info: dict, options: dict) -> dict:
+        """Apply options['format'] to an unprocessed extraction (no network; info itself is left untouched)"""
+        with yt_dlp.YoutubeDL(dict(options, quiet=True)) as ydl:
+            return ydl.process_ie_result(copy.deepcopy(info), download=False)
+    
+    @abstractmethod
+    def download(self, url: str, options: dict, info: Optional[dict] = None) -> dict:
+        """Download url and return its info dict"""
+    
+    def prepare_filename(self, info: dict, options: dict, outtmpl: Optional[str] = None) -> str:
+        """File name yt-dlp would use for info under options"""
+        with yt_dlp.YoutubeDL(dict(options, quiet=True)) as ydl:
+            return ydl.prepare_filename(info, outtmpl=outtmpl)
+
+
+class YtDlpBackend(DownloadBackend):
+    """yt-dlp's own downloaders (the default)"""
+    
+    name = 'yt-dlp'
+    
+    def download(self, url: str, options: dict, info: Optional[dict] = None) -> dict:
+        with yt_dlp.YoutubeDL(options) as ydl:
+            if info:
+                info = ydl.process_ie_result(copy.deepcopy(info), download=True)
+            else:
+                info = ydl.extract_info(url, download=True)
+        if self.fsync != 'never':
+            for download in info.get('requested_downloads') or []:
+                if download.get('filepath') and os.path.exists(download['filepath']):
+                    fsync_file(download['filepath'])
+        return info
+
+
+class ExternalBackend(YtDlpBackend):
+    """yt-dlp hands each transfer to an external program such as aria2c"""
+    
+    def __init__(self, program: str, args: Optional[list] = None):
+        self.name = program
+        self.program = program
+        self.args = list(args or [])
+    
+    def is_available(self) -> bool:
+        return shutil.which(self.program) is not None
+    
+    def download(self, url: str, options: dict, info: Optional[dict] = None) -> dict:
+        options = dict(options, external_downloader={'default': self.program})
+        if self.args:
+            options['external_downloader_args'] = {self.program: self.args}
+        return super().download(url, options, info)
+
+
+class NativeHttpBackend(DownloadBackend):
+    """
+    Fetches single-file HTTP formats itself, over several connections in parallel
+    Anything else (merged formats, subtitles, clips, rate limits, HLS/DASH)
+    falls back to yt-dlp; concurrent_fragment_downloads overrides the connection count
+    """
+    
+    name = 'native'
+    FALLBACK_OPTIONS = ('writesubtitles', 'writethumbnail', 'download_ranges', 'ratelimit', 'external_downloader')
+    
+    def __init__(self, connections: Optional[int] = None, chunk_size: Optional[int] = None,
+                 fallback: Optional[DownloadBackend] = None):
+        self.connections = connections or Config.NATIVE_HTTP_CONNECTIONS
+        self.chunk_size = chunk_size or Config.NATIVE_HTTP_CHUNK_SIZE
+        self.fallback = fallback or YtDlpBackend()
+    
+    def download(self, url: str, options: dict, info: Optional[dict] = None) -> dict:
+        if (any(options.get(key) for key in self.FALLBACK_OPTIONS) or ',' in options.get('format', '')
+                or not isinstance(options.get('outtmpl', ''), str)):
+            return self.fallback.download(url, options, info)
+        
+        selected = self.select_format(info, options) if info else self.extract_info(url, options)
+        if (selected.get('requested_formats') or selected.get('protocol') not in ('http', 'https')
+                or not selected.get('url')):
+            return self.fallback.download(url, options, info)
+        
+        filepath = self.prepare_filename(selected, options)
+        size = self.transfer(selected['url'], filepath, selected.get('http_headers') or {},
+                             options.get('progress_hooks') or [], options.get('concurrent_fragment_downloads'),
+                             selected.get('filesize'))
+        selected['filepath'] = filepath
+        selected['requested_downloads'] = [{'filepath': filepath, 'format_id': selected.get('format_id'), 'filesize': size}]
+        return selected
+    
+    def transfer(self, url: str, filepath: str, headers: Optional[dict] = None,
+                 hooks: Optional[list] = None, connections: Optional[int] = None,
+                 size_hint: Optional[int] = None) -> int:
+        """
+        Download url to filepath (via a .part file); returns the number of bytes
+        size_hint (the filesize from the video info) is used for preallocation
+        when the server does not report the size
+        """
+        connections = connections or self.connections
+        headers = dict(headers or {})
+        hooks = hooks or []
+        part_path = f'{filepath}.part'
+        os.makedirs(os.path.dirname(os.path.abspath(filepath)) or '.', exist_ok=True)
+        progress = _Progress(filepath, hooks)
+        try:
+            total = self._probe_size(url, headers)
+            progress.total = total or size_hint
+            if total is None or total <= self.chunk_size or connections == 1:
+                self._fetch_whole(url, headers, part_path, progress)
+            else:
+                self._fetch_ranges(url, headers, part_path, total, connections, progress)
+            os.replace(part_path, filepath)
+        except BaseException:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            raise
+        progress.finish()
+        return progress.downloaded
+    
+    def _probe_size(self, url: str, headers: dict) -> Optional[int]:
+        """Total size if the server supports range requests, else None"""
+        request = urllib.request.Request(url, headers=dict(headers, Range='bytes=0-0'))
+        with urllib.request.urlopen(request, timeout=Config.TIMEOUT) as response:
+            content_range = response.headers.get('Content-Range') or ''
+            if response.status != 206 or '/' not in content_range:
+                return None
+            total = content_range.rsplit('/', 1)[1]
+            return int(total) if total.isdigit() else None
+    
+    def _writer(self, part_path: str, size: Optional[int]) -> DownloadWriter:
+        return DownloadWriter(part_path, size, self.write_buffer, self.preallocate, self.fsync)
+    
+    def _fetch_whole(self, url: str, headers: dict, part_path: str, progress: '_Progress'):
+        """Single connection, streamed in blocks"""
+        request = urllib.request.Request(url, headers=headers)
+        with urllib.request.urlopen(request, timeout=Config.TIMEOUT) as response:
+            length = response.headers.get('Content-Length')
+            if length and length.isdigit():
+                progress.total = int(length)
+            with self._writer(part_path, progress.total) as writer:
+                stream = writer.stream()
+                while True:
+                    block = response.read(Config.NATIVE_HTTP_BLOCK_SIZE)
+                    if not block:
+                        break
+                    stream.write(block)
+                    progress.add(len(block))
+                stream.flush()
+    
+    def _fetch_ranges(self, url: str, headers: dict, part_path: str, total: int, connections: int,
+                      progress: '_Progress'):
+        """Fetch fixed-size ranges on a pool of connections, each written at its offset"""
+        writer = self._writer(part_path, total)
+        ranges = [(start, min(start + self.chunk_size, total) - 1) for start in range(0, total, self.chunk_size)]
+        
+        def fetch(byte_range):
+            start, end = byte_range
+            request = urllib.request.Request(url, headers=dict(headers, Range=f'bytes={start}-{end}'))
+            with urllib.request.urlopen(request, timeout=Config.TIMEOUT) as response:
+                if response.status != 206:
+                    raise OSError(f'Server ignored the range request (HTTP {response.status})')
+                stream = writer.stream(start)
+                remaining = end - start + 1
+                while remaining > 0:
+                    block = response.read(min(Config.NATIVE_HTTP_BLOCK_SIZE, remaining))
+                    if not block:
+                        raise OSError(f'Connection closed {remaining} bytes early')
+                    stream.write(block)
+                    remaining -= len(block)
+                    progress.add(len(block))
+                stream.flush()
+        
+        with writer, ThreadPoolExecutor(max_workers=connections, thread_name_prefix='native-http') as executor:
+            for _ in executor.map(fetch, ranges):
+                pass
+
+
+class _Progress:
+    """Thread-safe byte counter that calls yt-dlp style progress hooks a few times a second"""
+    
+    def __init__(self, filepath: str, hooks: list):
+        self.filepath = filepath
+        self.hooks = hooks
+        self.total: Optional[int] = None
+        self.downloaded = 0
+        self.started = time.monotonic()
+        self._last_report = 0.0
+        self._lock = threading.Lock()
+    
+    def add(self, count: int):
+        with self._lock:
+            self.downloaded += count
+            now = time.monotonic()
+            if now - self._last_report < 0.25:
+                return
+            self._last_report = now
+            status = self._status('downloading', now)
+        self._call(status)
+    
+    def finish(self):
+        self._call(self._status('finished', time.monotonic()))
+    
+    def _status(self, state: str, now: float) -> dict:
+        elapsed = max(now - self.started, 1e-6)
+        speed = self.downloaded / elapsed
+        percent = self.downloaded * 100 / self.total if self.total else 0
+        return {
+            'status': state,
+            'filename': self.filepath,
+            'downloaded_bytes': self.downloaded,
+            'total_bytes': self.total,
+            'elapsed': elapsed,
+            'speed': speed,
+            '_percent_str': f'{percent:.1f}%',
+            '_speed_str': f'{format_bytes(speed)}/s'
+        }
+    
+    def _call(self, status: dict):
+        for hook in self.hooks:
+            hook(status)
+
+
+BACKENDS = {
+    'yt-dlp': YtDlpBackend,
+    'native': NativeHttpBackend,
+    'aria2c': lambda: ExternalBackend('aria2c', Config.ARIA2C_ARGS),
+}
+
+
+def register_backend(name: str, factory: Callable[[], DownloadBackend]):
+    """Make another transfer engine selectable by name"""
+    BACKENDS[name] = factory
+
+
+def create_backend(name: str) -> DownloadBackend:
+    """Backend instance for a name from BACKENDS"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown download backend: {name} (available: {', '.join(BACKENDS)})")
+    return BACKENDS[name]()
@@ -12,17 +12,43 @@ src_dir = os.path.dirname(current_dir)
 if src_dir not in sys.path:
     sys.path.insert(0, src_dir)
 
+from core.exports import batched, export_history, export_queue, import_history, iter_queue_file
+from core.jobs import DownloadJob, DownloadQueue
 from core.model import YouTubeDownloaderModel
+from core.results import DownloadResult
+from core.subscriptions import SubscriptionPoller, SubscriptionStore
 from ui.view import YouTubeDownloaderView
+from utils.config import Config
+from utils.profiler import profiled
+from utils.settings import Settings, get_settings
 import threading
+from concurrent.futures import CancelledError
+from typing import Optional
 
 
 class YouTubeDownloaderController:
     """Controller class that manages interaction between Model and View"""
     
-    def __init__(self):
-        self.model = YouTubeDownloaderModel()
-        self.view = YouTubeDownloaderView()
+    def __init__(self, settings: Optional[Settings] = None, view=None):
+        """settings and view default to the saved settings and the Tk window"""
+        self.settings = settings or get_settings()
+        self.model = YouTubeDownloaderModel(self.settings)
+        self.view = view or YouTubeDownloaderView()
+        self.queue = DownloadQueue(
+            self._run_queued_job,
+            max_workers=self.settings.get('max_concurrent_downloads'),
+            on_update=self._on_job_update
+        )
+        if self.model.throughput is not None:
+            self.model.throughput.on_change = self._on_concurrency_change
+        self.subscriptions = SubscriptionStore().load()
+        self.poller = SubscriptionPoller(
+            self.subscriptions,
+            self.model.history.downloaded_ids,
+            self._enqueue_new_uploads,
+            interval_minutes=self.settings.get('subscription_poll_minutes'),
+            backfill=self.settings.get('subscription_backfill')
+        )
         
         # Set up callbacks
         self.setup_callbacks()
@@ -32,71 +58,269 @@ class YouTubeDownloaderController:
         self.view.set_callbacks(
             download_callback=self.handle_download,
             validate_url_callback=self.model.validate_url,
-            get_info_callback=self.handle_get_info
+            get_info_callback=self.handle_get_info,
+            enqueue_callback=self.handle_enqueue,
+            subscribe_callback=self.handle_subscribe
         )
+        self.view.set_file_callbacks(
+            import_queue=self.handle_import_queue,
+            export_queue=self.handle_export_queue,
+            import_history=self.handle_import_history,
+            export_history=self.handle_export_history
+        )
+        self.view.set_thumbnail_cache(self.model.thumbnails)
     
-    def handle_download(self, url: str):
-        """Handle video download request"""
+    @profiled("download")
+    def handle_download(self, url: str, clip: Optional[dict] = None):
+        """Handle video download request (clip limits it to a time range or chapters)"""
         try:
             # Update UI to show download starting
-            self.view.root.after(0, self.view.show_progress)
-            self.view.root.after(0, self.view.disable_buttons)
-            self.view.root.after(0, self.view.show_info_message, "Starting download...")
+            self.view.post(self.view.show_busy, "Starting download...")
             
             # Progress callback function
             def progress_callback(percent: str, speed: str):
-                self.view.root.after(0, self.view.update_progress, percent, speed)
+                self.view.post_latest('progress', self.view.update_progress, percent, speed)
             
             # Perform download
-            result = self.model.download_video(url, progress_callback)
+            result = self.model.download_video(url, progress_callback, clip=clip)
             
             # Update UI based on result
-            if result['success']:
-                self.view.root.after(0, self.view.show_success, result['message'])
+            if result.success:
+                self.view.post(self.view.show_success, result.message)
+                if result.postprocess:
+                    result.postprocess.add_done_callback(self._on_postprocess_done)
+                self._verify_download(url, result.title, {'clip': clip} if clip else {}, result)
             else:
                 # Check if it's a playlist error and provide helpful guidance
-                if result.get('is_playlist') and result.get('first_video_url'):
-                    error_msg = f"{result['error']}\n\nDid you want to download the first video instead?\nFirst video URL: {result['first_video_url']}"
-                    self.view.root.after(0, self.view.show_playlist_error, error_msg, result['first_video_url'])
+                if result.is_playlist and result.first_video_url:
+                    error_msg = f"{result.error_message}\n\nDid you want to download the first video instead?\nFirst video URL: {result.first_video_url}"
+                    self.view.post(self.view.show_playlist_error, error_msg, result.first_video_url)
                 else:
-                    self.view.root.after(0, self.view.show_error, result['error'])
+                    self.view.post(self.view.show_error, result.error_message)
             
         except Exception as e:
-            self.view.root.after(0, self.view.show_error, f"Unexpected error: {str(e)}")
+            self.view.post(self.view.show_error, f"Unexpected error: {str(e)}")
         
         finally:
             # Re-enable buttons
-            self.view.root.after(0, self.view.enable_buttons)
+            self.view.post(self.view.show_idle)
     
+    def _on_postprocess_done(self, future):
+        """Report the outcome of a background post-processing job"""
+        try:
+            result = future.result()
+        except CancelledError:
+            return  # Dropped at shutdown; the window is already gone
+        except Exception as e:
+            result = {'success': False, 'error': f'Post-processing failed: {str(e)}'}
+        
+        if result['success']:
+            self.view.post(self.view.show_success, result['message'])
+        else:
+            self.view.post(self.view.show_error, result['error'])
+    
+    def handle_enqueue(self, url: str, clip: Optional[dict] = None):
+        """Handle add-to-queue request (playlists are expanded page by page)"""
+        try:
+            self.view.post(self.view.show_job_list, lambda: self.queue.jobs)
+            
+            if self.model.is_playlist_url(url):
+                self.view.post(self.view.show_info_message, "Adding playlist videos to the queue...")
+                added = 0
+                for page in self.model.iter_playlist(url):
+                    self.queue.add_many([self._queue_entry(entry, clip) for entry in page])
+                    added += len(page)
+                message = f"Added {added} videos to the queue"
+            else:
+                self.queue.add(url, options={'clip': clip} if clip else None)
+                message = "Added to the queue"
+            
+            self.view.post(self.view.show_success, message)
+        
+        except Exception as e:
+            self.view.post(self.view.show_error, f"Error adding to queue: {str(e)}")
+    
+    def handle_subscribe(self, url: str):
+        """Handle subscribe request; new uploads are queued on every poll"""
+        try:
+            # Subscribing asks for the list, even from a video link inside it
+            if not self.model.is_playlist_url(url, with_video=True):
+                self.view.post(self.view.show_error, "Subscriptions need a channel or playlist URL")
+                return
+            if not self.subscriptions.add(url):
+                self.view.post(self.view.show_info_message, "Already subscribed")
+                return
+            
+            self.subscriptions.save()
+            self.view.post(self.view.show_info_message, "Checking subscription...")
+            queued = self.poller.poll_url(url)
+            self.poller.start()
+            self.view.post(self.view.show_success, f"Subscribed ({queued} videos queued)")
+        
+        except Exception as e:
+            self.view.post(self.view.show_error, f"Error subscribing: {str(e)}")
+    
+    def handle_import_queue(self, path: str):
+        """Queue the jobs from an exported queue file, reading it batch by batch"""
+        try:
+            self.view.post(self.view.show_job_list, lambda: self.queue.jobs)
+            self.view.post(self.view.show_info_message, "Importing queue...")
+            added = skipped = 0
+            for batch in batched(iter_queue_file(path), Config.IMPORT_BATCH_SIZE):
+                entries = [entry for entry in batch if self.model.validate_url(entry['url'])]
+                skipped += len(batch) - len(entries)
+                if entries:
+                    self.queue.add_many(entries)
+                added += len(entries)
+            message = f"Imported {added} jobs" + (f" ({skipped} invalid URLs skipped)" if skipped else "")
+            self.view.post(self.view.show_success, message)
+        except Exception as e:
+            self.view.post(self.view.show_error, f"Error importing queue: {str(e)}")
+    
+    def handle_export_queue(self, path: str):
+        """Write the unfinished jobs to a JSON Lines or CSV file"""
+        try:
+            count = export_queue(list(self.queue.jobs), path)
+            self.view.post(self.view.show_success, f"Exported {count} jobs to {os.path.basename(path)}")
+        except Exception as e:
+            self.view.post(self.view.show_error, f"Error exporting queue: {str(e)}")
+    
+    def handle_import_history(self, path: str):
+        """Merge another machine's download history (its videos are not downloaded again)"""
+        try:
+            count = import_history(self.model.history, path)
+            self.view.post(self.view.show_success, f"Imported {count} history entries")
+        except Exception as e:
+            self.view.post(self.view.show_error, f"Error importing history: {str(e)}")
+    
+    def handle_export_history(self, path: str):
+        """Write the download history to a JSON Lines or CSV file"""
+        try:
+            count = export_history(self.model.history, path)
+            self.view.post(self.view.show_success, f"Exported {count} history entries to {os.path.basename(path)}")
+        except Exception as e:
+            self.view.post(self.view.show_error, f"Error exporting history: {str(e)}")
+    
+    def open_urls(self, urls: list):
+        """Queue URLs given on the command line or by another launch"""
+        valid = [url for url in urls if self.model.validate_url(url)]
+        if len(valid) < len(urls):
+            self.view.post(self.view.show_error, f"Ignored {len(urls) - len(valid)} invalid URL(s)")
+        if valid:
+            threading.Thread(target=self._enqueue_urls, args=(valid,), daemon=True).start()
+    
+    def handle_remote_urls(self, urls: list):
+        """A second launch handed over its URLs: bring the window forward and queue them"""
+        self.view.post(self.view.bring_to_front)
+        self.open_urls(urls)
+    
+    def _enqueue_urls(self, urls: list):
+        """Add URLs to the queue one after another (playlists are expanded)"""
+        for url in urls:
+            self.handle_enqueue(url)
+    
+    def _enqueue_new_uploads(self, entries: list):
+        """Queue videos found by the subscription poller"""
+        self.view.post(self.view.show_job_list, lambda: self.queue.jobs)
+        self.queue.add_many([self._queue_entry(entry) for entry in entries])
+    
+    def _queue_entry(self, entry: dict, clip: Optional[dict] = None) -> dict:
+        """Turn a playlist entry into a queue entry, reserving its file name up front when possible"""
+        options = {}
+        output_name = self.model.reserve_output_name(entry)
+        if output_name:
+            options['output_name'] = output_name
+        if clip:
+            options['clip'] = clip
+        return {
+            'url': entry['url'],
+            'title': entry.get('title'),
+            'options': options or None
+        }
+    
+    @profiled("download")
+    def _run_queued_job(self, job) -> DownloadResult:
+        """Download one queued job (runs on a queue worker thread)"""
+        def progress_callback(percent: str, speed: str):
+            job.percent = percent
+            job.speed = speed
+            self.view.mark_job_dirty(job.id)
+        
+        options = {key: value for key, value in job.options.items() if key != 'verify_attempts'}
+        result = self.model.download_video(job.url, progress_callback, **options)
+        self._verify_download(job.url, job.title, job.options, result)
+        return result
+    
+    def _on_concurrency_change(self, downloads: int, connections: int):
+        """The adaptive controller picked a new setting (connections apply to the next downloads)"""
+        self.queue.set_limit(downloads)
+    
+    def _verify_download(self, url: str, title: Optional[str], options: dict, result: DownloadResult):
+        """Verify a finished download in the background (never delays the next download)"""
+        future = self.model.verify_download(url, result)
+        if future is not None:
+            future.add_done_callback(
+                lambda done: self._on_verified(url, title, dict(options, output_name=result.output_name), done.result())
+            )
+    
+    def _on_verified(self, url: str, title: Optional[str], options: dict, verification: dict):
+        """Re-queue a download whose file turned out to be incomplete"""
+        if verification['success'] or not verification.get('mismatch'):
+            return
+        
+        attempts = options.get('verify_attempts', 0)
+        if attempts >= Config.MAX_RETRIES:
+            self.view.post(self.view.show_error, f"{verification['error']} (gave up after {attempts} retries)")
+            return
+        
+        try:
+            self.model.discard_download(verification.get('filepath'))
+        except OSError as e:
+            self.view.post(self.view.show_error, f"Could not move incomplete file aside: {str(e)}")
+            return
+        
+        if not options.get('output_name'):
+            options.pop('output_name', None)
+        self.queue.add(url, title, dict(options, verify_attempts=attempts + 1))
+        self.view.post(self.view.show_job_list, lambda: self.queue.jobs)
+        self.view.post(self.view.show_info_message, f"{verification['error']} - download re-queued")
+    
+    def _on_job_update(self, job):
+        """Queue state changed; the job list redraws the row on its next frame"""
+        if job.status in (DownloadJob.CANCELLED, DownloadJob.FAILED):
+            # The file name is free again for a later download
+            self.model.release_output_name(job.options.get('output_name')
+                                           or (job.result.output_name if job.result else None))
+        self.view.mark_job_dirty(job.id)
+    
+    @profiled("get_info")
     def handle_get_info(self, url: str):
         """Handle get video info request"""
         try:
             # Update UI to show info retrieval starting
-            self.view.root.after(0, self.view.show_progress)
-            self.view.root.after(0, self.view.disable_buttons)
-            self.view.root.after(0, self.view.show_info_message, "Retrieving video information...")
+            self.view.post(self.view.show_busy, "Retrieving video information...")
             
             # Get video information
-            info = self.model.get_video_info(url)
+            result = self.model.get_video_info(url)
             
-            if info:
+            if result.success:
                 # Add additional information for the display
+                info = result.info
                 info['url'] = url
                 info['download_path'] = self.model.download_path
                 
                 # Show information in separate window
-                self.view.root.after(0, self.view.show_video_info_window, info)
-                self.view.root.after(0, self.view.show_success, "Video information retrieved successfully")
+                self.view.post(self.view.show_video_info_window, info)
+                self.view.post(self.view.show_success, "Video information retrieved successfully")
             else:
-                self.view.root.after(0, self.view.show_error, "Failed to retrieve video information")
+                self.view.post(self.view.show_error, f"Failed to retrieve video information: {result.error_message}")
             
         except Exception as e:
-            self.view.root.after(0, self.view.show_error, f"Error retrieving info: {str(e)}")
+            self.view.post(self.view.show_error, f"Error retrieving info: {str(e)}")
         
         finally:
             # Re-enable buttons and hide progress
-            self.view.root.after(0, self.view.enable_buttons)
-            self.view.root.after(0, self.view.hide_progress)
+            self.view.post(self.view.show_idle)
     
     def format_video_info(self, info: dict) -> str:
         """Format video information for display"""
@@ -139,11 +363,22 @@ Download Path: {self.model.download_path}
     
     def run(self):
         """Start the application"""
-        self.view.run()
+        try:
+            if self.subscriptions.urls():
+                self.poller.start()
+            if self.model.throughput is not None:
+                self.model.throughput.start()
+            self.view.run()
+        finally:
+            self.poller.stop()
+            self.queue.stop()
+            self.model.shutdown()
     
     def set_download_path(self, path: str):
-        """Set custom download path"""
+        """Set custom download path and remember it for the next start"""
         self.model.set_download_path(path)
+        self.settings.set('download_path', path)
+        self.settings.save()
     
     def get_download_path(self) -> str:
         """Get current download path"""
@@ -0,0 +1,423 @@
+"""
+Distributed mode for YouTube Video Downloader
+A coordinator leases queued URLs to worker processes on other machines over
+HTTP; each worker downloads with its own model and disk and reports the
+result and history entry back, so the coordinator keeps the merged history
+
+    python -m core.distributed coordinator urls.txt --port 8765 --token SECRET
+    python -m core.distributed worker http://coordinator:8765 --token SECRET
+"""
+
+import argparse
+import hmac
+import json
+import os
+import secrets
+import socket
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+
+from core.history import DownloadHistory, make_entry
+from core.jobs import DownloadJob
+from core.results import DownloadResult, ErrorCategory, ResultError
+from utils.config import Config
+
+
+MAX_BODY_BYTES = 1024 * 1024
+WORKER_OPTIONS = ('clip', 'postprocess', 'assets', 'backend')  # Job options a worker passes to download_video
+
+
+class Coordinator:
+    """
+    Holds the URL queue and leases one job at a time to whichever worker asks
+    Pulling keeps fast workers busy without sharding up front; a job whose
+    worker stops sending heartbeats is leased again once its lease expires
+    """
+    
+    def __init__(self, host: str = '0.0.0.0', port: Optional[int] = None, token: Optional[str] = None,
+                 lease_seconds: Optional[int] = None, history: Optional[DownloadHistory] = None):
+        self.host = host
+        self.port = Config.DISTRIBUTED_PORT if port is None else port
+        self.token = token or secrets.token_urlsafe(16)
+        self.lease_seconds = lease_seconds or Config.DISTRIBUTED_LEASE_SECONDS
+        self.history = history or DownloadHistory()
+        self.jobs = []
+        self._jobs_by_id = {}
+        self._pending = deque()
+        self._leases = {}      # job id -> (worker, expiry)
+        self._workers = {}     # worker -> number of finished jobs
+        self._condition = threading.Condition()
+        self._server: Optional[ThreadingHTTPServer] = None
+    
+    def add(self, url: str, options: Optional[dict] = None) -> DownloadJob:
+        """Queue a URL"""
+        job = DownloadJob(url, options=options)
+        with self._condition:
+            self.jobs.append(job)
+            self._jobs_by_id[job.id] = job
+            self._pending.append(job)
+        return job
+    
+    def start(self) -> tuple:
+        """Serve the protocol in the background; returns the bound (host, port)"""
+        handler = type('Handler', (CoordinatorHandler,), {'coordinator': self})
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server.server_address[:2]
+    
+    def stop(self):
+        """Stop serving"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until every job has finished (False on timeout)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while not self._finished():
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                # Wake up regularly so expired leases are noticed without a worker asking
+                self._condition.wait(min(remaining or self.lease_seconds, self.lease_seconds))
+                self._reclaim_expired()
+            return True
+    
+    def summary(self) -> dict:
+        """Job counts by status and finished jobs per worker"""
+        with self._condition:
+            counts = {}
+            for job in self.jobs:
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return {'total': len(self.jobs), 'statuses': counts, 'workers': dict(self._workers)}
+    
+    def lease(self, worker: str) -> dict:
+        """Next job for a worker ({'job': None} when nothing is waiting)"""
+        with self._condition:
+            self._reclaim_expired()
+            if not self._pending:
+                return {'job': None, 'finished': self._finished()}
+            job = self._pending.popleft()
+            job.status = DownloadJob.DOWNLOADING
+            job.message = f'Running on {worker}'
+            self._leases[job.id] = (worker, time.monotonic() + self.lease_seconds)
+            return {
+                'job': {'id': job.id, 'url': job.url, 'options': job.options},
+                'lease_seconds': self.lease_seconds
+            }
+    
+    def heartbeat(self, job_id: int, worker: str) -> bool:
+        """Extend a lease (False if the job was taken away from this worker)"""
+        with self._condition:
+            lease = self._leases.get(job_id)
+            if lease is None or lease[0] != worker:
+                return False
+            self._leases[job_id] = (worker, time.monotonic() + self.lease_seconds)
+            return True
+    
+    def complete(self, job_id: int, worker: str, result: DownloadResult, entry: Optional[dict]) -> bool:
+        """Record a worker's result; retryable failures go back in the queue"""
+        with self._condition:
+            lease = self._leases.get(job_id)
+            if lease is None or lease[0] != worker:
+                return False  # Lease expired and the job was handed to another worker
+            del self._leases[job_id]
+            job = self._jobs_by_id[job_id]
+            job.result = result
+            
+            if not result.success and result.retryable and job.attempts < Config.MAX_RETRIES:
+                job.attempts += 1
+                job.status = DownloadJob.QUEUED
+                job.message = f"Retry {job.attempts}/{Config.MAX_RETRIES}: {result.error_message}"
+                self._pending.append(job)
+            else:
+                job.status = DownloadJob.COMPLETED if result.success else DownloadJob.FAILED
+                job.message = result.message or result.error_message
+                self._workers[worker] = self._workers.get(worker, 0) + 1
+            
+            if entry:
+                try:
+                    self.history.record(dict(entry, worker=worker))
+                except Exception as e:
+                    print(f"Error writing download history: {str(e)}")
+            self._condition.notify_all()
+        return True
+    
+    def _finished(self) -> bool:
+        """Whether every job has reached a final state (lock held)"""
+        return not self._pending and not self._leases
+    
+    def _reclaim_expired(self):
+        """Put jobs whose worker went silent back at the front of the queue (lock held)"""
+        now = time.monotonic()
+        for job_id, (worker, expiry) in list(self._leases.items()):
+            if expiry >= now:
+                continue
+            del self._leases[job_id]
+            job = self._jobs_by_id[job_id]
+            job.attempts += 1
+            if job.attempts > Config.MAX_RETRIES:
+                # Give up on a URL that keeps taking its workers down
+                job.status = DownloadJob.FAILED
+                job.message = f'Lease expired {job.attempts} times (last on {worker})'
+            else:
+                job.status = DownloadJob.QUEUED
+                job.message = f'Lease expired on {worker}'
+                self._pending.appendleft(job)
+            self._condition.notify_all()
+
+
+class CoordinatorHandler(BaseHTTPRequestHandler):
+    """JSON over HTTP: POST /lease, /heartbeat, /complete and GET /status"""
+    
+    coordinator: Coordinator = None
+    
+    def do_GET(self):
+        if not self._authorized():
+            return
+        if self.path == '/status':
+            self._reply(200, self.coordinator.summary())
+        else:
+            self._reply(404, {'error': 'not found'})
+    
+    def do_POST(self):
+        if not self._authorized():
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            if length > MAX_BODY_BYTES:
+                raise ValueError('request too large')
+            body = json.loads(self.rfile.read(length).decode('utf-8'))
+            worker = str(body['worker'])
+            
+            if self.path == '/lease':
+                self._reply(200, self.coordinator.lease(worker))
+            elif self.path == '/heartbeat':
+                self._reply(200, {'ok': self.coordinator.heartbeat(int(body['job_id']), worker)})
+            elif self.path == '/complete':
+                result = DownloadResult.from_dict(body['result'])
+                accepted = self.coordinator.complete(int(body['job_id']), worker, result, body.get('history'))
+                self._reply(200, {'ok': accepted})
+            else:
+                self._reply(404, {'error': 'not found'})
+        except (ValueError, KeyError, TypeError) as e:
+            self._reply(400, {'error': str(e)})
+    
+    def log_message(self, format, *args):
+        """Keep the console quiet (one line per request would drown the summary)"""
+    
+    def _authorized(self) -> bool:
+        """Check the shared token"""
+        expected = f'Bearer {self.coordinator.token}'.encode('utf-8')
+        given = (self.headers.get('Authorization') or '').encode('utf-8')
+        if hmac.compare_digest(given, expected):
+            return True
+        self._reply(401, {'error': 'unauthorized'})
+        return False
+    
+    def _reply(self, status: int, data: dict):
+        """Send a JSON response"""
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def post_json(base_url: str, path: str, token: str, data: dict, timeout: float = 30) -> dict:
+    """POST JSON to the coordinator and return its JSON reply"""
+    request = urllib.request.Request(
+        base_url.rstrip('/') + path,
+        data=json.dumps(data).encode('utf-8'),
+        headers={'Content-Type': 'application/json', 'Authorization': f'Bearer {token}'},
+        method='POST'
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read().decode('utf-8'))
+
+
+def model_runner(model) -> Callable[[str, dict], tuple]:
+    """
+    Job function for a worker: download with the model, wait for post-processing
+    and verification, and return (DownloadResult, history entry or None).
+    The entry goes to the coordinator, so the model's own history stops recording.
+    """
+    model.history = DownloadHistory(model.history.path, read_only=True)
+    
+    def run_job(url: str, options: dict) -> tuple:
+        kwargs = {key: value for key, value in options.items() if key in WORKER_OPTIONS}
+        result = model.download_video(url, **kwargs)
+        if not result.success:
+            return result, None
+        
+        future = model.verify_download(url, result)
+        if future is None:
+            if result.postprocess:
+                processed = result.postprocess.result()
+                result.filepath = processed.get('filepath') or result.filepath
+            return result, make_entry(url, result, {'success': None, 'filepath': result.filepath})
+        
+        verification = future.result()
+        entry = make_entry(url, result, verification)
+        if not verification['success'] and verification.get('mismatch'):
+            # Incomplete file: set it aside and let the coordinator hand the job out again
+            model.discard_download(verification.get('filepath'))
+            result = DownloadResult.failure(
+                ResultError.create(ErrorCategory.NETWORK, verification['error']),
+                url=url, video_id=result.video_id, title=result.title
+            )
+        return result, entry
+    
+    return run_job
+
+
+class Worker:
+    """Leases jobs from a coordinator and runs them one at a time"""
+    
+    def __init__(self, coordinator_url: str, token: str, run_job: Callable[[str, dict], tuple],
+                 name: Optional[str] = None, poll_seconds: Optional[float] = None):
+        self.coordinator_url = coordinator_url
+        self.token = token
+        self.run_job = run_job
+        self.name = name or f'{socket.gethostname()}-{os.getpid()}'
+        self.poll_seconds = Config.DISTRIBUTED_POLL_SECONDS if poll_seconds is None else poll_seconds
+        self.completed = 0
+        self.dropped = 0     # Results that could not be reported to the coordinator
+        self._stopped = threading.Event()
+    
+    def stop(self):
+        """Finish the current job and stop"""
+        self._stopped.set()
+    
+    def run(self, exit_when_done: bool = False):
+        """Work until stopped (or until the coordinator has nothing left, if exit_when_done)"""
+        while not self._stopped.is_set():
+            try:
+                reply = self._post('/lease', {'worker': self.name})
+            except (urllib.error.URLError, OSError, ValueError) as e:
+                print(f"Coordinator not reachable: {str(e)}")
+                self._stopped.wait(self.poll_seconds)
+                continue
+            
+            job = reply.get('job')
+            if job is None:
+                if exit_when_done and reply.get('finished'):
+                    return
+                self._stopped.wait(self.poll_seconds)
+                continue
+            self._run(job, reply.get('lease_seconds') or Config.DISTRIBUTED_LEASE_SECONDS)
+    
+    def _run(self, job: dict, lease_seconds: float):
+        """Run one job with heartbeats and report the outcome"""
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job['id'], lease_seconds / 3, done), daemon=True)
+        heartbeat.start()
+        try:
+            result, entry = self.run_job(job['url'], job['options'] or {})
+        except Exception as e:
+            result, entry = DownloadResult.failure(ResultError.from_exception(e, 'Unexpected error: '), url=job['url']), None
+        finally:
+            done.set()
+        
+        payload = {'worker': self.name, 'job_id': job['id'], 'result': result.to_dict(), 'history': entry}
+        for attempt in range(Config.MAX_RETRIES + 1):
+            try:
+                reply = self._post('/complete', payload)
+            except (urllib.error.URLError, OSError, ValueError) as e:
+                print(f"Could not report job {job['id']}: {str(e)}")
+                time.sleep(self.poll_seconds * 2 ** attempt)
+                continue
+            if reply.get('ok'):
+                self.completed += 1
+            else:
+                print(f"Result of job {job['id']} rejected: its lease expired")
+            return
+        
+        self.dropped += 1
+        print(f"Dropped the result of job {job['id']} ({job['url']}) after {Config.MAX_RETRIES + 1} report attempts; "
+              f"the coordinator hands it out again when the lease expires")
+    
+    def _heartbeat(self, job_id: int, interval: float, done: threading.Event):
+        """Keep the lease alive while a long download runs"""
+        while not done.wait(interval):
+            try:
+                self._post('/heartbeat', {'worker': self.name, 'job_id': job_id})
+            except (urllib.error.URLError, OSError, ValueError):
+                pass  # The lease may lapse; the coordinator then gives the job to another worker
+    
+    def _post(self, path: str, data: dict) -> dict:
+        return post_json(self.coordinator_url, path, self.token, data)
+
+
+def read_urls(path: str) -> list:
+    """URLs from a text file, one per line (blank lines and # comments skipped)"""
+    with open(path, 'r', encoding='utf-8') as fh:
+        return [line.strip() for line in fh if line.strip() and not line.lstrip().startswith('#')]
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Command line entry point for the coordinator and worker roles"""
+    parser = argparse.ArgumentParser(prog='python -m core.distributed', description=__doc__.strip().splitlines()[0])
+    roles = parser.add_subparsers(dest='role', required=True)
+    
+    coordinator_parser = roles.add_parser('coordinator', help='hand out URLs from a file to workers')
+    coordinator_parser.add_argument('urls_file')
+    coordinator_parser.add_argument('--host', default='0.0.0.0')
+    coordinator_parser.add_argument('--port', type=int, default=Config.DISTRIBUTED_PORT)
+    coordinator_parser.add_argument('--token', help='shared secret (generated and printed if omitted)')
+    
+    worker_parser = roles.add_parser('worker', help='download URLs leased from a coordinator')
+    worker_parser.add_argument('coordinator_url')
+    worker_parser.add_argument('--token', required=True)
+    worker_parser.add_argument('--download-path', help='download folder on this machine')
+    worker_parser.add_argument('--name', help='worker name shown in the history')
+    worker_parser.add_argument('--exit-when-done', action='store_true')
+    
+    args = parser.parse_args(argv)
+    
+    if args.role == 'coordinator':
+        coordinator = Coordinator(args.host, args.port, args.token)
+        for url in read_urls(args.urls_file):
+            coordinator.add(url)
+        host, port = coordinator.start()
+        print(f"Coordinating {len(coordinator.jobs)} URL(s) on {host}:{port} (token {coordinator.token})")
+        try:
+            coordinator.wait()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            coordinator.stop()
+        summary = coordinator.summary()
+        print(json.dumps(summary, indent=2))
+        return 0 if summary['statuses'].get(DownloadJob.FAILED, 0) == 0 else 1
+    
+    from core.model import YouTubeDownloaderModel
+    from utils.settings import get_settings
+    
+    settings = get_settings()
+    if args.download_path:
+        settings.set('download_path', args.download_path)
+    model = YouTubeDownloaderModel(settings)
+    worker = Worker(args.coordinator_url, args.token, model_runner(model), name=args.name)
+    print(f"Worker {worker.name} downloading to {model.download_path}")
+    try:
+        worker.run(exit_when_done=args.exit_when_done)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        model.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
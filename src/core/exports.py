@@ -0,0 +1,155 @@
+"""
+Queue and history export/import for YouTube Video Downloader
+Files are JSON Lines or CSV (chosen by extension) and are written and read
+one record at a time, so very large batches use constant memory
+"""
+
+import csv
+import itertools
+import json
+import os
+from typing import Iterable, Iterator
+
+from core.jobs import DownloadJob
+
+
+QUEUE_FIELDS = ('url', 'title', 'status', 'attempts', 'options')
+HISTORY_FIELDS = ('timestamp', 'url', 'id', 'title', 'filepath', 'size', 'checksum', 'verified',
+                  'error', 'bytes_downloaded', 'elapsed', 'backend', 'worker')
+
+# download_video options that mean the same on another machine (reserved names and
+# verification retries do not)
+PORTABLE_OPTIONS = ('clip', 'backend', 'connections', 'postprocess', 'assets')
+
+# How CSV cells are read back (everything else stays a string, empty cells are None)
+_CSV_TYPES = {
+    'options': json.loads,
+    'attempts': int,
+    'size': int,
+    'bytes_downloaded': int,
+    'elapsed': float,
+    'timestamp': float,
+    'verified': lambda value: value.lower() in ('true', '1', 'yes'),
+}
+
+
+def is_csv(path: str) -> bool:
+    """CSV for .csv files, JSON Lines for anything else"""
+    return path.lower().endswith('.csv')
+
+
+def write_records(path: str, records: Iterable[dict], fields: tuple) -> int:
+    """Write records to a temporary file and move it into place; returns the count"""
+    temp_path = f'{path}.tmp'
+    count = 0
+    try:
+        with open(temp_path, 'w', encoding='utf-8', newline='') as fh:
+            if is_csv(path):
+                writer = csv.DictWriter(fh, fieldnames=fields, extrasaction='ignore')
+                writer.writeheader()
+                for record in records:
+                    writer.writerow({field: _csv_cell(record.get(field)) for field in fields})
+                    count += 1
+            else:
+                for record in records:
+                    fh.write(json.dumps(record, ensure_ascii=False, sort_keys=True) + '\n')
+                    count += 1
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return count
+
+
+def iter_records(path: str) -> Iterator[dict]:
+    """Yield records one at a time (unreadable JSON lines are skipped)"""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as fh:
+        if is_csv(path):
+            for row in csv.DictReader(fh):
+                yield {key: _csv_value(key, value) for key, value in row.items() if key}
+            return
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                yield record
+
+
+def _csv_cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, sort_keys=True)
+    return value
+
+
+def _csv_value(key: str, value: str):
+    if value is None or value == '':
+        return None
+    convert = _CSV_TYPES.get(key)
+    try:
+        return convert(value) if convert else value
+    except ValueError:
+        return value
+
+
+def export_queue(jobs: Iterable[DownloadJob], path: str, include_finished: bool = False) -> int:
+    """Write the queue (by default only jobs still to do: queued, running, failed)"""
+    def records():
+        for job in jobs:
+            if job.status == DownloadJob.CANCELLED or (job.status == DownloadJob.COMPLETED and not include_finished):
+                continue
+            options = {key: value for key, value in job.options.items() if key in PORTABLE_OPTIONS}
+            yield {
+                'url': job.url,
+                'title': job.title if job.title != job.url else None,
+                'status': job.status,
+                'attempts': job.attempts,
+                'options': options or None
+            }
+    return write_records(path, records(), QUEUE_FIELDS)
+
+
+def iter_queue_file(path: str) -> Iterator[dict]:
+    """Queue entries ({'url', 'title', 'options'}) from an export, skipping finished jobs"""
+    for record in iter_records(path):
+        url = record.get('url')
+        if not isinstance(url, str) or not url.strip() or record.get('status') == DownloadJob.COMPLETED:
+            continue
+        options = record.get('options')
+        options = {key: value for key, value in options.items() if key in PORTABLE_OPTIONS} if isinstance(options, dict) else {}
+        yield {'url': url.strip(), 'title': record.get('title'), 'options': options or None}
+
+
+def export_history(history, path: str) -> int:
+    """Write every history entry"""
+    return write_records(path, history.iter_entries(), HISTORY_FIELDS)
+
+
+def import_history(history, path: str) -> int:
+    """Append entries for videos the history does not have yet; returns how many were added"""
+    known = {entry.get('id') or entry.get('url') for entry in history.iter_entries()}
+    
+    def new_entries():
+        for record in iter_records(path):
+            key = record.get('id') or record.get('url')
+            if key and key not in known:
+                known.add(key)
+                yield record
+    return history.record_many(new_entries())
+
+
+def batched(iterable: Iterable, size: int) -> Iterator[list]:
+    """Split an iterable into lists of at most size items"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
@@ -0,0 +1,171 @@
+"""
+Extraction module for YouTube Video Downloader
+yt-dlp metadata extraction helpers, optionally run in a pool of warm
+worker processes so CPU-heavy extraction never competes with the GUI thread
+"""
+
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Iterator, Optional
+
+import yt_dlp
+
+
+INFO_OPTIONS = {
+    'quiet': True,
+    'no_warnings': True,
+    'extract_flat': 'in_playlist',  # For playlist detection
+}
+
+FULL_INFO_OPTIONS = {
+    'quiet': True,
+    'no_warnings': True,
+    'noplaylist': True,
+}
+
+
+def extract_unprocessed(ydl: yt_dlp.YoutubeDL, url: str) -> dict:
+    """
+    Extract without processing so playlist entries stay a lazy generator
+    URL results (e.g. channel -> videos tab) are followed
+    """
+    info = ydl.extract_info(url, download=False, process=False)
+    for _ in range(3):
+        if info.get('_type') not in ('url', 'url_transparent'):
+            break
+        info = ydl.extract_info(info['url'], download=False, process=False, ie_key=info.get('ie_key'))
+    return info
+
+
+def compact_entry(entry: dict) -> dict:
+    """Keep only the fields needed to show or queue a playlist entry"""
+    video_id = entry.get('id')
+    url = entry.get('url')
+    if not url or not url.startswith('http'):
+        url = f"https://www.youtube.com/watch?v={video_id}"
+    return {
+        'id': video_id,
+        'title': entry.get('title', 'Unknown Title'),
+        'duration': entry.get('duration') or 0,
+        'url': url
+    }
+
+
+def iter_video_entries(entries) -> Iterator[dict]:
+    """
+    Video entries of a (possibly lazy) entry iterable, in order
+    A channel's root URL lists its Videos/Shorts/Live tabs as nested
+    playlists; their entries are yielded instead of the tabs themselves
+    """
+    for entry in entries or []:
+        if not entry:
+            continue
+        if entry.get('_type') == 'playlist':
+            yield from iter_video_entries(entry.get('entries'))
+        else:
+            yield entry
+
+
+def paginate(entries, page_size: int) -> Iterator[list]:
+    """Group a (possibly lazy) entry iterable into pages of compact entries"""
+    page = []
+    for entry in iter_video_entries(entries):
+        page.append(compact_entry(entry))
+        if len(page) >= page_size:
+            yield page
+            page = []
+    if page:
+        yield page
+
+
+def summarise_playlist(info: dict, page_size: int) -> dict:
+    """Summarise a playlist from its first page of entries without enumerating the rest"""
+    first_page = next(paginate(info.get('entries'), page_size), [])
+    playlist_count = info.get('playlist_count')
+    # Without a reported count only the first page is known; a full page means there are more
+    is_estimate = playlist_count is None and len(first_page) >= page_size
+    if playlist_count is None:
+        playlist_count = len(first_page)
+    count_text = f"{playlist_count}+" if is_estimate else str(playlist_count)
+    
+    return {
+        'title': info.get('title', 'Unknown Playlist'),
+        'duration': 0,
+        'uploader': 'Playlist',
+        'view_count': 0,
+        'upload_date': 'N/A',
+        'filesize': 0,
+        'description': f"This is a playlist with {count_text} videos. Please use the direct video URL instead of the playlist URL.",
+        'is_playlist': True,
+        'playlist_count': playlist_count,
+        'playlist_count_is_estimate': is_estimate,
+        'first_entries': first_page,
+        'first_video_url': first_page[0]['url'] if first_page else None
+    }
+
+
+def lookup_info(url: str, page_size: int) -> dict:
+    """
+    Extract a URL for get_video_info
+    Playlists come back as a summary (is_playlist=True), single videos as a
+    processed, sanitised info dict that is safe to return from a worker process
+    """
+    with yt_dlp.YoutubeDL(INFO_OPTIONS) as ydl:
+        info = extract_unprocessed(ydl, url)
+        if info.get('_type') == 'playlist':
+            return summarise_playlist(info, page_size)
+        
+        # Single video: finish processing the result we already have
+        info = ydl.process_ie_result(info, download=False)
+        return ydl.sanitize_info(info)
+
+
+def extract_full_info(url: str) -> dict:
+    """Run a full (non-flat) extraction for a single video"""
+    with yt_dlp.YoutubeDL(FULL_INFO_OPTIONS) as ydl:
+        return ydl.sanitize_info(ydl.extract_info(url, download=False))
+
+
+def _warm_worker():
+    """Load yt-dlp's extractor classes once per worker process"""
+    yt_dlp.YoutubeDL({'quiet': True}).get_info_extractor('Youtube')
+
+
+def _ping() -> bool:
+    """No-op task used to start every worker ahead of the first lookup"""
+    return True
+
+
+class ExtractionPool:
+    """Pool of warm worker processes running yt-dlp extraction off the GUI process"""
+    
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+    
+    def start(self):
+        """Create the worker processes now rather than on the first lookup"""
+        if self._executor is None:
+            # spawn: never fork a process that already owns Tk and worker threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_warm_worker
+            )
+            for _ in range(self.max_workers):
+                self._executor.submit(_ping)
+    
+    def submit(self, func: Callable, *args) -> Future:
+        """Run a module-level extraction function in a worker process"""
+        self.start()
+        return self._executor.submit(func, *args)
+    
+    def run(self, func: Callable, *args):
+        """Run an extraction function in a worker and wait for its result"""
+        return self.submit(func, *args).result()
+    
+    def shutdown(self, wait: bool = True):
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
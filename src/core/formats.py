@@ -0,0 +1,182 @@
+"""
+Format ranking for YouTube Video Downloader
+Indexes a video's formats once (by height, codec, bitrate, size, container)
+and answers the size estimate, format list and download selection queries
+from that index; indexes are kept per video ID
+"""
+
+import bisect
+import re
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from utils.config import Config
+
+
+# Kinds of format: audio and video in one file, video only, audio only (storyboards have none)
+AV = 'av'
+VIDEO = 'video'
+AUDIO = 'audio'
+
+_SELECTOR = re.compile(r'^(best|bestvideo|bestaudio|b|bv|ba)((?:\[\w+(?:<=|=)[\w.]+\])*)$')
+_FILTER = re.compile(r'\[(\w+)(<=|=)([\w.]+)\]')
+_KINDS = {'best': AV, 'b': AV, 'bestvideo': VIDEO, 'bv': VIDEO, 'bestaudio': AUDIO, 'ba': AUDIO}
+
+
+def _codec(value: Optional[str]) -> Optional[str]:
+    """Codec family ('avc1.64001F' -> 'avc1'); None for 'none' or unknown"""
+    if not value or value == 'none':
+        return None
+    return value.split('.')[0].lower()
+
+
+def _record(rank: int, fmt: dict) -> dict:
+    """The fields the queries need, normalised (missing numbers are None, never compared)"""
+    vcodec = _codec(fmt.get('vcodec'))
+    acodec = _codec(fmt.get('acodec'))
+    has_video = fmt.get('vcodec') != 'none'
+    has_audio = fmt.get('acodec') != 'none'
+    return {
+        'rank': rank,
+        'format_id': fmt.get('format_id'),
+        'kind': AV if has_video and has_audio else (VIDEO if has_video else (AUDIO if has_audio else None)),
+        'ext': fmt.get('ext'),
+        'height': fmt.get('height') if has_video else None,
+        'fps': fmt.get('fps'),
+        'vcodec': vcodec,
+        'acodec': acodec,
+        'tbr': fmt.get('tbr'),
+        'filesize': fmt.get('filesize') or fmt.get('filesize_approx'),
+        'resolution': fmt.get('resolution', 'Unknown'),
+        'protocol': fmt.get('protocol')
+    }
+
+
+def parse_selector(selector: str) -> Optional[dict]:
+    """
+    Turn a simple yt-dlp selector ('best[height<=720][ext=mp4]') into a query
+    Returns None for selectors the index does not model; those are left to yt-dlp
+    """
+    match = _SELECTOR.match(selector.strip())
+    if not match:
+        return None
+    query = {'kind': _KINDS[match.group(1)]}
+    for field, operator, value in _FILTER.findall(match.group(2)):
+        if field == 'height' and operator == '<=' and value.isdigit():
+            query['max_height'] = int(value)
+        elif field == 'ext' and operator == '=':
+            query['ext'] = value
+        elif field == 'vcodec' and operator == '=':
+            query['vcodec'] = _codec(value)
+        else:
+            return None
+    return query
+
+
+class FormatIndex:
+    """
+    One video's formats, indexed for repeated queries
+    Ranking follows yt-dlp's own preference order (formats come sorted worst
+    to best), so a query picks the same format yt-dlp would for that filter
+    """
+    
+    def __init__(self, video_id: Optional[str], formats: list):
+        self.video_id = video_id
+        self.formats = [_record(rank, fmt) for rank, fmt in enumerate(formats or [])]
+        self._by_kind = {AV: [], VIDEO: [], AUDIO: []}
+        self._by_height = {}
+        self._by_ext = {}
+        self._by_vcodec = {}
+        for record in self.formats:
+            rank = record['rank']
+            if record['kind'] is None:
+                continue
+            self._by_kind[record['kind']].append(rank)
+            if record['height']:
+                self._by_height.setdefault(record['height'], set()).add(rank)
+            self._by_ext.setdefault(record['ext'], set()).add(rank)
+            self._by_vcodec.setdefault(record['vcodec'], set()).add(rank)
+        self.heights = sorted(self._by_height)
+        self._memo = {}
+    
+    def select(self, kind: str = AV, max_height: Optional[int] = None, ext: Optional[str] = None,
+               vcodec: Optional[str] = None, max_filesize: Optional[int] = None) -> Optional[dict]:
+        """Best format matching every given filter (formats without a height never match max_height)"""
+        key = (kind, max_height, ext, vcodec, max_filesize)
+        if key in self._memo:
+            return self._memo[key]
+        
+        ranks = self._by_kind.get(kind, [])
+        filters = []
+        if max_height is not None and kind != AUDIO:
+            allowed = set()
+            for height in self.heights[:bisect.bisect_right(self.heights, max_height)]:
+                allowed |= self._by_height[height]
+            filters.append(allowed)
+        if ext is not None:
+            filters.append(self._by_ext.get(ext, set()))
+        if vcodec is not None:
+            filters.append(self._by_vcodec.get(vcodec, set()))
+        
+        best = None
+        for rank in reversed(ranks):
+            if all(rank in allowed for allowed in filters):
+                size = self.formats[rank]['filesize']
+                if max_filesize is None or (size is not None and size <= max_filesize):
+                    best = self.formats[rank]
+                    break
+        self._memo[key] = best
+        return best
+    
+    def with_video(self) -> list:
+        """Every format with a video stream, in yt-dlp's order"""
+        return [record for record in self.formats if record['kind'] in (AV, VIDEO)]
+    
+    def selector(self, query: Optional[dict], fallback: str) -> str:
+        """yt-dlp selector naming the ranked choice, falling back to the original selector"""
+        choice = self.select(**query) if query else None
+        return f"{choice['format_id']}/{fallback}" if choice else fallback
+
+
+def merge_selector(index: Optional[FormatIndex], max_height: Optional[int]) -> str:
+    """Separate best video and best audio streams for merging with ffmpeg (ranked choices first when indexed)"""
+    video = f'bestvideo[height<={max_height}]' if max_height else 'bestvideo'
+    audio = 'bestaudio'
+    if index is not None:
+        best_video = index.select(VIDEO, max_height)
+        best_audio = index.select(AUDIO)
+        video = f"{best_video['format_id']}/{video}" if best_video else video
+        audio = f"{best_audio['format_id']}/{audio}" if best_audio else audio
+    return f'{video},{audio}'
+
+
+class FormatCache:
+    """Thread-safe LRU of format indexes keyed by video ID and URL"""
+    
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or Config.FORMAT_CACHE_SIZE
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Optional[str]) -> Optional[FormatIndex]:
+        """Cached index for a video ID or URL, marked as recently used"""
+        with self._lock:
+            index = self._entries.get(key)
+            if index is not None:
+                self._entries.move_to_end(key)
+            return index
+    
+    def index(self, info: dict, url: Optional[str] = None) -> FormatIndex:
+        """Index an extracted video, reusing the index already built for its ID"""
+        index = self.get(info.get('id'))
+        if index is None or not index.formats:
+            index = FormatIndex(info.get('id'), info.get('formats'))
+        with self._lock:
+            for key in (info.get('id'), url, info.get('webpage_url')):
+                if key:
+                    self._entries[key] = index
+                    self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return index
@@ -0,0 +1,84 @@
+"""
+Download history module for YouTube Video Downloader
+Append-only JSON Lines file with one record per finished download
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Iterable, Iterator, Optional
+
+from utils.config import Config
+
+
+def make_entry(url: str, result, verification: dict) -> dict:
+    """History entry for a DownloadResult and its verification status dict"""
+    return {
+        'url': url,
+        'id': result.video_id,
+        'title': result.title,
+        'filepath': verification.get('filepath'),
+        'size': verification.get('size'),
+        'checksum': verification.get('checksum'),
+        'verified': verification['success'],
+        'error': verification.get('error'),
+        'bytes_downloaded': result.bytes_downloaded,
+        'elapsed': round(result.elapsed, 3),
+        'backend': result.backend or None
+    }
+
+
+class DownloadHistory:
+    """Records finished downloads (path, size, checksum) in a JSON Lines file"""
+    
+    def __init__(self, path: Optional[str] = None, read_only: bool = False):
+        self.path = path or Config.HISTORY_FILE
+        self.read_only = read_only  # Readable, but record() writes nothing (a worker's coordinator keeps the history)
+        self._lock = threading.Lock()
+    
+    def record(self, entry: dict) -> dict:
+        """Append one entry, stamping it with the current time"""
+        entry = dict(entry, timestamp=entry.get('timestamp') or time.time())
+        if self.read_only:
+            return entry
+        line = json.dumps(entry, ensure_ascii=False, sort_keys=True) + '\n'
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as fh:
+                fh.write(line)
+        return entry
+    
+    def record_many(self, entries: Iterable[dict]) -> int:
+        """Append entries as they are produced (one open file, constant memory); returns the count"""
+        if self.read_only:
+            return 0
+        count = 0
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as fh:
+                for entry in entries:
+                    entry = dict(entry, timestamp=entry.get('timestamp') or time.time())
+                    fh.write(json.dumps(entry, ensure_ascii=False, sort_keys=True) + '\n')
+                    count += 1
+        return count
+    
+    def iter_entries(self) -> Iterator[dict]:
+        """Yield entries oldest first without loading the whole file"""
+        try:
+            fh = open(self.path, 'r', encoding='utf-8')
+        except FileNotFoundError:
+            return
+        with fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue  # Skip a line cut short by a crash
+    
+    def downloaded_ids(self) -> set:
+        """Video IDs of every download that did not fail verification (the download archive)"""
+        return {entry['id'] for entry in self.iter_entries() if entry.get('id') and entry.get('verified') is not False}
@@ -0,0 +1,199 @@
+"""
+Job queue module for YouTube Video Downloader
+Keeps the list of queued downloads and runs them on a pool of worker threads
+"""
+
+import itertools
+import threading
+from collections import deque
+from typing import Callable, Optional
+
+from core.results import DownloadResult, ResultError
+from utils.config import Config
+
+
+_job_ids = itertools.count(1)
+
+
+class DownloadJob:
+    """A single queued download and its live state"""
+    
+    QUEUED = 'queued'
+    DOWNLOADING = 'downloading'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+    
+    def __init__(self, url: str, title: Optional[str] = None, options: Optional[dict] = None):
+        self.id = next(_job_ids)
+        self.url = url
+        self.title = title or url
+        self.options = options or {}
+        self.status = self.QUEUED
+        self.percent = ''
+        self.speed = ''
+        self.message = ''
+        self.attempts = 0
+        self.result: Optional[DownloadResult] = None
+    
+    @property
+    def finished(self) -> bool:
+        """Check whether the job has reached a final state"""
+        return self.status in (self.COMPLETED, self.FAILED, self.CANCELLED)
+    
+    def to_dict(self) -> dict:
+        """Plain representation used by the UI and for export"""
+        return {
+            'id': self.id,
+            'url': self.url,
+            'title': self.title,
+            'status': self.status,
+            'percent': self.percent,
+            'speed': self.speed,
+            'message': self.message,
+            'attempts': self.attempts,
+            'options': self.options
+        }
+
+
+class DownloadQueue:
+    """Thread-safe FIFO of download jobs processed by a pool of worker threads (at most limit at once)"""
+    
+    def __init__(self, run_job: Callable[[DownloadJob], DownloadResult], max_workers: Optional[int] = None,
+                 on_update: Optional[Callable[[DownloadJob], None]] = None):
+        self.run_job = run_job
+        self.max_workers = max_workers or Config.MAX_CONCURRENT_DOWNLOADS
+        self.limit = self.max_workers
+        self.on_update = on_update
+        self.jobs = []  # Every job in insertion order (append-only, safe to read from the UI thread)
+        self._jobs_by_id = {}
+        self._pending = deque()
+        self._condition = threading.Condition()
+        self._workers = []
+        self._running = 0
+        self._stopped = False
+    
+    def __len__(self) -> int:
+        return len(self.jobs)
+    
+    def start(self):
+        """Start the worker threads (called lazily on the first add)"""
+        with self._condition:
+            while len(self._workers) < self.limit:
+                worker = threading.Thread(target=self._worker_loop, daemon=True)
+                self._workers.append(worker)
+                worker.start()
+    
+    def add(self, url: str, title: Optional[str] = None, options: Optional[dict] = None) -> DownloadJob:
+        """Queue one URL and return its job"""
+        return self.add_many([{'url': url, 'title': title, 'options': options}])[0]
+    
+    def add_many(self, entries: list) -> list:
+        """Queue many entries ({'url', 'title', 'options'}) under a single lock acquisition"""
+        jobs = [DownloadJob(entry['url'], entry.get('title'), entry.get('options')) for entry in entries]
+        with self._condition:
+            for job in jobs:
+                self.jobs.append(job)
+                self._jobs_by_id[job.id] = job
+                self._pending.append(job)
+            self._condition.notify(len(jobs))
+        self.start()
+        for job in jobs:
+            self._notify(job)
+        return jobs
+    
+    def get(self, job_id: int) -> Optional[DownloadJob]:
+        """Look up a job by ID"""
+        return self._jobs_by_id.get(job_id)
+    
+    def cancel(self, job_id: int) -> bool:
+        """Cancel a job that has not started yet"""
+        with self._condition:
+            job = self._jobs_by_id.get(job_id)
+            if job is None or job.status != DownloadJob.QUEUED:
+                return False
+            job.status = DownloadJob.CANCELLED
+        self._notify(job)
+        return True
+    
+    def pending_count(self) -> int:
+        """Number of jobs still waiting for a worker"""
+        with self._condition:
+            return sum(1 for job in self._pending if job.status == DownloadJob.QUEUED)
+    
+    def set_limit(self, limit: int):
+        """Change how many jobs run at once (running jobs above the limit finish first)"""
+        with self._condition:
+            self.limit = max(1, limit)
+            started = bool(self._workers)
+            self._condition.notify_all()
+        if started:
+            self.start()
+    
+    def stop(self):
+        """Stop handing out jobs; running downloads finish on their own"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+    
+    def _next_job(self) -> Optional[DownloadJob]:
+        """Block until a queued job is available (None when stopped)"""
+        with self._condition:
+            while True:
+                if self._stopped:
+                    return None
+                while self._pending and self._running < self.limit:
+                    job = self._pending.popleft()
+                    if job.status == DownloadJob.QUEUED:
+                        job.status = DownloadJob.DOWNLOADING
+                        self._running += 1
+                        return job
+                self._condition.wait()
+    
+    def _worker_loop(self):
+        """Run queued jobs until the queue is stopped"""
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            self._notify(job)
+            
+            try:
+                result = self.run_job(job)
+            except Exception as e:
+                result = DownloadResult.failure(ResultError.from_exception(e, 'Unexpected error: '), url=job.url)
+            
+            with self._condition:
+                self._running -= 1
+                self._condition.notify()
+            
+            job.result = result
+            if not result.success and result.retryable and job.attempts < Config.MAX_RETRIES:
+                self._schedule_retry(job)
+                continue
+            
+            job.status = DownloadJob.COMPLETED if result.success else DownloadJob.FAILED
+            job.message = result.message or result.error_message
+            self._notify(job)
+    
+    def _schedule_retry(self, job: DownloadJob):
+        """Put a job that failed for a transient reason back in the queue after a backoff"""
+        job.attempts += 1
+        job.status = DownloadJob.QUEUED
+        job.message = f"Retry {job.attempts}/{Config.MAX_RETRIES}: {job.result.error_message}"
+        self._notify(job)
+        
+        def requeue():
+            with self._condition:
+                if job.status == DownloadJob.QUEUED:
+                    self._pending.append(job)
+                    self._condition.notify()
+        
+        timer = threading.Timer(Config.RETRY_DELAY_SECONDS * 2 ** (job.attempts - 1), requeue)
+        timer.daemon = True
+        timer.start()
+    
+    def _notify(self, job: DownloadJob):
+        """Tell the listener a job changed"""
+        if self.on_update:
+            self.on_update(job)
@@ -0,0 +1,203 @@
+"""
+Live recording module for YouTube Video Downloader
+Records live streams and premieres with ffmpeg into fixed-length segment
+files, so a crash or dropped connection loses at most the current segment
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+from typing import Callable, Optional
+
+import yt_dlp
+
+from core import extraction
+from core.results import DownloadResult, ErrorCategory, ResultError
+from utils.config import Config
+
+
+LIVE_STATUSES = ('is_live', 'is_upcoming')
+SEGMENT_PATTERN = re.compile(r'^segment_(\d+)\.ts$')
+
+
+def fetch_status(url: str) -> dict:
+    """Cheap status check (live_status, release_timestamp) without format selection"""
+    with yt_dlp.YoutubeDL(extraction.INFO_OPTIONS) as ydl:
+        return extraction.extract_unprocessed(ydl, url)
+
+
+def fetch_stream(url: str, format_spec: str) -> dict:
+    """Resolve the stream URL(s) and HTTP headers for the selected live format"""
+    options = dict(extraction.FULL_INFO_OPTIONS, format=format_spec)
+    with yt_dlp.YoutubeDL(options) as ydl:
+        return ydl.sanitize_info(ydl.extract_info(url, download=False))
+
+
+def list_segments(output_dir: str) -> list:
+    """Segment files written so far, in order"""
+    try:
+        names = os.listdir(output_dir)
+    except OSError:
+        return []
+    return sorted(name for name in names if SEGMENT_PATTERN.match(name))
+
+
+def build_ffmpeg_command(ffmpeg: str, info: dict, output_dir: str, segment_seconds: int, start_number: int) -> list:
+    """ffmpeg command that copies the stream(s) into numbered MPEG-TS segments"""
+    command = [ffmpeg, '-hide_banner', '-loglevel', 'error']
+    formats = info.get('requested_formats') or [info]
+    for fmt in formats:
+        headers = fmt.get('http_headers') or {}
+        if headers:
+            command += ['-headers', ''.join(f'{key}: {value}\r\n' for key, value in headers.items())]
+        command += ['-i', fmt['url']]
+    
+    if len(formats) > 1:
+        command += ['-map', '0:v:0', '-map', '1:a:0']
+    else:
+        command += ['-map', '0']
+    
+    # MPEG-TS segments stay playable even if recording stops abruptly
+    command += [
+        '-c', 'copy',
+        '-f', 'segment',
+        '-segment_time', str(segment_seconds),
+        '-segment_start_number', str(start_number),
+        '-reset_timestamps', '1',
+        os.path.join(output_dir, 'segment_%05d.ts')
+    ]
+    return command
+
+
+class LiveRecorder:
+    """
+    Records one live stream until it ends or stop() is called
+    Upcoming premieres are polled until they start; when the stream URL
+    expires or the connection drops, recording resumes with the next segment number
+    """
+    
+    def __init__(self, url: str, output_dir: str, format_spec: str, segment_seconds: Optional[int] = None,
+                 progress_callback: Optional[Callable] = None,
+                 get_status: Callable[[str], dict] = fetch_status,
+                 get_stream: Callable[[str, str], dict] = fetch_stream):
+        self.url = url
+        self.output_dir = output_dir
+        self.format_spec = format_spec
+        self.segment_seconds = segment_seconds or Config.LIVE_SEGMENT_SECONDS
+        self.progress_callback = progress_callback
+        self.get_status = get_status
+        self.get_stream = get_stream
+        self._stop = threading.Event()
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+    
+    def stop(self, timeout: float = 10):
+        """Stop recording; ffmpeg is asked to finish the current segment cleanly"""
+        self._stop.set()
+        with self._lock:
+            process = self._process
+        if process is not None:
+            self._finish_process(process, timeout)
+    
+    def wait_until_live(self) -> Optional[dict]:
+        """Poll an upcoming premiere until it goes live (None if stopped or never live)"""
+        while not self._stop.is_set():
+            status = self.get_status(self.url)
+            live_status = status.get('live_status')
+            if live_status == 'is_live':
+                return status
+            if live_status != 'is_upcoming':
+                return None
+            
+            # Sleep until the scheduled start, checking at least every poll interval
+            remaining = (status.get('release_timestamp') or 0) - time.time()
+            delay = min(max(remaining, Config.LIVE_RETRY_SECONDS), Config.LIVE_POLL_SECONDS)
+            if self.progress_callback:
+                self.progress_callback('WAITING', f'starts in {max(0, int(remaining)) // 60} min')
+            self._stop.wait(delay)
+        return None
+    
+    def record(self) -> DownloadResult:
+        """Record until the broadcast ends"""
+        started = time.monotonic()
+        ffmpeg = shutil.which(Config.FFMPEG_PATH)
+        if not ffmpeg:
+            return DownloadResult.failure(ResultError.create(
+                ErrorCategory.MISSING_TOOL, f'Live recording needs ffmpeg ({Config.FFMPEG_PATH} not found)'
+            ), url=self.url)
+        
+        try:
+            if self.wait_until_live() is None:
+                if self._stop.is_set():
+                    error = ResultError.create(ErrorCategory.CANCELLED, 'Recording cancelled')
+                else:
+                    error = ResultError.create(ErrorCategory.NOT_LIVE, 'Video is not live')
+                return DownloadResult.failure(error, url=self.url)
+            
+            os.makedirs(self.output_dir, exist_ok=True)
+            while not self._stop.is_set():
+                stream = self.get_stream(self.url, self.format_spec)
+                self._run_ffmpeg(ffmpeg, stream)
+                if self._stop.is_set() or self.get_status(self.url).get('live_status') != 'is_live':
+                    break
+                self._stop.wait(Config.LIVE_RETRY_SECONDS)  # Stream URL expired or connection dropped
+        
+        except Exception as e:
+            if not list_segments(self.output_dir):
+                return DownloadResult.failure(ResultError.from_exception(e, 'Recording failed: '), url=self.url)
+            print(f"Live recording stopped early: {str(e)}")
+        
+        segments = [os.path.join(self.output_dir, name) for name in list_segments(self.output_dir)]
+        if not segments:
+            return DownloadResult.failure(
+                ResultError.create(ErrorCategory.NOT_LIVE, 'No live video was recorded'), url=self.url
+            )
+        return DownloadResult(
+            True,
+            f'Recorded {len(segments)} segment(s) to {self.output_dir}',
+            url=self.url,
+            filepath=self.output_dir,
+            live=True,
+            segments=segments,
+            bytes_downloaded=sum(os.path.getsize(path) for path in segments),
+            elapsed=time.monotonic() - started
+        )
+    
+    def _run_ffmpeg(self, ffmpeg: str, stream: dict):
+        """Run ffmpeg until the stream ends or stop() is called, reporting segments as they appear"""
+        segments = list_segments(self.output_dir)
+        start_number = int(SEGMENT_PATTERN.match(segments[-1]).group(1)) + 1 if segments else 0
+        command = build_ffmpeg_command(ffmpeg, stream, self.output_dir, self.segment_seconds, start_number)
+        # ffmpeg writes straight to disk; nothing is buffered here however long the event runs
+        process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                                   stderr=subprocess.DEVNULL)
+        with self._lock:
+            self._process = process
+        try:
+            while process.poll() is None:
+                if self._stop.wait(1):
+                    self._finish_process(process)
+                    break
+                if self.progress_callback:
+                    self.progress_callback('LIVE', f'{len(list_segments(self.output_dir))} segment(s)')
+        finally:
+            with self._lock:
+                self._process = None
+            process.wait()
+            process.stdin.close()
+    
+    def _finish_process(self, process: subprocess.Popen, timeout: float = 10):
+        """Ask ffmpeg to quit ('q' closes the current segment properly), then terminate"""
+        try:
+            process.stdin.write(b'q')
+            process.stdin.flush()
+        except (OSError, ValueError):
+            pass
+        try:
+            process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.terminate()
+            process.wait()
@@ -5,14 +5,64 @@ Handles the core download functionality using yt-dlp
 
 import yt_dlp
 import os
-from typing import Optional, Callable
+import re
+import threading
+import time
+import urllib.parse
+from concurrent.futures import Future
+from typing import Optional, Callable, Iterator
+from yt_dlp.utils import download_range_func
+
+from core.assets import AssetFetcher
+from core.backends import DownloadBackend, create_backend
+from core import extraction
+from core.extraction import ExtractionPool
+from core.formats import FormatCache, FormatIndex, merge_selector, parse_selector
+from core.history import DownloadHistory, make_entry
+from core.live import LIVE_STATUSES, LiveRecorder
+from core.postprocess import PostProcessor
+from core.results import DownloadResult, ErrorCategory, FormatsResult, InfoResult, ResultError
+from core.scheduler import get_scheduler
+from core.staging import StagingArea
+from core.templates import OutputTemplate, PathRegistry, template_metadata
+from core.throughput import ThroughputController
+from core.thumbnails import ThumbnailCache
+from core.verify import Verifier, expected_size
+from utils.config import Config
+from utils.settings import Settings, get_settings
+from utils.timecode import format_timestamp
 
 
 class YouTubeDownloaderModel:
     """Model class that handles YouTube video downloading logic"""
     
-    def __init__(self):
-        self.download_path = os.path.join(os.path.expanduser("~"), "Downloads", "YouTube_Videos")
+    def __init__(self, settings: Optional[Settings] = None):
+        self.settings = settings or get_settings()
+        self.download_path = self.settings.get('download_path')
+        self.postprocessor = PostProcessor(self.settings.get('postprocess_workers'))
+        self.assets = AssetFetcher(self._extract_full_info, cache_size=self.settings.get('asset_cache_size'),
+                                   output_name=self._asset_output_name)
+        self.formats = FormatCache()
+        self.paths = PathRegistry(self._downloaded_video_at)
+        self.scheduler = get_scheduler()
+        self.staging = StagingArea(self.settings.get('staging_path') or None)
+        self.verifier = Verifier(self.settings.get('verify_workers'))
+        self.thumbnails = ThumbnailCache(disk_bytes=self.settings.get('thumbnail_cache_mb') * 1024 * 1024)
+        self.history = DownloadHistory()
+        self._history_files = (None, {})
+        self._history_lock = threading.Lock()
+        self.recordings = set()
+        self._recordings_lock = threading.Lock()
+        self._backends = {}
+        self._backends_lock = threading.Lock()
+        self.throughput: Optional[ThroughputController] = None
+        if self.settings.get('adaptive_concurrency'):
+            self.throughput = ThroughputController(self.settings.get('max_concurrent_downloads'),
+                                                   Config.NATIVE_HTTP_CONNECTIONS, log_path=Config.DIAGNOSTICS_FILE)
+        self.extraction_pool: Optional[ExtractionPool] = None
+        if self.settings.get('extraction_process_pool'):
+            self.extraction_pool = ExtractionPool(self.settings.get('extraction_workers'))
+            self.extraction_pool.start()
         self._create_download_directory()
     
     def _create_download_directory(self):
@@ -33,142 +83,506 @@ class YouTubeDownloaderModel:
         youtube_domains = ['youtube.com', 'youtu.be', 'www.youtube.com', 'm.youtube.com']
         return any(domain in url.lower() for domain in youtube_domains)
     
-    def get_video_info(self, url: str) -> Optional[dict]:
+    def is_playlist_url(self, url: str, with_video: bool = False) -> bool:
+        """
+        Check whether a URL points at a playlist or channel rather than one video
+        A video link that also carries a list (watch?v=...&list=..., as shared
+        from a playlist or mix) counts as the single video unless with_video is
+        set, matching what download_video fetches for it
+        """
+        parsed = urllib.parse.urlparse(url)
+        query = urllib.parse.parse_qs(parsed.query)
+        if 'list' in query:
+            return with_video or 'v' not in query
+        return parsed.path.startswith(('/playlist', '/@', '/channel/', '/c/', '/user/'))
+    
+    def get_video_info(self, url: str) -> InfoResult:
         """Get video information without downloading"""
+        started = time.monotonic()
         try:
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
-                'extract_flat': True,  # For playlist detection
-            }
+            info = self.scheduler.run(url, self._run_extraction, extraction.lookup_info, url,
+                                      self.settings.get('playlist_page_size'), source='info')
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                
-                # Check if this is a playlist
-                if info.get('_type') == 'playlist':
-                    return {
-                        'title': info.get('title', 'Unknown Playlist'),
-                        'duration': 0,
-                        'uploader': 'Playlist',
-                        'view_count': 0,
-                        'upload_date': 'N/A',
-                        'filesize': 0,
-                        'description': f"This is a playlist with {len(info.get('entries', []))} videos. Please use the direct video URL instead of the playlist URL.",
-                        'is_playlist': True,
-                        'playlist_count': len(info.get('entries', [])),
-                        'first_video_url': f"https://www.youtube.com/watch?v={info['entries'][0]['id']}" if info.get('entries') else None
-                    }
-                
-                # If it's a single video, get detailed info
-                ydl_opts['extract_flat'] = False
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl_detailed:
-                    info = ydl_detailed.extract_info(url, download=False)
-                
-                # Get the best format for size estimation
-                formats = info.get('formats', [])
-                best_format = None
-                for fmt in formats:
-                    if fmt.get('vcodec') != 'none' and fmt.get('height', 0) <= 720:
-                        if not best_format or (fmt.get('height', 0) > best_format.get('height', 0)):
-                            best_format = fmt
-                
-                filesize = best_format.get('filesize', 0) if best_format else 0
-                
-                return {
-                    'title': info.get('title', 'Unknown Title'),
-                    'duration': info.get('duration', 0),
-                    'uploader': info.get('uploader', 'Unknown Uploader'),
-                    'view_count': info.get('view_count', 0),
-                    'upload_date': info.get('upload_date', 'Unknown Date'),
-                    'filesize': filesize,
-                    'description': info.get('description', 'No description available')[:200] + '...' if info.get('description') else 'No description available'
-                }
+            # Check if this is a playlist
+            if info.get('is_playlist'):
+                return InfoResult(True, info, elapsed=time.monotonic() - started)
+            
+            assets = self.assets.remember(info, url)
+            
+            # The format the download will pick, for size estimation
+            query = self.format_query()
+            best_format = self.formats.index(info, url).select(**query) if query else None
+            filesize = (best_format.get('filesize') or 0) if best_format else 0
+            
+            return InfoResult(True, {
+                'title': info.get('title', 'Unknown Title'),
+                'duration': info.get('duration', 0),
+                'uploader': info.get('uploader', 'Unknown Uploader'),
+                'view_count': info.get('view_count', 0),
+                'upload_date': info.get('upload_date', 'Unknown Date'),
+                'filesize': filesize,
+                'description': info.get('description', 'No description available')[:200] + '...' if info.get('description') else 'No description available',
+                'id': info.get('id'),
+                'subtitle_languages': sorted(assets['subtitles']),
+                'thumbnail': assets['thumbnail'],
+                'preview_thumbnail': assets['preview_thumbnail']
+            }, elapsed=time.monotonic() - started)
         except Exception as e:
-            print(f"Error getting video info: {str(e)}")
+            return InfoResult(False, error=ResultError.from_exception(e), elapsed=time.monotonic() - started)
+    
+    def format_query(self) -> Optional[dict]:
+        """The format setting as a ranking query (None when it is a selector only yt-dlp understands)"""
+        return parse_selector(self.settings.get('format'))
+    
+    def _format_index(self, url: str, video_id: Optional[str] = None) -> Optional[FormatIndex]:
+        """Format index from an earlier lookup of this URL or video"""
+        return self.formats.get(url) or self.formats.get(video_id)
+    
+    def _run_extraction(self, func: Callable, *args):
+        """Run an extraction function in the worker process pool when enabled, else inline"""
+        if self.extraction_pool is not None:
+            return self.extraction_pool.run(func, *args)
+        return func(*args)
+    
+    def iter_playlist(self, url: str, page_size: Optional[int] = None) -> Iterator[list]:
+        """
+        Yield playlist entries page by page as yt-dlp produces them
+        Memory stays flat however long the playlist or channel is
+        """
+        with yt_dlp.YoutubeDL(extraction.INFO_OPTIONS) as ydl:
+            info = self.scheduler.run(url, extraction.extract_unprocessed, ydl, url, source='playlist')
+            if info.get('_type') != 'playlist':
+                yield [extraction.compact_entry(info)]
+                return
+            yield from extraction.paginate(info.get('entries'), page_size or self.settings.get('playlist_page_size'))
+    
+    def _extract_full_info(self, url: str) -> dict:
+        """Run a full (non-flat) extraction for a single video"""
+        return self.scheduler.run(url, self._run_extraction, extraction.extract_full_info, url, source='assets')
+    
+    def fetch_assets(self, urls: list, languages: Optional[list] = None,
+                     subtitles: bool = True, thumbnail: bool = True) -> list:
+        """
+        Fetch subtitles and thumbnails without downloading the videos
+        Videos already inspected with get_video_info are not extracted again
+        """
+        languages = self.settings.get('subtitle_languages') if languages is None else languages
+        return self.assets.fetch_batch(urls, self.download_path, languages, subtitles, thumbnail)
+    
+    def get_output_template(self) -> OutputTemplate:
+        """Output template from the current settings"""
+        return OutputTemplate(self.settings.get('output_template'), self.settings.get('filename_max_bytes'))
+    
+    def reserve_output_name(self, info: dict, force: bool = False) -> Optional[str]:
+        """
+        Reserve a unique output name (relative to download_path, no extension)
+        Returns None when info lacks fields the template needs, unless force is set
+        """
+        template = self.get_output_template()
+        metadata = template_metadata(info)
+        if not force and not template.can_render(metadata):
             return None
+        return self.paths.reserve(self.download_path, template.render(metadata), metadata.get('id'))
+    
+    def _asset_output_name(self, metadata: dict) -> str:
+        """The name the video gets (or has) in download_path, for its subtitles and thumbnail"""
+        output_name = self.reserve_output_name(metadata, force=True)
+        self.release_output_name(output_name)  # Only the video's own download holds the name
+        return output_name
     
-    def download_video(self, url: str, progress_callback: Optional[Callable] = None) -> dict:
+    def release_output_name(self, output_name: Optional[str]):
+        """Give back a name from reserve_output_name whose download was cancelled or failed"""
+        if output_name:
+            self.paths.release(self.download_path, output_name)
+    
+    def _downloaded_video_at(self, path: str) -> Optional[str]:
+        """Video ID the history records for the file at path (without extension), indexed once per history file"""
+        with self._history_lock:
+            history, files = self._history_files
+            if history is not self.history:
+                files = {}
+                for entry in self.history.iter_entries():
+                    if entry.get('filepath') and entry.get('id') and entry.get('verified') is not False:
+                        files[os.path.splitext(os.path.abspath(entry['filepath']))[0].casefold()] = entry['id']
+                self._history_files = (self.history, files)
+            return files.get(os.path.abspath(path).casefold())
+    
+    def get_backend(self, name: Optional[str] = None) -> DownloadBackend:
+        """Transfer engine by name (default from the download_backend setting), created once"""
+        name = name or self.settings.get('download_backend')
+        with self._backends_lock:
+            if name not in self._backends:
+                engine = create_backend(name)
+                engine.configure_writes(self.settings.get('write_buffer_kb') * 1024,
+                                        self.settings.get('preallocate_downloads'), self.settings.get('fsync_policy'))
+                self._backends[name] = engine
+            return self._backends[name]
+    
+    def download_video(self, url: str, progress_callback: Optional[Callable] = None,
+                       postprocess: Optional[dict] = None, assets: Optional[dict] = None,
+                       output_name: Optional[str] = None, clip: Optional[dict] = None,
+                       backend: Optional[str] = None, connections: Optional[int] = None) -> DownloadResult:
         """
         Download video from YouTube URL
-        Returns status dictionary with success/error information
+        Returns a DownloadResult (errors carry a category and retryability)
+        When post-processing steps are enabled the ffmpeg work is queued on the
+        post-processing pool and its future is returned as result.postprocess
+        output_name is a name reserved earlier with reserve_output_name
+        With staging enabled files are written to a staging folder and moved
+        into the download folder only once downloaded and post-processed
+        clip ({'start', 'end', 'chapters'}) downloads only a time range or chapters
+        Live streams and upcoming premieres are recorded with record_live instead
+        backend names the transfer engine for this download (see core.backends)
+        connections sets parallel connections/fragments per file (adaptive when enabled)
         """
+        started = time.monotonic()
         if not self.validate_url(url):
-            return {
-                'success': False,
-                'error': 'Invalid YouTube URL provided'
-            }
+            return DownloadResult.failure(
+                ResultError.create(ErrorCategory.INVALID_URL, 'Invalid YouTube URL provided'), url=url
+            )
+        
+        try:
+            engine = self.get_backend(backend)
+        except ValueError as e:
+            return DownloadResult.failure(ResultError.create(ErrorCategory.UNKNOWN, str(e)), url=url)
+        if not engine.is_available():
+            return DownloadResult.failure(
+                ResultError.create(ErrorCategory.MISSING_TOOL, f'Download backend {engine.name} is not installed'), url=url
+            )
         
         # Check if it's a playlist first
+        live_status = None
+        video_id = None
+        probed = None  # Reused by the backend instead of extracting again
         try:
             ydl_opts_check = {
                 'quiet': True,
                 'extract_flat': True,
+                'noplaylist': True,  # watch?v=...&list=... is the video, as is_playlist_url assumes
             }
             with yt_dlp.YoutubeDL(ydl_opts_check) as ydl:
-                info = ydl.extract_info(url, download=False)
+                info = self.scheduler.run(url, extraction.extract_unprocessed, ydl, url, source='download')
                 if info.get('_type') == 'playlist':
-                    return {
-                        'success': False,
-                        'error': f'Playlist detected with {len(info.get("entries", []))} videos. Please use a direct video URL instead of playlist URL.',
-                        'is_playlist': True,
-                        'first_video_url': f"https://www.youtube.com/watch?v={info['entries'][0]['id']}" if info.get('entries') else None
-                    }
-        except:
-            pass  # Continue with normal download if playlist check fails
+                    summary = extraction.summarise_playlist(info, self.settings.get('playlist_page_size'))
+                    return DownloadResult.failure(
+                        ResultError.create(
+                            ErrorCategory.PLAYLIST,
+                            f'Playlist detected with {summary["playlist_count"]}{"+" if summary["playlist_count_is_estimate"] else ""} videos. Please use a direct video URL instead of playlist URL.'
+                        ),
+                        url=url,
+                        is_playlist=True,
+                        first_video_url=summary['first_video_url']
+                    )
+                live_status = info.get('live_status')
+                video_id = info.get('id')
+                probed = info
+                if output_name is None:
+                    output_name = self.reserve_output_name(info, force=True)
+        except Exception as e:
+            error = ResultError.from_exception(e, 'Could not look up the video: ')
+            if error.category in (ErrorCategory.UNAVAILABLE, ErrorCategory.RATE_LIMITED):
+                return DownloadResult.failure(error, url=url, elapsed=time.monotonic() - started)
+            # Anything else may still work for the downloader itself
+            print(f"Playlist check failed, downloading anyway: {str(e)}")
+        
+        if live_status in LIVE_STATUSES:
+            return self.record_live(url, progress_callback, output_name)
+        
+        staged_dir = self.staging.create(self.download_path) if self.settings.get('staging_enabled') else None
+        work_dir = staged_dir or self.download_path
+        if output_name:
+            output_base = os.path.join(work_dir, output_name)
+            name_template = output_base.replace('%', '%%')
+        else:
+            output_base = None
+            name_template = os.path.join(work_dir, '%(title)s')
+        
+        if clip:
+            if clip.get('chapters'):
+                # One file per matching chapter; names come from yt-dlp's section fields
+                output_base = None
+                name_template += ' [%(section_title)s]'
+            else:
+                suffix = self._clip_suffix(clip)
+                output_base = f'{output_base}{suffix}' if output_base else None
+                name_template += suffix.replace('%', '%%')
+        
+        steps = postprocess if postprocess is not None else self.settings.get('postprocess_steps')
+        wants_postprocess = any(value for key, value in steps.items() if key != 'audio_format')
+        finished_files = []
+        transferred = []
+        seen_bytes = {}
+        
+        # Formats ranked by an earlier info lookup are named directly (yt-dlp's selector stays as the fallback)
+        index = self._format_index(url, video_id)
+        query = self.format_query()
+        video_format = index.selector(query, self.settings.get('format')) if index else self.settings.get('format')
         
         try:
             def progress_hook(d):
+                if self.throughput is not None and d.get('downloaded_bytes'):
+                    previous = seen_bytes.get(d.get('filename'), 0)
+                    seen_bytes[d.get('filename')] = d['downloaded_bytes']
+                    self.throughput.add_bytes(d['downloaded_bytes'] - previous)
                 if progress_callback and d['status'] == 'downloading':
                     percent = d.get('_percent_str', '0%')
                     speed = d.get('_speed_str', 'N/A')
                     progress_callback(percent, speed)
+                elif d['status'] == 'finished':
+                    finished_files.append(d.get('filename'))
+                    transferred.append(d.get('downloaded_bytes') or d.get('total_bytes') or 0)
             
             ydl_opts = {
-                'outtmpl': os.path.join(self.download_path, '%(title)s.%(ext)s'),
-                'format': 'best[height<=720]',  # Download best quality up to 720p
+                'outtmpl': f'{name_template}.%(ext)s',
+                'format': video_format,  # Best quality up to 720p unless changed
                 'progress_hooks': [progress_hook],
                 'noplaylist': True,  # Download only the video, not the playlist
             }
+            if self.settings.get('rate_limit'):
+                ydl_opts['ratelimit'] = self.settings.get('rate_limit')
+            connections = connections or (self.throughput.connections if self.throughput else None)
+            if connections:
+                ydl_opts['concurrent_fragment_downloads'] = connections
+            if clip:
+                ydl_opts.update(self._clip_options(clip))
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([url])
+            # Subtitles and thumbnail come from the same extraction pass as the video
+            assets = assets if assets is not None else self.settings.get('download_assets')
+            if assets.get('subtitles'):
+                ydl_opts['writesubtitles'] = True
+                ydl_opts['writeautomaticsub'] = True
+                ydl_opts['subtitleslangs'] = assets.get('languages', self.settings.get('subtitle_languages'))
+                ydl_opts['subtitlesformat'] = f'{Config.SUBTITLE_FORMAT}/best'
+            if assets.get('thumbnail'):
+                ydl_opts['writethumbnail'] = True
             
-            return {
-                'success': True,
-                'message': f'Video downloaded successfully to {self.download_path}'
-            }
+            if not wants_postprocess:
+                info = engine.download(url, ydl_opts, probed)
+                downloads = info.get('requested_downloads') or [{}]
+                filepath = downloads[0].get('filepath') or engine.prepare_filename(info, ydl_opts)
+            else:
+                if steps.get('merge'):
+                    # Fetch streams as separate files; muxing happens on the post-processing pool
+                    max_height = query.get('max_height') if query else 720
+                    ydl_opts['format'] = merge_selector(index, max_height)
+                    ydl_opts['outtmpl'] = {
+                        'default': f'{name_template}.f%(format_id)s.%(ext)s',
+                        'subtitle': f'{name_template}.%(ext)s',
+                        'thumbnail': f'{name_template}.%(ext)s',
+                    }
+                if steps.get('embed_thumbnail'):
+                    ydl_opts['writethumbnail'] = True
+                
+                info = engine.download(url, ydl_opts, probed)
+                output_path = output_base or engine.prepare_filename(info, ydl_opts, outtmpl=name_template)
+                
+                job = self._build_postprocess_job(info, finished_files, output_path, steps)
+                job['keep_thumbnail'] = bool(assets.get('thumbnail'))
+                future = self.postprocessor.submit(job)
+                if staged_dir:
+                    future = self.staging.publish_when_done(future, staged_dir, self.download_path)
+                
+                return DownloadResult(
+                    True,
+                    f'Video downloaded successfully to {self.download_path}, post-processing started',
+                    url=url,
+                    video_id=info.get('id'),
+                    title=info.get('title'),
+                    output_name=output_name,
+                    duration=None if clip else info.get('duration'),
+                    bytes_downloaded=sum(transferred),
+                    elapsed=time.monotonic() - started,
+                    backend=engine.name,
+                    postprocess=future
+                )
             
         except Exception as e:
-            return {
-                'success': False,
-                'error': f'Download failed: {str(e)}'
-            }
+            if staged_dir:
+                self.staging.discard(staged_dir)
+            return DownloadResult.failure(
+                ResultError.from_exception(e, 'Download failed: '), url=url, elapsed=time.monotonic() - started
+            )
+        
+        if staged_dir:
+            # Outside the try: a failed move must not discard the finished download
+            try:
+                moved = self.staging.publish(staged_dir, self.download_path)
+            except Exception as e:
+                return DownloadResult.failure(
+                    ResultError.create(ErrorCategory.FILESYSTEM, f'Publishing failed: {str(e)} (files kept in {staged_dir})'),
+                    url=url, video_id=info.get('id'), title=info.get('title'), elapsed=time.monotonic() - started
+                )
+            filepath = moved.get(filepath, filepath)
+        
+        return DownloadResult(
+            True,
+            f'Video downloaded successfully to {self.download_path}',
+            url=url,
+            video_id=info.get('id'),
+            title=info.get('title'),
+            filepath=filepath,
+            output_name=output_name,
+            expected_size=None if clip else expected_size(info),
+            duration=None if clip else info.get('duration'),  # Keyframe cuts shift clip lengths
+            bytes_downloaded=sum(transferred),
+            elapsed=time.monotonic() - started,
+            backend=engine.name
+        )
     
-    def get_available_formats(self, url: str) -> Optional[list]:
-        """Get available formats for the video"""
+    def record_live(self, url: str, progress_callback: Optional[Callable] = None,
+                    output_name: Optional[str] = None) -> DownloadResult:
+        """
+        Record a live stream (waiting for a premiere to start) into segment files
+        Segments go straight to the download folder so they survive a crash
+        """
+        output_dir = os.path.join(self.download_path, f"{output_name or 'Live recording'} (live)")
+        recorder = LiveRecorder(url, output_dir, self.settings.get('format'),
+                                self.settings.get('live_segment_seconds'), progress_callback)
+        with self._recordings_lock:
+            self.recordings.add(recorder)
         try:
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
-            }
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                formats = info.get('formats', [])
-                
-                # Filter and format the available formats
-                available_formats = []
-                for fmt in formats:
-                    if fmt.get('vcodec') != 'none':  # Video formats only
-                        available_formats.append({
-                            'format_id': fmt.get('format_id'),
-                            'ext': fmt.get('ext'),
-                            'resolution': fmt.get('resolution', 'Unknown'),
-                            'filesize': fmt.get('filesize', 0)
-                        })
+            return recorder.record()
+        finally:
+            with self._recordings_lock:
+                self.recordings.discard(recorder)
+    
+    def stop_recordings(self):
+        """Stop every live recording, closing their current segments"""
+        with self._recordings_lock:
+            recorders = list(self.recordings)
+        for recorder in recorders:
+            recorder.stop()
+    
+    def _clip_options(self, clip: dict) -> dict:
+        """
+        yt-dlp options for a time range or chapter download
+        Only the selected part is fetched: fragmented formats download just the
+        fragments that cover it, progressive files are read with range requests
+        """
+        ranges = []
+        if clip.get('start') is not None or clip.get('end') is not None:
+            ranges.append((clip.get('start') or 0, clip.get('end') or float('inf')))
+        chapters = [f'(?i){re.escape(name)}' for name in clip.get('chapters') or []]
+        return {
+            'download_ranges': download_range_func(chapters, ranges),
+            'force_keyframes_at_cuts': self.settings.get('clip_precise_cuts'),
+        }
+    
+    def _clip_suffix(self, clip: dict) -> str:
+        """File name suffix such as ' [00.01.00-00.03.00]' for a start/end clip"""
+        start = format_timestamp(clip.get('start') or 0)
+        end = format_timestamp(clip['end']) if clip.get('end') is not None else 'end'
+        return f" [{start}-{end}]".replace(':', '.')
+    
+    def verify_download(self, url: str, result: DownloadResult) -> Optional[Future]:
+        """
+        Verify a successful download in the background and record it in the history
+        Returns a future for the verification result, or None when verification is off
+        """
+        if not result.success or result.live:
+            return None
+        if not self.settings.get('verify_downloads'):
+            # Still record the download so subscriptions know it exists
+            self._record_history(url, result, {'success': None, 'filepath': result.filepath})
+            return None
+        
+        job = {
+            'filepath': result.filepath,
+            'expected_size': result.expected_size,  # Unknown after post-processing
+            'expected_duration': result.duration,
+            'probe': self.settings.get('verify_probe')
+        }
+        if result.postprocess:
+            future = self.verifier.submit_after(result.postprocess, job)
+        else:
+            future = self.verifier.submit(job)
+        future.add_done_callback(lambda done: self._record_history(url, result, done.result()))
+        return future
+    
+    def discard_download(self, filepath: Optional[str]) -> Optional[str]:
+        """
+        Move a download that failed verification out of the way so it can be fetched again
+        The file is renamed to <name>.incomplete (returned) unless verify_delete_incomplete is set
+        """
+        if not filepath or not os.path.isfile(filepath):
+            return None
+        if self.settings.get('verify_delete_incomplete'):
+            os.remove(filepath)
+            kept = None
+        else:
+            kept = filepath + Config.INCOMPLETE_SUFFIX
+            os.replace(filepath, kept)
+        self.paths.forget(filepath)
+        return kept
+    
+    def _record_history(self, url: str, result: DownloadResult, verification: dict):
+        """Append a verified (or failed) download to the history file"""
+        try:
+            entry = self.history.record(make_entry(url, result, verification))
+            with self._history_lock:
+                history, files = self._history_files
+                if history is self.history and entry['filepath'] and entry['id'] and entry['verified'] is not False:
+                    files[os.path.splitext(os.path.abspath(entry['filepath']))[0].casefold()] = entry['id']
+        except Exception as e:
+            print(f"Error writing download history: {str(e)}")
+    
+    def _build_postprocess_job(self, info: dict, files: list, output_base: str, steps: dict) -> dict:
+        """Describe the post-processing work for a finished download"""
+        files = [path for path in files if path]
+        extensions = {os.path.splitext(path)[1].lower() for path in files}
+        container = 'mp4' if extensions <= {'.mp4', '.m4a'} else 'mkv'
+        
+        thumbnail_path = None
+        for thumbnail in info.get('thumbnails') or []:
+            if thumbnail.get('filepath'):
+                thumbnail_path = thumbnail['filepath']
+        
+        return {
+            'files': files,
+            'output_path': f'{output_base}.{container}',
+            'thumbnail_path': thumbnail_path,
+            'metadata': {
+                'title': info.get('title'),
+                'artist': info.get('uploader'),
+                'date': info.get('upload_date'),
+                'comment': info.get('webpage_url'),
+            },
+            'steps': steps
+        }
+    
+    def get_available_formats(self, url: str) -> FormatsResult:
+        """Get available video formats (from the format index when the video was looked up before)"""
+        started = time.monotonic()
+        try:
+            index = self._format_index(url)
+            if index is None:
+                ydl_opts = {
+                    'quiet': True,
+                    'no_warnings': True,
+                }
                 
-                return available_formats
+                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                    info = ydl.sanitize_info(self.scheduler.run(url, ydl.extract_info, url, False, source='info'))
+                index = self.formats.index(info, url)
+            
+            # Video formats only
+            return FormatsResult(True, [{
+                'format_id': fmt['format_id'],
+                'ext': fmt['ext'],
+                'resolution': fmt['resolution'],
+                'filesize': fmt['filesize'] or 0
+            } for fmt in index.with_video()], elapsed=time.monotonic() - started)
         except Exception as e:
-            print(f"Error getting formats: {str(e)}")
-            return None
+            return FormatsResult(False, error=ResultError.from_exception(e, 'Error getting formats: '),
+                                 elapsed=time.monotonic() - started)
+    
+    def shutdown(self):
+        """Release background resources (waits for running post-processing jobs)"""
+        self.stop_recordings()
+        if self.throughput is not None:
+            self.throughput.stop()
+        if self.extraction_pool is not None:
+            self.extraction_pool.shutdown(wait=False)
+        self.postprocessor.shutdown(wait=True, cancel_pending=True)
+        self.verifier.shutdown(wait=True)
+        self.thumbnails.shutdown()
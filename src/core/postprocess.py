@@ -0,0 +1,167 @@
+"""
+Post-processing module for YouTube Video Downloader
+Runs CPU-heavy ffmpeg work (merging, audio extraction, thumbnails, tags)
+in a separate process pool so download workers stay free for network transfer
+"""
+
+import os
+import shutil
+import subprocess
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional
+
+from utils.config import Config
+
+
+def _run_ffmpeg(args: list, output_path: str):
+    """Run ffmpeg writing to a temporary file, then move it over output_path"""
+    ffmpeg = shutil.which(Config.FFMPEG_PATH)
+    if not ffmpeg:
+        raise RuntimeError(f"ffmpeg not found ({Config.FFMPEG_PATH})")
+    
+    base, ext = os.path.splitext(output_path)
+    temp_path = f"{base}.temp{ext}"
+    command = [ffmpeg, '-y', '-loglevel', 'error'] + args + [temp_path]
+    completed = subprocess.run(command, capture_output=True, text=True)
+    if completed.returncode != 0:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise RuntimeError(completed.stderr.strip() or f"ffmpeg exited with code {completed.returncode}")
+    
+    os.replace(temp_path, output_path)
+
+
+def merge_streams(video_path: str, audio_path: str, output_path: str) -> str:
+    """Mux separate video and audio streams into one file without re-encoding"""
+    _run_ffmpeg(['-i', video_path, '-i', audio_path, '-map', '0:v:0', '-map', '1:a:0', '-c', 'copy'], output_path)
+    for path in (video_path, audio_path):
+        if os.path.abspath(path) != os.path.abspath(output_path) and os.path.exists(path):
+            os.remove(path)
+    return output_path
+
+
+def extract_audio(media_path: str, audio_format: str = 'mp3') -> str:
+    """Extract the audio track into a separate file next to the media file"""
+    output_path = os.path.splitext(media_path)[0] + f'.{audio_format}'
+    codec_args = ['-c:a', 'libmp3lame', '-q:a', '2'] if audio_format == 'mp3' else ['-c:a', 'copy']
+    _run_ffmpeg(['-i', media_path, '-vn'] + codec_args, output_path)
+    return output_path
+
+
+def embed_thumbnail(media_path: str, thumbnail_path: str, keep_thumbnail: bool = False) -> str:
+    """Attach a thumbnail image as cover art (re-encoding only the image to JPEG)"""
+    _run_ffmpeg([
+        '-i', media_path, '-i', thumbnail_path, '-map', '0', '-map', '1',
+        '-c', 'copy', '-c:v:1', 'mjpeg', '-disposition:v:1', 'attached_pic'
+    ], media_path)
+    if not keep_thumbnail and os.path.exists(thumbnail_path):
+        os.remove(thumbnail_path)
+    return media_path
+
+
+def add_metadata(media_path: str, metadata: dict) -> str:
+    """Write title/artist/date tags into the container"""
+    args = ['-i', media_path, '-map', '0', '-c', 'copy']
+    for key, value in metadata.items():
+        if value:
+            args += ['-metadata', f'{key}={value}']
+    _run_ffmpeg(args, media_path)
+    return media_path
+
+
+def _init_worker(ffmpeg_path: str):
+    """Carry the parent's ffmpeg setting into spawned worker processes"""
+    Config.FFMPEG_PATH = ffmpeg_path
+
+
+def run_postprocess_job(job: dict) -> dict:
+    """
+    Run every requested step for one downloaded video (executes in a worker process)
+    Returns status dictionary with success/error information
+    """
+    steps = job.get('steps', {})
+    files = job.get('files', [])
+    try:
+        if not files:
+            raise RuntimeError("No downloaded files to process")
+        
+        media_path = files[0]
+        if steps.get('merge') and len(files) > 1:
+            media_path = merge_streams(files[0], files[1], job['output_path'])
+        
+        if steps.get('embed_thumbnail') and job.get('thumbnail_path'):
+            embed_thumbnail(media_path, job['thumbnail_path'], job.get('keep_thumbnail', False))
+        
+        if steps.get('add_metadata') and job.get('metadata'):
+            add_metadata(media_path, job['metadata'])
+        
+        outputs = [media_path]
+        if steps.get('extract_audio'):
+            outputs.append(extract_audio(media_path, steps.get('audio_format', 'mp3')))
+        
+        return {
+            'success': True,
+            'filepath': media_path,
+            'outputs': outputs,
+            'message': f'Post-processing finished for {os.path.basename(media_path)}'
+        }
+    
+    except Exception as e:
+        return {
+            'success': False,
+            'filepath': files[0] if files else None,
+            'error': f'Post-processing failed: {str(e)}'
+        }
+
+
+class PostProcessor:
+    """Process pool that runs post-processing jobs after downloads complete"""
+    
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or Config.POSTPROCESS_WORKERS
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._futures = set()  # Jobs not finished yet
+        self._lock = threading.Lock()
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Create the process pool on first use"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(Config.FFMPEG_PATH,)
+            )
+        return self._executor
+    
+    def submit(self, job: dict) -> Future:
+        """Queue a post-processing job and return its future"""
+        future = self._get_executor().submit(run_postprocess_job, job)
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._forget)
+        return future
+    
+    def _forget(self, future: Future):
+        with self._lock:
+            self._futures.discard(future)
+    
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False) -> int:
+        """
+        Stop the process pool; returns how many queued jobs were cancelled
+        With cancel_pending, jobs that have not started are dropped (their
+        futures end cancelled) and only the running ones are waited for
+        """
+        if self._executor is None:
+            return 0
+        with self._lock:
+            futures = list(self._futures)
+        cancelled = sum(1 for future in futures if future.cancel()) if cancel_pending else 0
+        if cancelled:
+            print(f"Cancelled {cancelled} queued post-processing job(s)")
+        running = sum(1 for future in futures if not future.done())
+        if wait and running:
+            print(f"Waiting for {running} post-processing job(s) to finish...")
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_pending)
+        self._executor = None
+        return cancelled
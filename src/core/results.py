@@ -0,0 +1,197 @@
+"""
+Result types for YouTube Video Downloader
+Typed outcomes of downloads and info lookups, with an error category and
+retryability decided once where the error happens
+"""
+
+import socket
+import sys
+from concurrent.futures import Future
+from dataclasses import dataclass, field, fields
+from typing import Optional
+
+from yt_dlp.networking.exceptions import HTTPError, TransportError
+from yt_dlp.utils import ContentTooShortError, GeoRestrictedError, UnavailableVideoError, UnsupportedError
+
+from core.scheduler import is_rate_limited
+
+
+# __slots__ via dataclass(slots=True) needs Python 3.10+
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+_UNAVAILABLE_MESSAGES = (
+    'private video', 'video unavailable', 'has been removed', 'not available in your country',
+    'sign in to confirm your age', 'members-only', 'copyright'
+)
+_NETWORK_MESSAGES = (
+    'timed out', 'connection', 'unable to download webpage', 'incompleteread', 'temporary failure'
+)
+
+
+class ErrorCategory:
+    """Why an operation failed"""
+    
+    INVALID_URL = 'invalid_url'
+    PLAYLIST = 'playlist'
+    RATE_LIMITED = 'rate_limited'
+    NETWORK = 'network'
+    UNAVAILABLE = 'unavailable'
+    MISSING_TOOL = 'missing_tool'
+    FILESYSTEM = 'filesystem'
+    NOT_LIVE = 'not_live'
+    CANCELLED = 'cancelled'
+    UNKNOWN = 'unknown'
+    
+    RETRYABLE = frozenset({RATE_LIMITED, NETWORK})
+
+
+def _walk_errors(error: BaseException):
+    """The error and everything it wraps (yt-dlp exc_info, __cause__, __context__)"""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        exc_info = getattr(error, 'exc_info', None)
+        error = (exc_info[1] if exc_info else None) or error.__cause__ or error.__context__
+
+
+def classify_exception(error: BaseException) -> str:
+    """Map an exception to an ErrorCategory, by type first and message last"""
+    if is_rate_limited(error):
+        return ErrorCategory.RATE_LIMITED
+    
+    for inner in _walk_errors(error):
+        if isinstance(inner, (GeoRestrictedError, UnavailableVideoError, UnsupportedError)):
+            return ErrorCategory.UNAVAILABLE
+        if isinstance(inner, HTTPError):
+            return ErrorCategory.NETWORK if inner.status >= 500 else ErrorCategory.UNAVAILABLE
+        if isinstance(inner, (TransportError, ContentTooShortError, ConnectionError, socket.timeout, TimeoutError)):
+            return ErrorCategory.NETWORK
+        if isinstance(inner, OSError) and inner.errno is not None:
+            return ErrorCategory.FILESYSTEM
+    
+    # Errors returned from worker processes may only keep their message
+    message = str(error).lower()
+    if any(text in message for text in _UNAVAILABLE_MESSAGES):
+        return ErrorCategory.UNAVAILABLE
+    if any(text in message for text in _NETWORK_MESSAGES):
+        return ErrorCategory.NETWORK
+    return ErrorCategory.UNKNOWN
+
+
+@dataclass(**_DATACLASS_OPTIONS)
+class ResultError:
+    """Error details attached to a failed result"""
+    
+    category: str
+    message: str
+    retryable: bool = False
+    
+    @classmethod
+    def create(cls, category: str, message: str) -> 'ResultError':
+        """Error of a known category"""
+        return cls(category, message, category in ErrorCategory.RETRYABLE)
+    
+    @classmethod
+    def from_exception(cls, error: BaseException, prefix: str = '') -> 'ResultError':
+        """Classify an exception once, where it was caught"""
+        return cls.create(classify_exception(error), f'{prefix}{str(error)}')
+
+
+@dataclass(**_DATACLASS_OPTIONS)
+class DownloadResult:
+    """Outcome of download_video / record_live"""
+    
+    success: bool
+    message: str = ''
+    error: Optional[ResultError] = None
+    url: str = ''
+    video_id: Optional[str] = None
+    title: Optional[str] = None
+    filepath: Optional[str] = None
+    output_name: Optional[str] = None
+    expected_size: Optional[tuple] = None      # (bytes, exact) for verification
+    duration: Optional[float] = None
+    bytes_downloaded: int = 0
+    elapsed: float = 0.0                       # Seconds spent in download_video
+    backend: str = ''                          # Transfer engine that fetched the file
+    is_playlist: bool = False
+    first_video_url: Optional[str] = None
+    live: bool = False
+    segments: list = field(default_factory=list)
+    postprocess: Optional[Future] = None       # Post-processing future (status dict)
+    
+    @classmethod
+    def failure(cls, error: ResultError, **values) -> 'DownloadResult':
+        """Failed result"""
+        return cls(False, error=error, **values)
+    
+    def to_dict(self) -> dict:
+        """JSON-safe copy (without the post-processing future) for sending to another process"""
+        data = {item.name: getattr(self, item.name) for item in fields(self) if item.name != 'postprocess'}
+        data['error'] = None if self.error is None else {
+            'category': self.error.category, 'message': self.error.message, 'retryable': self.error.retryable
+        }
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'DownloadResult':
+        """Rebuild a result sent by to_dict() (unknown keys are ignored)"""
+        names = {item.name for item in fields(cls)} - {'postprocess', 'error'}
+        values = {key: value for key, value in data.items() if key in names}
+        if isinstance(values.get('expected_size'), list):
+            values['expected_size'] = tuple(values['expected_size'])
+        error = data.get('error')
+        if error:
+            values['error'] = ResultError(error['category'], error['message'], bool(error.get('retryable')))
+        return cls(**values)
+    
+    @property
+    def retryable(self) -> bool:
+        """Whether running the same download again may succeed"""
+        return self.error is not None and self.error.retryable
+    
+    @property
+    def error_message(self) -> str:
+        """Error text for display ('' on success)"""
+        return self.error.message if self.error else ''
+
+
+@dataclass(**_DATACLASS_OPTIONS)
+class InfoResult:
+    """Outcome of get_video_info"""
+    
+    success: bool
+    info: Optional[dict] = None
+    error: Optional[ResultError] = None
+    elapsed: float = 0.0
+    
+    @property
+    def retryable(self) -> bool:
+        """Whether looking the video up again may succeed"""
+        return self.error is not None and self.error.retryable
+    
+    @property
+    def error_message(self) -> str:
+        """Error text for display ('' on success)"""
+        return self.error.message if self.error else ''
+
+
+@dataclass(**_DATACLASS_OPTIONS)
+class FormatsResult:
+    """Outcome of get_available_formats"""
+    
+    success: bool
+    formats: list = field(default_factory=list)
+    error: Optional[ResultError] = None
+    elapsed: float = 0.0
+    
+    @property
+    def retryable(self) -> bool:
+        """Whether listing the formats again may succeed"""
+        return self.error is not None and self.error.retryable
+    
+    @property
+    def error_message(self) -> str:
+        """Error text for display ('' on success)"""
+        return self.error.message if self.error else ''
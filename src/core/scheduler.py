@@ -0,0 +1,180 @@
+"""
+Request scheduler for YouTube Video Downloader
+Limits concurrent extraction requests per host, backs off and lowers the
+limit when the host answers 429 (Too Many Requests), and serves callers round-robin
+"""
+
+import random
+import re
+import threading
+import time
+import urllib.parse
+from collections import deque
+from typing import Callable, Optional
+
+from utils.config import Config
+
+
+HOST_ALIASES = {'youtu.be': 'youtube.com'}
+_RATE_LIMIT_MESSAGE = re.compile(r'HTTP Error 429|Too Many Requests', re.IGNORECASE)
+
+
+def host_key(url: str) -> str:
+    """Group URLs by the site they load from (www/m./music. share one budget)"""
+    host = (urllib.parse.urlparse(url).hostname or '').lower()
+    key = '.'.join(host.split('.')[-2:])
+    return HOST_ALIASES.get(key, key)
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    """Check an error (and the errors it wraps) for HTTP 429 responses (a 403 is a refusal, not throttling)"""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        status = getattr(error, 'status', None) or getattr(error, 'code', None)
+        if status == 429 or _RATE_LIMIT_MESSAGE.search(str(error)):
+            return True
+        # yt-dlp's DownloadError keeps the original exception in exc_info
+        exc_info = getattr(error, 'exc_info', None)
+        error = (exc_info[1] if exc_info else None) or error.__cause__ or error.__context__
+    return False
+
+
+class HostState:
+    """Adaptive limits and waiting callers for one host"""
+    
+    def __init__(self):
+        self.limit = Config.SCHEDULER_START_CONCURRENCY
+        self.active = 0
+        self.interval = 0.0         # Minimum gap between request starts
+        self.next_start = 0.0
+        self.backoff_until = 0.0
+        self.successes = 0
+        self.started = deque()      # Start times within the last minute
+        self.waiters = {}           # source -> deque of tickets
+        self.rotation = deque()     # Sources with waiters, in round-robin order
+    
+    def next_ticket(self):
+        """Ticket that gets the next free slot"""
+        return self.waiters[self.rotation[0]][0] if self.rotation else None
+
+
+class RequestScheduler:
+    """
+    Runs extraction calls under a per-host concurrency limit
+    The limit grows by one after a clean round of requests and halves on a
+    429, when every caller for that host also pauses for an exponential backoff
+    """
+    
+    def __init__(self):
+        self._hosts = {}
+        self._condition = threading.Condition()
+    
+    def run(self, url: str, func: Callable, *args, source: str = 'default'):
+        """Call func(*args) when url's host has capacity, retrying rate-limited calls"""
+        host = host_key(url)
+        for attempt in range(Config.SCHEDULER_MAX_RETRIES + 1):
+            self._acquire(host, source)
+            try:
+                result = func(*args)
+            except Exception as e:
+                throttled = is_rate_limited(e)
+                self._release(host, throttled, attempt)
+                if not throttled or attempt == Config.SCHEDULER_MAX_RETRIES:
+                    raise
+                continue
+            self._release(host, False, attempt)
+            return result
+    
+    def stats(self, url_or_host: str) -> dict:
+        """Current limit, activity and request rate for a host"""
+        host = host_key(url_or_host) if '/' in url_or_host else url_or_host
+        with self._condition:
+            state = self._hosts.get(host) or HostState()
+            self._trim(state, time.monotonic())
+            return {
+                'limit': state.limit,
+                'active': state.active,
+                'waiting': sum(len(tickets) for tickets in state.waiters.values()),
+                'interval': state.interval,
+                'requests_last_minute': len(state.started),
+                'backing_off': state.backoff_until > time.monotonic()
+            }
+    
+    def _acquire(self, host: str, source: str):
+        """Wait for this caller's turn and a free slot"""
+        ticket = object()
+        with self._condition:
+            state = self._hosts.setdefault(host, HostState())
+            if source not in state.waiters:
+                state.waiters[source] = deque()
+                state.rotation.append(source)
+            state.waiters[source].append(ticket)
+            
+            while True:
+                now = time.monotonic()
+                if state.active < state.limit and state.next_ticket() is ticket:
+                    delay = max(state.next_start, state.backoff_until) - now
+                    if delay <= 0:
+                        break
+                    self._condition.wait(delay)
+                else:
+                    self._condition.wait()
+            
+            # Take the slot and move this source to the back of the rotation
+            state.waiters[source].popleft()
+            state.rotation.popleft()
+            if state.waiters[source]:
+                state.rotation.append(source)
+            else:
+                del state.waiters[source]
+            state.active += 1
+            state.next_start = now + state.interval
+            state.started.append(now)
+            self._trim(state, now)
+            self._condition.notify_all()
+    
+    def _release(self, host: str, throttled: bool, attempt: int):
+        """Free a slot and adapt the host's limits to the outcome"""
+        with self._condition:
+            state = self._hosts[host]
+            state.active -= 1
+            now = time.monotonic()
+            
+            if throttled:
+                state.limit = max(1, state.limit // 2)
+                state.interval = min(max(state.interval * 2, Config.SCHEDULER_MIN_INTERVAL), Config.SCHEDULER_MAX_INTERVAL)
+                delay = min(Config.SCHEDULER_BACKOFF_SECONDS * 2 ** attempt, Config.SCHEDULER_MAX_BACKOFF_SECONDS)
+                state.backoff_until = max(state.backoff_until, now + delay * random.uniform(0.5, 1.0))
+                state.successes = 0
+            else:
+                state.successes += 1
+                if state.successes >= state.limit:
+                    # A full round without throttling: speed up one step
+                    state.successes = 0
+                    if state.interval > Config.SCHEDULER_MIN_INTERVAL:
+                        state.interval /= 2
+                    elif state.interval:
+                        state.interval = 0.0
+                    elif state.limit < Config.SCHEDULER_MAX_CONCURRENCY:
+                        state.limit += 1
+            
+            self._condition.notify_all()
+    
+    def _trim(self, state: HostState, now: float):
+        """Forget request start times older than a minute"""
+        while state.started and now - state.started[0] > 60:
+            state.started.popleft()
+
+
+_scheduler: Optional[RequestScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> RequestScheduler:
+    """Scheduler shared by everything that talks to YouTube"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RequestScheduler()
+        return _scheduler
@@ -0,0 +1,103 @@
+"""
+Staging module for YouTube Video Downloader
+Downloads are written to a private staging folder and only moved into the
+download folder once complete, so folder watchers never see partial files
+"""
+
+import os
+import shutil
+import tempfile
+from concurrent.futures import CancelledError, Future
+from typing import Optional
+
+
+# Leftovers of interrupted transfers are never published
+INCOMPLETE_SUFFIXES = ('.part', '.ytdl', '.partial')
+
+
+class StagingArea:
+    """Creates per-job staging folders and publishes their contents atomically"""
+    
+    def __init__(self, staging_root: Optional[str] = None):
+        self.staging_root = staging_root
+    
+    def get_root(self, download_path: str) -> str:
+        """Staging root; by default a hidden sibling of the download folder (same filesystem)"""
+        if self.staging_root:
+            return self.staging_root
+        parent, name = os.path.split(os.path.abspath(download_path))
+        return os.path.join(parent, f'.{name}.staging')
+    
+    def create(self, download_path: str) -> str:
+        """Create an empty staging folder for one job"""
+        root = self.get_root(download_path)
+        os.makedirs(root, exist_ok=True)
+        return tempfile.mkdtemp(prefix='job-', dir=root)
+    
+    def publish(self, staged_dir: str, download_path: str) -> dict:
+        """
+        Move every finished file into download_path, keeping relative folders
+        Returns a mapping of staged path -> published path
+        """
+        published = {}
+        for current, _, names in os.walk(staged_dir):
+            for name in names:
+                if name.endswith(INCOMPLETE_SUFFIXES):
+                    continue
+                source = os.path.join(current, name)
+                target = os.path.join(download_path, os.path.relpath(source, staged_dir))
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                self._move_atomic(source, target)
+                published[source] = target
+        
+        self.discard(staged_dir)
+        return published
+    
+    def publish_when_done(self, future: Future, staged_dir: str, download_path: str) -> Future:
+        """Publish after a post-processing future finishes; returns a future for the final result"""
+        published_future = Future()
+        
+        def on_done(done: Future):
+            try:
+                result = done.result()
+            except CancelledError:
+                result = {'success': False, 'error': 'Post-processing cancelled at shutdown'}
+            except Exception as e:
+                result = {'success': False, 'error': f'Post-processing failed: {str(e)}'}
+            # Publish even when post-processing failed so the downloaded streams are kept
+            result = dict(result)
+            try:
+                moved = self.publish(staged_dir, download_path)
+            except Exception as e:
+                result.update(success=False, error=f'Publishing failed: {str(e)} (files kept in {staged_dir})')
+            else:
+                if result.get('filepath'):
+                    result['filepath'] = moved.get(result['filepath'], result['filepath'])
+                result['outputs'] = [moved.get(path, path) for path in result.get('outputs', [])]
+            published_future.set_result(result)
+        
+        future.add_done_callback(on_done)
+        return published_future
+    
+    def discard(self, staged_dir: str):
+        """Remove a staging folder and anything left in it"""
+        shutil.rmtree(staged_dir, ignore_errors=True)
+    
+    def _move_atomic(self, source: str, target: str):
+        """Rename when on the same filesystem, else copy to a hidden temp name and rename"""
+        try:
+            os.replace(source, target)
+            return
+        except OSError:
+            pass  # Different filesystem (e.g. local SSD staging, network share target)
+        
+        directory, name = os.path.split(target)
+        temp_target = os.path.join(directory, f'.{name}.partial')
+        try:
+            shutil.copyfile(source, temp_target)
+            os.replace(temp_target, target)
+        except BaseException:
+            if os.path.exists(temp_target):
+                os.remove(temp_target)
+            raise
+        os.remove(source)
@@ -0,0 +1,237 @@
+"""
+Subscriptions module for YouTube Video Downloader
+Polls channels and playlists for new uploads with flat extraction and
+queues only videos that are neither remembered nor in the download archive
+"""
+
+import itertools
+import json
+import threading
+import time
+import urllib.parse
+from typing import Callable, Iterator, Optional
+
+import yt_dlp
+
+from core import extraction
+from core.scheduler import get_scheduler
+from utils.config import Config
+from utils.settings import atomic_write_json
+
+
+SUBSCRIPTIONS_VERSION = 1
+
+
+def feed_url(url: str) -> str:
+    """
+    URL to poll for a subscription: a channel's root page becomes its Videos tab
+    (the root lists Videos/Shorts/Live as separate tabs, each newest first)
+    """
+    parsed = urllib.parse.urlparse(url)
+    parts = [part for part in parsed.path.split('/') if part]
+    is_root = (len(parts) == 1 and parts[0].startswith('@')) or (len(parts) == 2 and parts[0] in ('channel', 'c', 'user'))
+    if not is_root:
+        return url
+    return urllib.parse.urlunparse(parsed._replace(path='/' + '/'.join(parts + ['videos'])))
+
+
+def iter_feed(url: str) -> Iterator[dict]:
+    """
+    Yield compact entries of a channel or playlist, newest first for channels
+    Continuation pages are only requested if the caller keeps iterating
+    """
+    url = feed_url(url)
+    with yt_dlp.YoutubeDL(extraction.INFO_OPTIONS) as ydl:
+        info = get_scheduler().run(url, extraction.extract_unprocessed, ydl, url, source='subscriptions')
+        if info.get('_type') != 'playlist':
+            yield extraction.compact_entry(info)
+            return
+        for entry in extraction.iter_video_entries(info.get('entries')):
+            yield extraction.compact_entry(entry)
+
+
+def is_newest_first(url: str) -> bool:
+    """Channel feeds list the newest upload first; playlists (?list=) usually add at the end"""
+    return 'list' not in urllib.parse.parse_qs(urllib.parse.urlparse(url).query)
+
+
+class SubscriptionStore:
+    """Subscribed URLs and the video IDs already seen for each, saved as JSON"""
+    
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or Config.SUBSCRIPTIONS_FILE
+        self.subscriptions = {}  # url -> {'url', 'title', 'seen_ids', 'last_checked'}
+        self._lock = threading.RLock()
+    
+    def load(self) -> 'SubscriptionStore':
+        """Read the subscriptions file (a missing or unreadable file means no subscriptions)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as fh:
+                data = json.load(fh)
+            subscriptions = {item['url']: item for item in data.get('subscriptions', [])}
+        except FileNotFoundError:
+            return self
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            print(f"Error reading subscriptions from {self.path}: {str(e)}")
+            return self
+        
+        with self._lock:
+            self.subscriptions = subscriptions
+        return self
+    
+    def save(self):
+        """Write the subscriptions atomically"""
+        with self._lock:
+            data = {'version': SUBSCRIPTIONS_VERSION, 'subscriptions': list(self.subscriptions.values())}
+            atomic_write_json(self.path, data)
+    
+    def add(self, url: str, title: Optional[str] = None) -> bool:
+        """Subscribe to a channel or playlist (False if already subscribed)"""
+        with self._lock:
+            if url in self.subscriptions:
+                return False
+            self.subscriptions[url] = {
+                'url': url,
+                'title': title or url,
+                'newest_first': is_newest_first(url),
+                'seen_ids': [],
+                'last_checked': None
+            }
+            return True
+    
+    def remove(self, url: str) -> bool:
+        """Unsubscribe"""
+        with self._lock:
+            return self.subscriptions.pop(url, None) is not None
+    
+    def urls(self) -> list:
+        """Subscribed URLs"""
+        with self._lock:
+            return list(self.subscriptions)
+    
+    def get(self, url: str) -> Optional[dict]:
+        """State of one subscription"""
+        with self._lock:
+            return self.subscriptions.get(url)
+    
+    def mark_checked(self, url: str, new_ids: list):
+        """
+        Remember newly seen IDs and the check time
+        Channels keep only the most recent IDs: a check stops at the newest
+        known videos, so older ones are never compared again
+        """
+        with self._lock:
+            subscription = self.subscriptions.get(url)
+            if subscription is None:
+                return
+            seen_ids = subscription['seen_ids'] + list(new_ids)
+            if subscription.get('newest_first', True):
+                seen_ids = seen_ids[-Config.SUBSCRIPTION_MAX_SEEN_IDS:]
+            subscription['seen_ids'] = seen_ids
+            subscription['last_checked'] = time.time()
+
+
+class SubscriptionPoller:
+    """
+    Background thread that checks every subscription on an interval
+    Reading a channel feed stops after a run of already-known videos, so a
+    quiet channel costs one lightweight request per poll
+    """
+    
+    def __init__(self, store: SubscriptionStore, get_archive_ids: Callable[[], set],
+                 enqueue: Callable[[list], None], interval_minutes: Optional[int] = None,
+                 backfill: bool = False, get_entries: Callable[[str], Iterator[dict]] = iter_feed):
+        self.store = store
+        self.get_archive_ids = get_archive_ids
+        self.enqueue = enqueue
+        self.interval_minutes = Config.SUBSCRIPTION_POLL_MINUTES if interval_minutes is None else interval_minutes
+        self.backfill = backfill
+        self.get_entries = get_entries
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._poll_lock = threading.Lock()
+        self._last_poll = 0.0
+    
+    def start(self):
+        """Start polling in the background (no-op when the interval is 0)"""
+        if self._thread is None and self.interval_minutes > 0:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+    
+    def stop(self):
+        """Stop the polling thread"""
+        self._stopped.set()
+        self._wake.set()
+    
+    def poll_soon(self):
+        """Run the next poll now instead of waiting for the interval"""
+        self._wake.set()
+    
+    def poll_once(self) -> int:
+        """Check every subscription once; returns the number of videos queued"""
+        with self._poll_lock:
+            urls = self.store.urls()
+            if not urls:
+                return 0
+            archive_ids = self.get_archive_ids()
+            queued = 0
+            for url in urls:
+                try:
+                    queued += self.check(url, archive_ids)
+                except Exception as e:
+                    print(f"Error checking subscription {url}: {str(e)}")
+            self.store.save()
+            self._last_poll = time.time()
+            return queued
+    
+    def poll_url(self, url: str) -> int:
+        """Check one subscription now (e.g. right after subscribing)"""
+        with self._poll_lock:
+            queued = self.check(url, self.get_archive_ids())
+            self.store.save()
+            if len(self.store.urls()) == 1:
+                self._last_poll = time.time()
+            return queued
+    
+    def check(self, url: str, archive_ids: set) -> int:
+        """Queue new videos of one subscription and remember what was seen"""
+        subscription = self.store.get(url)
+        if subscription is None:
+            return 0
+        first_poll = subscription['last_checked'] is None
+        newest_first = subscription.get('newest_first', True)
+        known = set(subscription['seen_ids']) | archive_ids
+        
+        entries = self.get_entries(url)
+        if first_poll and newest_first and not self.backfill:
+            # Later checks stop at the newest known videos, so the first page is enough to remember
+            entries = itertools.islice(entries, Config.SUBSCRIPTION_SEED_ENTRIES)
+        
+        new_entries = []
+        known_in_a_row = 0
+        for entry in entries:
+            if entry['id'] in known:
+                known_in_a_row += 1
+                # Older videos follow; playlists have to be read to the end
+                if newest_first and known_in_a_row >= Config.SUBSCRIPTION_STOP_AFTER_KNOWN:
+                    break
+                continue
+            known_in_a_row = 0
+            new_entries.append(entry)
+            known.add(entry['id'])
+        
+        self.store.mark_checked(url, [entry['id'] for entry in new_entries])
+        if first_poll and not self.backfill:
+            return 0  # Only uploads after subscribing are downloaded
+        if new_entries:
+            self.enqueue(new_entries)
+        return len(new_entries)
+    
+    def _run(self):
+        """Polling loop (the first poll runs straight away unless one just ran)"""
+        while not self._stopped.is_set():
+            if time.time() - self._last_poll >= Config.SUBSCRIPTION_MIN_GAP_SECONDS:
+                self.poll_once()
+            self._wake.wait(self.interval_minutes * 60)
+            self._wake.clear()
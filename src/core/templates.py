@@ -0,0 +1,148 @@
+"""
+Output template module for YouTube Video Downloader
+Renders portable, length-limited file names from video metadata and
+reserves them across the whole queue so no two jobs write the same path
+"""
+
+import os
+import re
+import threading
+from typing import Callable, Optional
+
+from utils.config import Config
+
+
+_FIELD_PATTERN = re.compile(r'{(\w+)}')
+_ILLEGAL_CHARS = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+_WINDOWS_RESERVED = {'CON', 'PRN', 'AUX', 'NUL'} | {f'COM{n}' for n in range(1, 10)} | {f'LPT{n}' for n in range(1, 10)}
+
+
+def truncate_bytes(value: str, max_bytes: int) -> str:
+    """Cut a string to at most max_bytes of UTF-8 without splitting characters"""
+    encoded = value.encode('utf-8')
+    if len(encoded) <= max_bytes:
+        return value
+    return encoded[:max_bytes].decode('utf-8', errors='ignore').rstrip(' .')
+
+
+def sanitize_component(value: str, max_bytes: Optional[int] = None) -> str:
+    """Make a single path component valid on Windows, macOS and Linux"""
+    value = _ILLEGAL_CHARS.sub('_', str(value))
+    value = ' '.join(value.split()).strip(' .')
+    if value.split('.')[0].upper() in _WINDOWS_RESERVED:
+        value = f'_{value}'
+    if max_bytes:
+        value = truncate_bytes(value, max_bytes)
+    return value or '_'
+
+
+def template_metadata(info: dict) -> dict:
+    """Collect the fields templates may use from an info dict or playlist entry"""
+    metadata = {key: info.get(key) for key in (
+        'id', 'title', 'uploader', 'channel', 'upload_date', 'playlist', 'playlist_index'
+    ) if info.get(key) is not None}
+    upload_date = str(info.get('upload_date') or '')
+    if len(upload_date) == 8 and upload_date.isdigit():
+        metadata.update(year=upload_date[:4], month=upload_date[4:6], day=upload_date[6:])
+    return metadata
+
+
+class OutputTemplate:
+    """
+    File name template such as '{uploader}/{year}/{title} [{id}]'
+    '/' separates folders; the extension is added by the downloader
+    """
+    
+    def __init__(self, template: str, max_bytes: Optional[int] = None):
+        self.template = template.replace('\\', '/')
+        self.max_bytes = max_bytes or Config.FILENAME_MAX_BYTES
+        self.fields = set(_FIELD_PATTERN.findall(self.template))
+    
+    def can_render(self, metadata: dict) -> bool:
+        """Check whether every field the template uses is known"""
+        return all(metadata.get(field) not in (None, '') for field in self.fields)
+    
+    def render(self, metadata: dict) -> str:
+        """Render a relative path (without extension); unknown fields become 'NA'"""
+        def substitute(match):
+            value = metadata.get(match.group(1))
+            return sanitize_component('NA' if value in (None, '') else value)
+        
+        components = [
+            sanitize_component(_FIELD_PATTERN.sub(substitute, part), self.max_bytes)
+            for part in self.template.split('/') if part.strip()
+        ]
+        return os.path.join(*components) if components else '_'
+
+
+class PathRegistry:
+    """
+    Hands out unique output paths per download folder
+    Paths are compared case-insensitively against earlier reservations and
+    files already on disk, so the result is the same on every platform
+    A file on disk that belongs to the same video is reused rather than
+    suffixed; owner_of(path) names the video recorded for a path (no extension)
+    """
+    
+    def __init__(self, owner_of: Optional[Callable[[str], Optional[str]]] = None):
+        self.owner_of = owner_of
+        self._reserved = {}
+        self._existing = {}
+        self._lock = threading.Lock()
+    
+    def reserve(self, root: str, relative_path: str, video_id: Optional[str] = None) -> str:
+        """Reserve relative_path under root, adding an ID or counter suffix on collision"""
+        with self._lock:
+            reserved = self._reserved.setdefault(os.path.abspath(root), set())
+            candidates = [relative_path]
+            if video_id and video_id not in os.path.basename(relative_path):
+                candidates.append(f'{relative_path} [{video_id}]')
+            
+            counter = 2
+            while True:
+                for candidate in candidates:
+                    key = candidate.casefold()
+                    if key in reserved:
+                        continue
+                    if not self._exists_on_disk(root, candidate) or self._belongs_to(root, candidate, video_id):
+                        # An earlier download of the same video keeps its name (yt-dlp skips or replaces it)
+                        reserved.add(key)
+                        return candidate
+                candidates = [f'{relative_path} ({counter})']
+                counter += 1
+    
+    def release(self, root: str, relative_path: str):
+        """Give a reservation back (e.g. when a job is cancelled or fails)"""
+        with self._lock:
+            self._reserved.get(os.path.abspath(root), set()).discard(relative_path.casefold())
+    
+    def forget(self, path: str):
+        """Drop the cached listing of path's folder (after a file there was deleted or renamed)"""
+        with self._lock:
+            self._existing.pop(os.path.dirname(os.path.abspath(path)), None)
+    
+    def _belongs_to(self, root: str, relative_path: str, video_id: Optional[str]) -> bool:
+        """Check whether the file at relative_path is an earlier download of video_id"""
+        if not video_id:
+            return False
+        if video_id in os.path.basename(relative_path):
+            return True
+        return self.owner_of is not None and self.owner_of(os.path.join(os.path.abspath(root), relative_path)) == video_id
+    
+    def _exists_on_disk(self, root: str, relative_path: str) -> bool:
+        """Check for any file named relative_path.<something>, scanning each folder once"""
+        directory = os.path.abspath(os.path.join(root, os.path.dirname(relative_path)))
+        stems = self._existing.get(directory)
+        if stems is None:
+            stems = set()
+            try:
+                names = os.listdir(directory)
+            except OSError:
+                names = []
+            for name in names:
+                # 'a.b.mp4' can belong to stem 'a' or 'a.b'
+                parts = name.split('.')
+                for end in range(1, len(parts)):
+                    stems.add('.'.join(parts[:end]).casefold())
+            self._existing[directory] = stems
+        return os.path.basename(relative_path).casefold() in stems
@@ -0,0 +1,211 @@
+"""
+Adaptive concurrency for YouTube Video Downloader
+Measures aggregate download throughput and hill-climbs the number of
+simultaneous downloads and per-file connections towards the fastest setting
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+from yt_dlp.utils import format_bytes
+
+from utils.config import Config
+
+
+DOWNLOADS = 'downloads'
+CONNECTIONS = 'connections'
+
+
+class ThroughputController:
+    """
+    Tunes parallelism from measured throughput
+    Every interval the bytes reported by progress hooks are turned into a
+    throughput sample. One knob at a time is moved a step; a step that raises
+    throughput by at least min_gain is kept and repeated, a step that lowers it
+    is undone, and a step that changes nothing is kept only if it used fewer
+    resources. Once neither knob helps the setting is held for a while, then
+    the search starts again so it keeps following the link.
+    """
+    
+    def __init__(self, downloads: int, connections: int, max_downloads: Optional[int] = None,
+                 max_connections: Optional[int] = None, interval: Optional[float] = None,
+                 min_gain: Optional[float] = None, log_path: Optional[str] = None,
+                 on_change: Optional[Callable[[int, int], None]] = None):
+        self.limits = {
+            DOWNLOADS: max(downloads, max_downloads or Config.ADAPTIVE_MAX_DOWNLOADS),
+            CONNECTIONS: max(connections, max_connections or Config.ADAPTIVE_MAX_CONNECTIONS)
+        }
+        self.values = {DOWNLOADS: downloads, CONNECTIONS: connections}
+        self.interval = interval or Config.ADAPTIVE_INTERVAL_SECONDS
+        self.min_gain = Config.ADAPTIVE_MIN_GAIN if min_gain is None else min_gain
+        self.log_path = log_path
+        self.on_change = on_change
+        self.throughput = 0.0
+        self.best_throughput = 0.0
+        self.decisions = deque(maxlen=Config.ADAPTIVE_DECISION_HISTORY)
+        self._bytes = 0
+        self._window_start = time.monotonic()
+        self._baseline: Optional[float] = None
+        self._step: Optional[tuple] = None   # (knob, delta) being measured
+        self._knob = DOWNLOADS
+        self._directions = {DOWNLOADS: 1, CONNECTIONS: 1}
+        self._rejected = set()              # Knobs whose last step was undone
+        self._hold = 0                      # Samples left before probing again
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def downloads(self) -> int:
+        """Number of downloads to run at once"""
+        return self.values[DOWNLOADS]
+    
+    @property
+    def connections(self) -> int:
+        """Connections (or fragments) per download"""
+        return self.values[CONNECTIONS]
+    
+    def add_bytes(self, count: int):
+        """Count transferred bytes (called from progress hooks on any thread)"""
+        if count > 0:
+            with self._lock:
+                self._bytes += count
+    
+    def start(self):
+        """Start sampling in the background"""
+        if self._thread is None:
+            self._window_start = time.monotonic()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+    
+    def stop(self):
+        """Stop the sampling thread"""
+        self._stopped.set()
+    
+    def tick(self, now: Optional[float] = None) -> Optional[dict]:
+        """Take one throughput sample and adjust; returns the decision (None while idle)"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            elapsed = now - self._window_start
+            if elapsed <= 0:
+                return None
+            throughput = self._bytes / elapsed
+            self._bytes = 0
+            self._window_start = now
+            
+            if throughput == 0:
+                # Nothing downloading: the next sample starts a fresh comparison
+                self._baseline = None
+                self._step = None
+                return None
+            
+            before = dict(self.values)
+            decision = self._decide(throughput)
+            self.throughput = throughput
+            self.best_throughput = max(self.best_throughput, throughput)
+            decision.update(time=time.time(), throughput=throughput, **self.values)
+            self.decisions.append(decision)
+            changed = self.values != before
+        
+        self._report(decision, changed)
+        if changed and self.on_change:
+            self.on_change(self.downloads, self.connections)
+        return decision
+    
+    def diagnostics(self) -> dict:
+        """Current setting, measured throughput and recent decisions"""
+        with self._lock:
+            return {
+                'downloads': self.downloads,
+                'connections': self.connections,
+                'throughput': self.throughput,
+                'best_throughput': self.best_throughput,
+                'measuring': self._step[0] if self._step else None,
+                'decisions': list(self.decisions)
+            }
+    
+    def _decide(self, throughput: float) -> dict:
+        """Judge the last step against the baseline and choose the next one"""
+        baseline, step = self._baseline, self._step
+        self._step = None
+        
+        if baseline is None:
+            self._baseline = throughput
+            if self._hold:
+                self._hold -= 1
+                return {'action': 'hold', 'reason': 'settled; measured the current setting'}
+            return self._probe('baseline', 'measured the current setting')
+        
+        if step is None:
+            # Holding a settled setting; a clear change on the link ends the hold early
+            change = (throughput - baseline) / baseline
+            if self._hold and abs(change) < 2 * self.min_gain:
+                self._hold -= 1
+                return {'action': 'hold', 'reason': f'settled; throughput {change:+.0%}'}
+            self._hold = 0
+            self._baseline = throughput
+            return self._probe('baseline', f'throughput {change:+.0%} since settling')
+        
+        knob, delta = step
+        change = (throughput - baseline) / baseline
+        if change >= self.min_gain:
+            self._rejected.clear()
+            self._baseline = throughput
+            return self._probe('keep', f'{knob} {delta:+d} raised throughput {change:+.0%}', knob)
+        
+        if change <= -self.min_gain or delta > 0:
+            # Slower, or no faster for more parallelism: go back
+            self.values[knob] -= delta
+            self._directions[knob] = -self._directions[knob]
+            self._rejected.add(knob)
+            action = 'revert'
+            reason = f'{knob} {delta:+d} changed throughput {change:+.0%}'
+        else:
+            self._rejected.clear()
+            action = 'keep'
+            reason = f'{knob} {delta:+d} kept throughput with fewer resources'
+        self._knob = CONNECTIONS if knob == DOWNLOADS else DOWNLOADS
+        self._baseline = None
+        if self._rejected == {DOWNLOADS, CONNECTIONS}:
+            self._rejected.clear()
+            self._hold = Config.ADAPTIVE_HOLD_SAMPLES
+            reason += '; settled'
+        return {'action': action, 'reason': reason}
+    
+    def _probe(self, action: str, reason: str, knob: Optional[str] = None) -> dict:
+        """Move one knob a step in its current direction (or the other knob when at a limit)"""
+        knobs = [knob or self._knob]
+        knobs.append(CONNECTIONS if knobs[0] == DOWNLOADS else DOWNLOADS)
+        for candidate in knobs:
+            for direction in (self._directions[candidate], -self._directions[candidate]):
+                value = self.values[candidate] + direction
+                if 1 <= value <= self.limits[candidate]:
+                    self._directions[candidate] = direction
+                    self._knob = candidate
+                    self.values[candidate] = value
+                    self._step = (candidate, direction)
+                    return {'action': action, 'reason': f'{reason}; trying {candidate} {direction:+d}'}
+        return {'action': action, 'reason': reason}
+    
+    def _report(self, decision: dict, changed: bool):
+        """Print setting changes and append every decision to the diagnostics log"""
+        if changed:
+            print(f"Adaptive concurrency: {format_bytes(decision['throughput'])}/s measured, now "
+                  f"{decision['downloads']} downloads x {decision['connections']} connections ({decision['reason']})")
+        if not self.log_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+            with open(self.log_path, 'a', encoding='utf-8') as fh:
+                fh.write(json.dumps(decision) + '\n')
+        except OSError as e:
+            print(f"Error writing diagnostics: {str(e)}")
+    
+    def _run(self):
+        """Sampling loop"""
+        while not self._stopped.wait(self.interval):
+            self.tick()
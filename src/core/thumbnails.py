@@ -0,0 +1,193 @@
+"""
+Thumbnail previews for YouTube Video Downloader
+Fetches thumbnails off the GUI thread, downscales them once and keeps the
+small PNGs in a memory LRU backed by an on-disk LRU keyed by video ID
+"""
+
+import hashlib
+import io
+import os
+import re
+import threading
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from utils.config import Config
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; without it only already-cached previews are shown
+    Image = None
+
+
+_SAFE_ID = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+
+def fetch_bytes(url: str) -> bytes:
+    """Download a thumbnail image"""
+    with urllib.request.urlopen(url, timeout=Config.TIMEOUT) as response:
+        return response.read()
+
+
+def make_preview(data: bytes, size: tuple) -> bytes:
+    """Decode an image and downscale it to fit size, returned as PNG (which Tk reads natively)"""
+    with Image.open(io.BytesIO(data)) as image:
+        image = image.convert('RGB')
+        image.thumbnail(size, Image.LANCZOS)
+        output = io.BytesIO()
+        image.save(output, 'PNG', optimize=True)
+        return output.getvalue()
+
+
+class ThumbnailCache:
+    """
+    Preview images by video ID: memory first, then disk, then the network
+    Each image is fetched and decoded once; concurrent requests for the same
+    video share one load
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = None, memory_items: Optional[int] = None,
+                 disk_bytes: Optional[int] = None, size: Optional[tuple] = None,
+                 max_workers: Optional[int] = None, fetch: Callable[[str], bytes] = fetch_bytes):
+        self.cache_dir = cache_dir or Config.THUMBNAIL_CACHE_DIR
+        self.memory_items = memory_items or Config.THUMBNAIL_MEMORY_ITEMS
+        self.disk_bytes = Config.THUMBNAIL_CACHE_MB * 1024 * 1024 if disk_bytes is None else disk_bytes
+        self.size = size or Config.THUMBNAIL_PREVIEW_SIZE
+        self.max_workers = max_workers or Config.THUMBNAIL_WORKERS
+        self.fetch = fetch
+        self._memory = OrderedDict()  # video ID -> PNG bytes
+        self._loading = {}            # video ID -> Future shared by concurrent callers
+        self._disk_usage: Optional[int] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def can_decode() -> bool:
+        """Whether new thumbnails can be decoded (needs Pillow)"""
+        return Image is not None
+    
+    def get_cached(self, video_id: str) -> Optional[bytes]:
+        """Preview from memory only (safe to call on the GUI thread)"""
+        with self._lock:
+            data = self._memory.get(video_id)
+            if data is not None:
+                self._memory.move_to_end(video_id)
+            return data
+    
+    def load(self, video_id: str, url: Optional[str]) -> Future:
+        """Future for the PNG preview (None when it cannot be loaded)"""
+        with self._lock:
+            data = self._memory.get(video_id)
+            if data is not None:
+                self._memory.move_to_end(video_id)
+                future = Future()
+                future.set_result(data)
+                return future
+            future = self._loading.get(video_id)
+            if future is None:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='thumbnail')
+                future = self._executor.submit(self._load, video_id, url)
+                self._loading[video_id] = future
+            return future
+    
+    def shutdown(self):
+        """Stop the loader threads"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+    
+    def _load(self, video_id: str, url: Optional[str]) -> Optional[bytes]:
+        """Read the disk cache or fetch, decode and store a new preview"""
+        try:
+            data = self._read_disk(video_id)
+            if data is None and url and self.can_decode():
+                data = make_preview(self.fetch(url), self.size)
+                self._write_disk(video_id, data)
+            if data is not None:
+                self._remember(video_id, data)
+            return data
+        except Exception as e:
+            print(f"Error loading thumbnail for {video_id}: {str(e)}")
+            return None
+        finally:
+            with self._lock:
+                self._loading.pop(video_id, None)
+    
+    def _remember(self, video_id: str, data: bytes):
+        """Add a preview to the memory LRU"""
+        with self._lock:
+            self._memory[video_id] = data
+            self._memory.move_to_end(video_id)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+    
+    def _path(self, video_id: str) -> str:
+        """Cache file for a video (IDs that are not plain file names are hashed)"""
+        name = video_id if _SAFE_ID.match(video_id) else hashlib.sha1(video_id.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f'{name}.png')
+    
+    def _read_disk(self, video_id: str) -> Optional[bytes]:
+        """Cached preview from disk; a hit counts as a use for eviction"""
+        path = self._path(video_id)
+        try:
+            with open(path, 'rb') as fh:
+                data = fh.read()
+            os.utime(path)
+            return data
+        except OSError:
+            return None
+    
+    def _write_disk(self, video_id: str, data: bytes):
+        """Store a preview and evict the least recently used files over the size limit"""
+        if self.disk_bytes <= 0:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(video_id)
+        temp_path = f'{path}.{threading.get_ident()}.part'
+        with open(temp_path, 'wb') as fh:
+            fh.write(data)
+        os.replace(temp_path, path)
+        
+        with self._lock:
+            if self._disk_usage is None:
+                self._disk_usage = sum(size for _, _, size in self._disk_entries())
+            else:
+                self._disk_usage += len(data)
+            if self._disk_usage > self.disk_bytes:
+                self._evict_disk()
+    
+    def _disk_entries(self) -> list:
+        """(mtime, path, size) of every cached preview"""
+        entries = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith('.png'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path, stat.st_size))
+        return entries
+    
+    def _evict_disk(self):
+        """Delete the oldest previews until the cache is back under its limit (lock held)"""
+        entries = sorted(self._disk_entries())
+        usage = sum(size for _, _, size in entries)
+        for _, path, size in entries:
+            if usage <= self.disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            usage -= size
+        self._disk_usage = usage
@@ -0,0 +1,156 @@
+"""
+Verification module for YouTube Video Downloader
+Checks finished downloads for truncation (size and, when ffprobe is
+available, container duration) and computes their checksum off the download threads
+"""
+
+import hashlib
+import os
+import shutil
+import subprocess
+import threading
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Optional
+
+from utils.config import Config
+
+
+def expected_size(info: dict) -> Optional[tuple]:
+    """
+    Expected size of the downloaded file as (bytes, exact)
+    Returns None when the extractor reported no size
+    """
+    formats = info.get('requested_formats') or [info]
+    if len(formats) == 1 and formats[0].get('filesize'):
+        return formats[0]['filesize'], True
+    
+    # Merged streams or approximate sizes are only compared within a tolerance
+    sizes = [fmt.get('filesize') or fmt.get('filesize_approx') for fmt in formats]
+    if not all(sizes):
+        return None
+    return sum(sizes), False
+
+
+def file_checksum(path: str, algorithm: Optional[str] = None) -> str:
+    """Hash a file in chunks (hashlib releases the GIL on large buffers)"""
+    digest = hashlib.new(algorithm or Config.CHECKSUM_ALGORITHM)
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(Config.CHECKSUM_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def probe_container(path: str, expected_duration: Optional[float] = None) -> Optional[str]:
+    """
+    Ask ffprobe whether the container is readable and complete
+    Returns an error description, or None when the file looks fine or ffprobe is missing
+    Only a failed probe or a duration shortfall counts; warnings on stderr and
+    containers without a duration are left alone
+    """
+    ffprobe = shutil.which(Config.FFPROBE_PATH)
+    if not ffprobe:
+        return None
+    
+    completed = subprocess.run(
+        [ffprobe, '-v', 'error', '-show_entries', 'format=duration', '-of', 'default=nw=1:nk=1', path],
+        capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        return completed.stderr.strip() or f"ffprobe exited with code {completed.returncode}"
+    
+    if expected_duration:
+        try:
+            duration = float(completed.stdout.strip())
+        except ValueError:
+            return None  # 'N/A' for some containers; nothing to compare
+        if duration < expected_duration * (1 - Config.VERIFY_DURATION_TOLERANCE):
+            return f"Duration {duration:.0f}s is shorter than the expected {expected_duration:.0f}s"
+    return None
+
+
+def verify_file(job: dict) -> dict:
+    """
+    Verify one finished download
+    job keys: filepath, expected_size ((bytes, exact) or None), expected_duration, probe
+    Returns status dictionary; 'mismatch' is set when the file looks incomplete
+    """
+    path = job.get('filepath')
+    if not path or not os.path.isfile(path):
+        return {'success': False, 'mismatch': True, 'filepath': path, 'error': 'Downloaded file is missing'}
+    
+    try:
+        size = os.path.getsize(path)
+        problem = None
+        
+        if job.get('expected_size'):
+            expected, exact = job['expected_size']
+            tolerance = 0 if exact else expected * Config.VERIFY_SIZE_TOLERANCE
+            if size < expected - tolerance:
+                problem = f"Size {size} bytes is smaller than the expected {expected} bytes"
+        
+        if problem is None and job.get('probe'):
+            problem = probe_container(path, job.get('expected_duration'))
+        
+        if problem:
+            return {'success': False, 'mismatch': True, 'filepath': path, 'size': size,
+                    'error': f'Verification failed: {problem}'}
+        
+        return {
+            'success': True,
+            'mismatch': False,
+            'filepath': path,
+            'size': size,
+            'checksum': f'{Config.CHECKSUM_ALGORITHM}:{file_checksum(path)}',
+            'message': f'Verified {os.path.basename(path)}'
+        }
+    
+    except Exception as e:
+        return {'success': False, 'mismatch': False, 'filepath': path, 'error': f'Verification error: {str(e)}'}
+
+
+class Verifier:
+    """Small thread pool that verifies finished downloads in the background"""
+    
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or Config.VERIFY_WORKERS
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Create the pool on first use"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='verify')
+            return self._executor
+    
+    def submit(self, job: dict) -> Future:
+        """Queue a verification job"""
+        return self._get_executor().submit(verify_file, job)
+    
+    def submit_after(self, future: Future, job: dict) -> Future:
+        """Verify once a post-processing future finishes, using the path it produced"""
+        verified = Future()
+        
+        def on_done(done: Future):
+            try:
+                result = done.result()
+            except CancelledError:
+                result = {'success': False, 'error': 'Post-processing cancelled at shutdown'}
+            except Exception as e:
+                result = {'success': False, 'error': f'Post-processing failed: {str(e)}'}
+            if not result.get('success'):
+                verified.set_result(dict(result, mismatch=False))
+                return
+            
+            inner = self.submit(dict(job, filepath=result.get('filepath') or job.get('filepath')))
+            inner.add_done_callback(lambda finished: verified.set_result(finished.result()))
+        
+        future.add_done_callback(on_done)
+        return verified
+    
+    def shutdown(self, wait: bool = True):
+        """Stop the pool"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
@@ -0,0 +1,159 @@
+"""
+Download file writer for YouTube Video Downloader
+Collects received blocks into large aligned writes, preallocates the file
+when its size is known and syncs it to disk according to the fsync policy
+"""
+
+import errno
+import os
+import threading
+from typing import Optional
+
+from utils.config import Config
+
+
+FSYNC_POLICIES = ('never', 'end', 'interval')
+
+
+def preallocate(fd: int, size: int) -> bool:
+    """
+    Reserve size bytes for an open file
+    Uses posix_fallocate where the OS and filesystem support it (one
+    contiguous extent, out-of-space errors up front); otherwise the file is
+    only extended. Returns whether blocks were actually reserved.
+    """
+    if size <= 0:
+        return False
+    if hasattr(os, 'posix_fallocate'):
+        try:
+            os.posix_fallocate(fd, 0, size)
+            return True
+        except OSError as e:
+            # Filesystems without fallocate support (some network shares)
+            if e.errno not in (errno.EOPNOTSUPP, errno.EINVAL, errno.ENOSYS):
+                raise
+    os.ftruncate(fd, size)
+    return False
+
+
+def fsync_file(path: str):
+    """Flush a finished file to disk"""
+    fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class DownloadWriter:
+    """
+    One output file shared by the connections of a download
+    Each connection writes through its own stream(); streams hand the file
+    whole buffers at positions that end on an alignment boundary
+    """
+    
+    def __init__(self, path: str, size: Optional[int] = None, buffer_size: Optional[int] = None,
+                 allocate: Optional[bool] = None, fsync: Optional[str] = None):
+        self.path = path
+        self.size = size
+        buffer_size = Config.WRITE_BUFFER_SIZE if buffer_size is None else buffer_size
+        self.buffer_size = -(-buffer_size // Config.WRITE_ALIGNMENT) * Config.WRITE_ALIGNMENT
+        self.fsync = fsync or Config.FSYNC_POLICY
+        if self.fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {self.fsync}")
+        self.writes = 0
+        self.end = 0                # Furthest byte written
+        self._unsynced = 0
+        self._lock = threading.Lock()
+        self.fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o666)
+        try:
+            allocate = Config.PREALLOCATE_DOWNLOADS if allocate is None else allocate
+            self.preallocated = bool(size and allocate and preallocate(self.fd, size))
+        except BaseException:
+            os.close(self.fd)
+            raise
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close(sync=exc_type is None)
+    
+    def stream(self, offset: int = 0) -> 'WriteStream':
+        """Buffered sequential writer starting at offset"""
+        return WriteStream(self, offset)
+    
+    def write_at(self, offset: int, data) -> int:
+        """Write all of data at offset (positional, safe from several threads)"""
+        view = memoryview(data)
+        written = 0
+        while written < len(view):
+            if hasattr(os, 'pwrite'):
+                count = os.pwrite(self.fd, view[written:], offset + written)
+            else:
+                with self._lock:
+                    os.lseek(self.fd, offset + written, os.SEEK_SET)
+                    count = os.write(self.fd, view[written:])
+            written += count
+        view.release()
+        
+        sync = False
+        with self._lock:
+            self.writes += 1
+            self.end = max(self.end, offset + written)
+            self._unsynced += written
+            if self.fsync == 'interval' and self._unsynced >= Config.FSYNC_INTERVAL_BYTES:
+                self._unsynced = 0
+                sync = True
+        if sync:
+            os.fsync(self.fd)
+        return written
+    
+    def close(self, sync: bool = True):
+        """
+        Close the file, syncing it first unless the policy is 'never'
+        A file preallocated from a size hint that turned out wrong is cut to what was written
+        """
+        if self.fd < 0:
+            return
+        try:
+            if sync and self.size and self.end != self.size:
+                os.ftruncate(self.fd, self.end)
+            if sync and self.fsync != 'never':
+                os.fsync(self.fd)
+        finally:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class WriteStream:
+    """Sequential writes of one connection, collected into buffer_size writes"""
+    
+    def __init__(self, writer: DownloadWriter, offset: int):
+        self.writer = writer
+        self.offset = offset        # File position of the first buffered byte
+        self.buffer = bytearray()
+    
+    def write(self, data):
+        """Buffer data; full buffers go to the file ending on an aligned position"""
+        if not self.writer.buffer_size:
+            self.offset += self.writer.write_at(self.offset, data)
+            return
+        self.buffer += data
+        if len(self.buffer) < self.writer.buffer_size:
+            return
+        end = (self.offset + len(self.buffer)) // Config.WRITE_ALIGNMENT * Config.WRITE_ALIGNMENT
+        self._write(end - self.offset)
+    
+    def flush(self):
+        """Write whatever is buffered"""
+        if self.buffer:
+            self._write(len(self.buffer))
+    
+    def _write(self, count: int):
+        with memoryview(self.buffer) as view:
+            chunk = view[:count]
+            self.writer.write_at(self.offset, chunk)
+            chunk.release()
+        del self.buffer[:count]
+        self.offset += count
@@ -5,25 +5,50 @@ MVC Architecture Implementation with Splash Screen
 
 import sys
 import os
+import multiprocessing
 
 # Add current directory to Python path for relative imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
 if current_dir not in sys.path:
     sys.path.insert(0, current_dir)
 
-from ui.splash import show_splash_screen
-from core.controller import YouTubeDownloaderController
+from utils.settings import get_settings
+from utils.single_instance import SingleInstance
 
 
 def main():
     """Main function to start the YouTube Video Downloader application"""
     try:
-        # Show splash screen first
-        show_splash_screen()
+        # URLs passed on the command line are queued
+        urls = sys.argv[1:]
         
-        # Create and run the main application
-        app = YouTubeDownloaderController()
-        app.run()
+        # A second launch hands its URLs to the running app before loading Tk or yt-dlp
+        instance = None
+        if get_settings().get('single_instance'):
+            instance = SingleInstance()
+            if not instance.acquire():
+                if instance.hand_off(urls):
+                    print("YouTube Video Downloader is already running; switched to it")
+                    return
+                print("Another instance of YouTube Video Downloader is running but not responding")
+                sys.exit(1)
+        
+        try:
+            from ui.splash import show_splash_screen
+            from core.controller import YouTubeDownloaderController
+            
+            # Show splash screen first
+            show_splash_screen()
+            
+            # Create and run the main application
+            app = YouTubeDownloaderController()
+            if instance is not None:
+                instance.set_handler(app.handle_remote_urls)
+            app.open_urls(urls)
+            app.run()
+        finally:
+            if instance is not None:
+                instance.release()
         
     except ImportError as e:
         print(f"Import Error: {e}")
@@ -40,6 +65,9 @@ def main():
 
 
 if __name__ == "__main__":
+    # Needed for the post-processing process pool in frozen executables
+    multiprocessing.freeze_support()
+    
     # Add current directory to Python path
     current_dir = os.path.dirname(os.path.abspath(__file__))
     if current_dir not in sys.path:
@@ -0,0 +1,89 @@
+"""
+UI dispatcher for YouTube Video Downloader
+Worker threads queue UI updates here; one periodic Tk callback applies
+them in a batch per frame on the GUI thread
+"""
+
+import itertools
+import threading
+import tkinter as tk
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+from utils.config import Config
+
+
+class UIDispatcher:
+    """
+    Thread-safe queue of calls to run on the Tk thread
+    post() keeps every call in order; post_latest() keeps only the newest
+    call per key (progress updates), so a busy worker costs one update per frame
+    """
+    
+    def __init__(self, root, interval_ms: Optional[int] = None):
+        self.root = root
+        self.interval_ms = interval_ms or Config.UI_FRAME_MS
+        self._pending = OrderedDict()  # key -> (func, args), in posting order
+        self._sequence = itertools.count()
+        self._frame_callbacks = []
+        self._lock = threading.Lock()
+        self._after_id = None
+    
+    def post(self, func: Callable, *args):
+        """Run func(*args) on the Tk thread with the next frame (safe from any thread)"""
+        with self._lock:
+            self._pending[('call', next(self._sequence))] = (func, args)
+    
+    def post_latest(self, key: Hashable, func: Callable, *args):
+        """Like post(), but replaces a not yet applied call with the same key"""
+        with self._lock:
+            self._pending.pop(('latest', key), None)
+            self._pending[('latest', key)] = (func, args)
+    
+    def add_frame_callback(self, func: Callable):
+        """Run func() on every frame after the queued calls (e.g. redrawing dirty rows)"""
+        self._frame_callbacks.append(func)
+    
+    def start(self):
+        """Begin draining the queue"""
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval_ms, self._on_frame)
+    
+    def stop(self):
+        """Stop draining (pending calls are dropped)"""
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except tk.TclError:
+                pass  # Window already destroyed
+            self._after_id = None
+    
+    def drain(self) -> int:
+        """Apply every call queued so far; returns how many ran (GUI thread only)"""
+        with self._lock:
+            pending, self._pending = self._pending, OrderedDict()
+        
+        for func, args in pending.values():
+            try:
+                func(*args)
+            except Exception as e:
+                # One failing update must not stop the rest of the batch
+                print(f"Error applying UI update {getattr(func, '__name__', func)}: {str(e)}")
+        
+        for func in self._frame_callbacks:
+            try:
+                func()
+            except Exception as e:
+                print(f"Error in UI frame callback: {str(e)}")
+        return len(pending)
+    
+    def _on_frame(self):
+        """Periodic Tk callback"""
+        self._after_id = None
+        try:
+            self.drain()
+        finally:
+            try:
+                self._after_id = self.root.after(self.interval_ms, self._on_frame)
+            except tk.TclError:
+                pass  # Window destroyed by one of the updates
@@ -0,0 +1,144 @@
+"""
+Job list panel for YouTube Video Downloader
+Virtualised ttk.Treeview that only renders the visible rows of a large queue
+"""
+
+import threading
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable
+
+from utils.config import Config
+
+
+class JobListPanel:
+    """
+    Shows queued jobs in a fixed number of Treeview rows bound to a scroll offset
+    Worker threads call mark_dirty(); the UI dispatcher calls refresh() once per frame
+    to redraw the changed rows
+    """
+    
+    COLUMNS = (
+        ('title', "Title", 260),
+        ('status', "Status", 90),
+        ('percent', "Progress", 70),
+        ('speed', "Speed", 90),
+    )
+    
+    def __init__(self, parent, get_jobs: Callable[[], list], visible_rows: int = None):
+        self.parent = parent
+        self.get_jobs = get_jobs
+        self.visible_rows = visible_rows or Config.JOB_LIST_VISIBLE_ROWS
+        self.offset = 0
+        self._rendered_total = -1
+        self._dirty = set()
+        self._dirty_lock = threading.Lock()
+        self._full_refresh = True
+        
+        self.frame = tk.Frame(parent, bg="white")
+        self.setup_ui()
+    
+    def setup_ui(self):
+        """Create the Treeview with one reusable item per visible row"""
+        self.summary_var = tk.StringVar()
+        summary_label = tk.Label(
+            self.frame,
+            textvariable=self.summary_var,
+            font=("Arial", 10),
+            bg="white",
+            fg="#666666"
+        )
+        summary_label.pack(anchor=tk.W, pady=(0, 5))
+        
+        table_frame = tk.Frame(self.frame, bg="white")
+        table_frame.pack(fill=tk.BOTH, expand=True)
+        
+        self.tree = ttk.Treeview(
+            table_frame,
+            columns=[name for name, _, _ in self.COLUMNS],
+            show='headings',
+            height=self.visible_rows,
+            selectmode='browse'
+        )
+        for name, heading, width in self.COLUMNS:
+            self.tree.heading(name, text=heading)
+            self.tree.column(name, width=width, stretch=(name == 'title'))
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        # The scrollbar drives our offset, not the Treeview's own view
+        self.scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        for index in range(self.visible_rows):
+            self.tree.insert('', tk.END, iid=f'row{index}', values=('', '', '', ''))
+        
+        self.tree.bind('<MouseWheel>', self.on_mouse_wheel)
+        self.tree.bind('<Button-4>', lambda event: self.scroll_by(-3))
+        self.tree.bind('<Button-5>', lambda event: self.scroll_by(3))
+    
+    def pack(self, **kwargs):
+        """Show the panel"""
+        self.frame.pack(**kwargs)
+    
+    def mark_dirty(self, job_id: int):
+        """Record that a job changed (safe to call from any thread)"""
+        with self._dirty_lock:
+            self._dirty.add(job_id)
+    
+    def on_scroll(self, *args):
+        """Handle scrollbar commands ('moveto', fraction) and ('scroll', n, units|pages)"""
+        total = len(self.get_jobs())
+        if args[0] == 'moveto':
+            self.set_offset(int(float(args[1]) * total))
+        elif args[0] == 'scroll':
+            step = int(args[1])
+            self.scroll_by(step * self.visible_rows if args[2] == 'pages' else step)
+    
+    def on_mouse_wheel(self, event):
+        """Scroll three rows per wheel notch"""
+        self.scroll_by(-3 if event.delta > 0 else 3)
+    
+    def scroll_by(self, rows: int):
+        """Move the visible window by a number of rows"""
+        self.set_offset(self.offset + rows)
+    
+    def set_offset(self, offset: int):
+        """Move the visible window so it starts at offset"""
+        total = len(self.get_jobs())
+        offset = max(0, min(offset, max(0, total - self.visible_rows)))
+        if offset != self.offset:
+            self.offset = offset
+            self._full_refresh = True
+            self.refresh()
+    
+    def refresh(self):
+        """Redraw changed visible rows; cost depends on the window size, not the queue length"""
+        jobs = self.get_jobs()
+        total = len(jobs)
+        
+        with self._dirty_lock:
+            dirty, self._dirty = self._dirty, set()
+        
+        full = self._full_refresh or total != self._rendered_total
+        self._full_refresh = False
+        
+        for index in range(self.visible_rows):
+            position = self.offset + index
+            job = jobs[position] if position < total else None
+            if not full and (job is None or job.id not in dirty):
+                continue
+            values = (job.title, job.status, job.percent, job.speed) if job else ('', '', '', '')
+            self.tree.item(f'row{index}', values=values)
+        
+        if total != self._rendered_total:
+            self._rendered_total = total
+            self.update_summary(jobs)
+        
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.visible_rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+    
+    def update_summary(self, jobs: list):
+        """Show the number of queued jobs"""
+        self.summary_var.set(f"Queue: {len(jobs)} job(s)")
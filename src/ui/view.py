@@ -3,21 +3,30 @@ View module for YouTube Video Downloader
 Handles the GUI interface using tkinter
 """
 
+import base64
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, scrolledtext
 import threading
 from typing import Callable, Optional
 
+from ui.dispatcher import UIDispatcher
+from ui.job_list import JobListPanel
+from utils.profiler import sample_thread
+from utils.timecode import parse_clip
+
 
 class VideoInfoWindow:
     """Separate window for displaying video information"""
     
-    def __init__(self, parent, video_info: dict):
+    def __init__(self, parent, video_info: dict, thumbnails=None, dispatcher: Optional[UIDispatcher] = None):
         self.parent = parent
         self.video_info = video_info
+        self.thumbnails = thumbnails  # ThumbnailCache shared by every info window
+        self.dispatcher = dispatcher
+        self.thumbnail_image: Optional[tk.PhotoImage] = None
         self.window = tk.Toplevel(parent)
         self.window.title("Video Information")
-        self.window.geometry("500x600")
+        self.window.geometry("500x780")
         self.window.configure(bg="white")
         self.window.resizable(True, True)
         
@@ -55,6 +64,10 @@ class VideoInfoWindow:
         )
         title_label.pack(pady=(0, 20))
         
+        # Thumbnail preview (filled in once loaded)
+        self.thumbnail_label = tk.Label(main_frame, bg="white")
+        self.thumbnail_label.pack(pady=(0, 10))
+        
         # Information display area
         info_frame = tk.Frame(main_frame, bg="white")
         info_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 20))
@@ -124,6 +137,35 @@ class VideoInfoWindow:
         
         # Display the video information
         self.display_info()
+        self.load_thumbnail()
+    
+    def load_thumbnail(self):
+        """Show the preview from memory straight away, otherwise load it off the GUI thread"""
+        video_id = self.video_info.get('id')
+        if self.thumbnails is None or not video_id:
+            return
+        
+        data = self.thumbnails.get_cached(video_id)
+        if data is not None:
+            self.show_thumbnail(data)
+            return
+        
+        url = self.video_info.get('preview_thumbnail') or self.video_info.get('thumbnail')
+        future = self.thumbnails.load(video_id, url)
+        if self.dispatcher is not None:
+            future.add_done_callback(lambda done: self.dispatcher.post(self.show_thumbnail, done.result()))
+        else:
+            future.add_done_callback(lambda done: self.parent.after(0, self.show_thumbnail, done.result()))
+    
+    def show_thumbnail(self, data: Optional[bytes]):
+        """Display a PNG preview (ignored if the window was closed meanwhile)"""
+        try:
+            if not data or not self.window.winfo_exists():
+                return
+            self.thumbnail_image = tk.PhotoImage(data=base64.b64encode(data))
+            self.thumbnail_label.config(image=self.thumbnail_image)
+        except tk.TclError as e:
+            print(f"Error displaying thumbnail: {str(e)}")
     
     def display_info(self):
         """Display formatted video information"""
@@ -148,7 +190,7 @@ class VideoInfoWindow:
 {info.get('title', 'Unknown Playlist')}
 
 📊 TOTAL VIDEOS:
-{info.get('playlist_count', 0)} videos
+{info.get('playlist_count', 0)}{'+' if info.get('playlist_count_is_estimate') else ''} videos
 
 ⚠️ NOTICE:
 {info.get('description', 'This is a playlist. Individual videos cannot be downloaded from playlist URLs.')}
@@ -236,6 +278,9 @@ To download a specific video, please copy the individual video URL instead of th
 🎥 QUALITY:
 Best available up to 720p
 
+💬 SUBTITLES:
+{', '.join(info.get('subtitle_languages') or []) or 'None available'}
+
 📂 DOWNLOAD PATH:
 {info.get('download_path', 'Default Downloads Folder')}
 
@@ -274,7 +319,7 @@ class YouTubeDownloaderView:
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("YouTube Video Downloader")
-        self.root.geometry("600x500")
+        self.root.geometry("700x540")
         self.root.configure(bg="white")
         self.root.resizable(True, True)
         
@@ -285,13 +330,24 @@ class YouTubeDownloaderView:
         self.url_var = tk.StringVar()
         self.progress_var = tk.StringVar()
         self.status_var = tk.StringVar()
+        self.clip_start_var = tk.StringVar()
+        self.clip_end_var = tk.StringVar()
+        self.clip_chapters_var = tk.StringVar()
         
         # Callbacks (to be set by controller)
         self.download_callback: Optional[Callable] = None
         self.validate_url_callback: Optional[Callable] = None
         self.get_info_callback: Optional[Callable] = None
+        self.enqueue_callback: Optional[Callable] = None
+        self.subscribe_callback: Optional[Callable] = None
+        self.file_callbacks = {}  # import_queue/export_queue/import_history/export_history -> callback(path)
+        self.thumbnails = None  # Preview cache, set by the controller
+        
+        # Updates from worker threads are applied once per frame
+        self.dispatcher = UIDispatcher(self.root)
         
         self.setup_ui()
+        self.dispatcher.start()
     
     def center_window(self):
         """Center the window on the screen"""
@@ -304,6 +360,17 @@ class YouTubeDownloaderView:
     
     def setup_ui(self):
         """Setup the main UI components"""
+        # File menu: move a prepared queue or the download history to another machine
+        menu_bar = tk.Menu(self.root)
+        file_menu = tk.Menu(menu_bar, tearoff=0)
+        file_menu.add_command(label="Import Queue...", command=lambda: self.on_file_command('import_queue', False))
+        file_menu.add_command(label="Export Queue...", command=lambda: self.on_file_command('export_queue', True))
+        file_menu.add_separator()
+        file_menu.add_command(label="Import History...", command=lambda: self.on_file_command('import_history', False))
+        file_menu.add_command(label="Export History...", command=lambda: self.on_file_command('export_history', True))
+        menu_bar.add_cascade(label="File", menu=file_menu)
+        self.root.config(menu=menu_bar)
+        
         # Main container
         main_frame = tk.Frame(self.root, bg="white", padx=30, pady=30)
         main_frame.pack(fill=tk.BOTH, expand=True)
@@ -348,6 +415,31 @@ class YouTubeDownloaderView:
         # Bind enter key to download
         self.url_entry.bind('<Return>', lambda event: self.on_download_click())
         
+        # Optional clip selection (time range or chapter names)
+        clip_frame = tk.Frame(url_frame, bg="white")
+        clip_frame.pack(fill=tk.X, pady=(10, 0))
+        
+        for label_text, variable, width in (
+            ("Clip start:", self.clip_start_var, 9),
+            ("End:", self.clip_end_var, 9),
+            ("Chapters:", self.clip_chapters_var, 18),
+        ):
+            tk.Label(
+                clip_frame,
+                text=label_text,
+                font=("Arial", 10),
+                bg="white",
+                fg="#666666"
+            ).pack(side=tk.LEFT, padx=(0, 5))
+            tk.Entry(
+                clip_frame,
+                textvariable=variable,
+                font=("Arial", 10),
+                width=width,
+                relief=tk.SOLID,
+                bd=1
+            ).pack(side=tk.LEFT, padx=(0, 10), ipady=3)
+        
         # Buttons frame
         buttons_frame = tk.Frame(main_frame, bg="white")
         buttons_frame.pack(pady=(20, 0))
@@ -367,6 +459,36 @@ class YouTubeDownloaderView:
         )
         self.download_btn.pack(side=tk.LEFT, padx=10)
         
+        # Add to Queue button
+        self.queue_btn = tk.Button(
+            buttons_frame,
+            text="Add to Queue",
+            font=("Arial", 12),
+            bg="#3F51B5",
+            fg="white",
+            relief=tk.FLAT,
+            padx=20,
+            pady=10,
+            cursor="hand2",
+            command=self.on_enqueue_click
+        )
+        self.queue_btn.pack(side=tk.LEFT, padx=10)
+        
+        # Subscribe button (channels and playlists are checked for new uploads)
+        self.subscribe_btn = tk.Button(
+            buttons_frame,
+            text="Subscribe",
+            font=("Arial", 12),
+            bg="#009688",
+            fg="white",
+            relief=tk.FLAT,
+            padx=20,
+            pady=10,
+            cursor="hand2",
+            command=self.on_subscribe_click
+        )
+        self.subscribe_btn.pack(side=tk.LEFT, padx=10)
+        
         # Get Info button
         self.info_btn = tk.Button(
             buttons_frame,
@@ -435,6 +557,11 @@ class YouTubeDownloaderView:
         )
         self.status_label.pack(anchor=tk.W)
         
+        # Job list (shown once something is queued)
+        self.job_list_container = tk.Frame(main_frame, bg="white")
+        self.job_list_container.pack(fill=tk.BOTH, expand=True, pady=(20, 0))
+        self.job_list: Optional[JobListPanel] = None
+        
         # Copyright section
         copyright_frame = tk.Frame(main_frame, bg="white")
         copyright_frame.pack(fill=tk.X, pady=(30, 10))
@@ -453,11 +580,22 @@ class YouTubeDownloaderView:
         self.hide_progress()
     
     def set_callbacks(self, download_callback: Callable, validate_url_callback: Callable, 
-                     get_info_callback: Callable):
+                     get_info_callback: Callable, enqueue_callback: Optional[Callable] = None,
+                     subscribe_callback: Optional[Callable] = None):
         """Set callback functions from controller"""
         self.download_callback = download_callback
         self.validate_url_callback = validate_url_callback
         self.get_info_callback = get_info_callback
+        self.enqueue_callback = enqueue_callback
+        self.subscribe_callback = subscribe_callback
+    
+    def set_file_callbacks(self, **callbacks: Callable):
+        """Set the File menu callbacks (each takes the chosen path)"""
+        self.file_callbacks = callbacks
+    
+    def set_thumbnail_cache(self, thumbnails):
+        """Use a shared ThumbnailCache for info window previews"""
+        self.thumbnails = thumbnails
     
     def on_download_click(self):
         """Handle download button click"""
@@ -470,9 +608,15 @@ class YouTubeDownloaderView:
             self.show_error("Please enter a valid YouTube URL")
             return
         
+        try:
+            clip = self.get_clip()
+        except ValueError as e:
+            self.show_error(str(e))
+            return
+        
         # Start download in separate thread
         if self.download_callback:
-            threading.Thread(target=self.download_callback, args=(url,), daemon=True).start()
+            threading.Thread(target=self.download_callback, args=(url, clip), daemon=True).start()
     
     def on_get_info_click(self):
         """Handle get info button click"""
@@ -488,9 +632,66 @@ class YouTubeDownloaderView:
         if self.get_info_callback:
             threading.Thread(target=self.get_info_callback, args=(url,), daemon=True).start()
     
+    def on_enqueue_click(self):
+        """Handle add to queue button click"""
+        url = self.url_var.get().strip()
+        if not url:
+            self.show_error("Please enter a YouTube URL")
+            return
+        
+        if self.validate_url_callback and not self.validate_url_callback(url):
+            self.show_error("Please enter a valid YouTube URL")
+            return
+        
+        try:
+            clip = self.get_clip()
+        except ValueError as e:
+            self.show_error(str(e))
+            return
+        
+        if self.enqueue_callback:
+            threading.Thread(target=self.enqueue_callback, args=(url, clip), daemon=True).start()
+    
+    def on_subscribe_click(self):
+        """Handle subscribe button click"""
+        url = self.url_var.get().strip()
+        if not url:
+            self.show_error("Please enter a channel or playlist URL")
+            return
+        
+        if self.validate_url_callback and not self.validate_url_callback(url):
+            self.show_error("Please enter a valid YouTube URL")
+            return
+        
+        if self.subscribe_callback:
+            threading.Thread(target=self.subscribe_callback, args=(url,), daemon=True).start()
+    
+    def on_file_command(self, name: str, save: bool):
+        """Ask for a JSON Lines or CSV file and run a File menu action on it"""
+        callback = self.file_callbacks.get(name)
+        if callback is None:
+            return
+        
+        filetypes = [("JSON Lines", "*.jsonl"), ("CSV", "*.csv"), ("All files", "*.*")]
+        title = name.replace('_', ' ').title()
+        if save:
+            path = filedialog.asksaveasfilename(parent=self.root, title=title, filetypes=filetypes,
+                                                defaultextension=".jsonl")
+        else:
+            path = filedialog.askopenfilename(parent=self.root, title=title, filetypes=filetypes)
+        if path:
+            threading.Thread(target=callback, args=(path,), daemon=True).start()
+    
+    def get_clip(self) -> Optional[dict]:
+        """Clip selection from the start/end/chapter fields (None for the whole video)"""
+        return parse_clip(self.clip_start_var.get(), self.clip_end_var.get(), self.clip_chapters_var.get())
+    
     def clear_input(self):
         """Clear the URL input and reset UI"""
         self.url_var.set("")
+        self.clip_start_var.set("")
+        self.clip_end_var.set("")
+        self.clip_chapters_var.set("")
         self.status_var.set("")
         self.progress_var.set("")
         self.hide_progress()
@@ -498,10 +699,48 @@ class YouTubeDownloaderView:
     def show_video_info_window(self, video_info: dict):
         """Show video information in a separate window"""
         try:
-            VideoInfoWindow(self.root, video_info)
+            VideoInfoWindow(self.root, video_info, self.thumbnails, self.dispatcher)
         except Exception as e:
             self.show_error(f"Error displaying video info: {str(e)}")
     
+    def show_job_list(self, get_jobs: Callable[[], list]):
+        """Show the job list panel the first time something is queued"""
+        if self.job_list is None:
+            self.job_list = JobListPanel(self.job_list_container, get_jobs)
+            self.job_list.pack(fill=tk.BOTH, expand=True)
+            self.dispatcher.add_frame_callback(self.job_list.refresh)
+            self.root.geometry("700x800")
+    
+    def mark_job_dirty(self, job_id: int):
+        """Flag a job row for redraw on the next frame (safe from worker threads)"""
+        if self.job_list is not None:
+            self.job_list.mark_dirty(job_id)
+    
+    def post(self, func: Callable, *args):
+        """Queue a UI update from any thread"""
+        self.dispatcher.post(func, *args)
+    
+    def post_latest(self, key: str, func: Callable, *args):
+        """Queue a UI update that supersedes an earlier one with the same key"""
+        self.dispatcher.post_latest(key, func, *args)
+    
+    def show_busy(self, message: str):
+        """Show progress, disable buttons and show a status message"""
+        self.show_progress()
+        self.disable_buttons()
+        self.show_info_message(message)
+    
+    def show_idle(self):
+        """Re-enable buttons and hide progress"""
+        self.enable_buttons()
+        self.hide_progress()
+    
+    def bring_to_front(self):
+        """Restore and raise the main window"""
+        self.root.deiconify()
+        self.root.lift()
+        self.root.focus_force()
+    
     def show_progress(self):
         """Show progress bar and start animation"""
         self.progress.pack(fill=tk.X, pady=(0, 10))
@@ -569,8 +808,10 @@ class YouTubeDownloaderView:
     
     def run(self):
         """Start the GUI main loop"""
-        self.root.mainloop()
+        with sample_thread("mainloop"):
+            self.root.mainloop()
     
     def destroy(self):
         """Destroy the GUI window"""
+        self.dispatcher.stop()
         self.root.destroy()
@@ -7,7 +7,17 @@ import os
 class Config:
     """Configuration class for the application"""
     
-    # Default download settings
+    # Application data (profiles, caches, settings)
+    APP_DATA_DIR = os.path.join(os.path.expanduser("~"), ".youtube_downloader")
+    SETTINGS_FILE = os.path.join(APP_DATA_DIR, "settings.json")
+    SETTINGS_ENV_VAR = "YTD_SETTINGS_FILE"
+    HISTORY_FILE = os.path.join(APP_DATA_DIR, "history.jsonl")
+    DIAGNOSTICS_FILE = os.path.join(APP_DATA_DIR, "diagnostics.jsonl")
+    SUBSCRIPTIONS_FILE = os.path.join(APP_DATA_DIR, "subscriptions.json")
+    INSTANCE_LOCK_FILE = os.path.join(APP_DATA_DIR, "instance.lock")
+    INSTANCE_INFO_FILE = os.path.join(APP_DATA_DIR, "instance.json")
+    
+    # Default download settings (user overrides live in the settings file)
     DEFAULT_DOWNLOAD_PATH = os.path.join(os.path.expanduser("~"), "Downloads", "YouTube_Videos")
     DEFAULT_QUALITY = "best[height<=720]"  # Download best quality up to 720p
     
@@ -33,8 +43,131 @@ class Config:
     
     # Download settings
     MAX_RETRIES = 3
+    RETRY_DELAY_SECONDS = 5  # First retry delay for network errors; doubles per attempt
     TIMEOUT = 30  # seconds
     
+    # Single instance (later launches hand their URLs to the running app)
+    SINGLE_INSTANCE = True
+    INSTANCE_HANDOFF_TIMEOUT = 10  # seconds to wait for a starting instance to listen
+    
+    # Distributed mode (python -m core.distributed)
+    DISTRIBUTED_PORT = 8765
+    DISTRIBUTED_LEASE_SECONDS = 300    # A worker silent for this long loses its job to another worker
+    DISTRIBUTED_POLL_SECONDS = 5       # Idle workers ask for work this often
+    MAX_CONCURRENT_DOWNLOADS = 3
+    IMPORT_BATCH_SIZE = 1000  # Queue entries added per batch when importing a queue file
+    
+    # Output file names ('/' creates folders; fields: title, id, uploader, channel,
+    # upload_date, year, month, day, playlist, playlist_index)
+    OUTPUT_TEMPLATE = "{title}"
+    FILENAME_MAX_BYTES = 180  # Per path component, leaves room for suffixes within 255
+    
+    # Staging: download into a private folder, move finished files into place
+    STAGING_ENABLED = False
+    
+    # Job list settings
+    JOB_LIST_VISIBLE_ROWS = 12
+    UI_FRAME_MS = 50  # Batched UI refresh interval
+    
+    # Post-processing settings (ffmpeg runs in its own process pool)
+    FFMPEG_PATH = "ffmpeg"
+    POSTPROCESS_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+    POSTPROCESS_STEPS = {
+        'merge': False,            # Download best video + audio separately and mux them
+        'extract_audio': False,    # Also write an audio-only copy
+        'audio_format': 'mp3',
+        'embed_thumbnail': False,
+        'add_metadata': False,
+    }
+    
+    # Verification of finished downloads (runs in a background thread pool)
+    VERIFY_DOWNLOADS = True
+    VERIFY_WORKERS = 2
+    VERIFY_SIZE_TOLERANCE = 0.05   # Allowed difference for approximate or merged sizes
+    VERIFY_DURATION_TOLERANCE = 0.02
+    VERIFY_DELETE_INCOMPLETE = False  # Incomplete files are renamed to .incomplete unless set
+    INCOMPLETE_SUFFIX = ".incomplete"
+    FFPROBE_PATH = "ffprobe"       # Container probing is skipped when ffprobe is missing
+    CHECKSUM_ALGORITHM = "sha256"
+    CHECKSUM_CHUNK_SIZE = 1024 * 1024
+    
+    # Live recording (ffmpeg writes fixed-length segments as the stream arrives)
+    LIVE_SEGMENT_SECONDS = 600
+    LIVE_POLL_SECONDS = 300        # Longest wait between checks on an upcoming premiere
+    LIVE_RETRY_SECONDS = 15        # Pause before reconnecting to a stream that dropped
+    
+    # Subscriptions (channels/playlists polled for new uploads)
+    SUBSCRIPTION_POLL_MINUTES = 60
+    SUBSCRIPTION_STOP_AFTER_KNOWN = 5   # Stop reading a feed after this many known videos in a row
+    SUBSCRIPTION_SEED_ENTRIES = 50      # Newest videos remembered when a channel is first checked (one feed page)
+    SUBSCRIPTION_MAX_SEEN_IDS = 1000    # Most recent video IDs kept per channel
+    SUBSCRIPTION_MIN_GAP_SECONDS = 60   # Skip a scheduled poll that would follow another this closely
+    
+    # Request scheduling per host (extraction requests)
+    SCHEDULER_START_CONCURRENCY = 4
+    SCHEDULER_MAX_CONCURRENCY = 8
+    SCHEDULER_MAX_RETRIES = 4          # Retries of a request answered with 429
+    SCHEDULER_BACKOFF_SECONDS = 2      # First backoff; doubles per retry
+    SCHEDULER_MAX_BACKOFF_SECONDS = 60
+    SCHEDULER_MIN_INTERVAL = 0.25      # Gap between request starts after throttling
+    SCHEDULER_MAX_INTERVAL = 10
+    
+    # Metadata extraction (optionally in separate worker processes)
+    EXTRACTION_PROCESS_POOL = False
+    EXTRACTION_WORKERS = min(4, os.cpu_count() or 1)
+    
+    # Playlist enumeration (entries are read lazily, one page at a time)
+    PLAYLIST_PAGE_SIZE = 50
+    
+    # Download backends (transfer engines, see core.backends)
+    DOWNLOAD_BACKEND = "yt-dlp"            # 'yt-dlp', 'native' or 'aria2c'
+    NATIVE_HTTP_CONNECTIONS = 4            # Parallel range requests per download
+    NATIVE_HTTP_CHUNK_SIZE = 8 * 1024 * 1024
+    NATIVE_HTTP_BLOCK_SIZE = 256 * 1024    # Read/write size within a chunk
+    ARIA2C_ARGS = ['-x', '4', '-s', '4', '-k', '1M']
+    
+    # Download write path (native backend; fsync also applies to yt-dlp downloads)
+    WRITE_BUFFER_SIZE = 4 * 1024 * 1024    # Per connection, 0 = write every block as it arrives
+    WRITE_ALIGNMENT = 4096
+    PREALLOCATE_DOWNLOADS = True           # posix_fallocate when the size is known
+    FSYNC_POLICY = "never"                 # 'never', 'end' (before publishing) or 'interval'
+    FSYNC_INTERVAL_BYTES = 64 * 1024 * 1024
+    
+    # Adaptive concurrency (tunes downloads and connections from measured throughput)
+    ADAPTIVE_CONCURRENCY = False
+    ADAPTIVE_INTERVAL_SECONDS = 10     # Length of one throughput sample
+    ADAPTIVE_MIN_GAIN = 0.05           # Smallest change in throughput that counts
+    ADAPTIVE_HOLD_SAMPLES = 30         # Samples a settled setting is kept before searching again
+    ADAPTIVE_MAX_DOWNLOADS = 8
+    ADAPTIVE_MAX_CONNECTIONS = 8
+    ADAPTIVE_DECISION_HISTORY = 100    # Decisions kept for diagnostics
+    
+    # Subtitle and thumbnail settings
+    DOWNLOAD_ASSETS = {
+        'subtitles': False,        # Write subtitles alongside each downloaded video
+        'thumbnail': False,        # Write the thumbnail alongside each downloaded video
+    }
+    SUBTITLE_LANGUAGES = ['en']
+    SUBTITLE_FORMAT = "vtt"
+    ASSET_CACHE_SIZE = 512         # Videos whose subtitle/thumbnail URLs are kept in memory
+    ASSET_CACHE_SECONDS = 3 * 3600 # Signed media URLs expire; older entries are extracted again
+    FORMAT_CACHE_SIZE = 512        # Format indexes kept in memory (keyed by video ID and URL)
+    ASSET_FETCH_WORKERS = 4
+    
+    # Thumbnail previews in the info window (decoding needs Pillow)
+    THUMBNAIL_PREVIEW_SIZE = (320, 180)
+    THUMBNAIL_CACHE_DIR = os.path.join(APP_DATA_DIR, "thumbnails")
+    THUMBNAIL_MEMORY_ITEMS = 64    # Decoded previews kept in memory
+    THUMBNAIL_CACHE_MB = 50        # On-disk preview cache, 0 = memory only
+    THUMBNAIL_WORKERS = 2
+    
+    # Profiling settings (can also be enabled with YTD_PROFILE=1)
+    PROFILING_ENABLED = False
+    PROFILE_ENV_VAR = "YTD_PROFILE"
+    PROFILE_DIR = os.path.join(APP_DATA_DIR, "profiles")
+    PROFILE_SUMMARY_LINES = 40
+    PROFILE_SAMPLE_INTERVAL = 0.01   # Stack sampling period of the Tk main loop (seconds)
+    
     # Supported domains
     YOUTUBE_DOMAINS = [
         'youtube.com',
@@ -0,0 +1,161 @@
+"""
+Profiling helpers for YouTube Video Downloader
+Opt-in cProfile capture of downloads, info lookups and the Tk main loop
+"""
+
+import cProfile
+import io
+import itertools
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Optional
+
+from utils.config import Config
+from utils.settings import get_settings
+
+
+_job_counter = itertools.count(1)
+
+
+def profiling_enabled() -> bool:
+    """Check whether profiling is switched on (environment variable wins over settings)"""
+    value = os.environ.get(Config.PROFILE_ENV_VAR)
+    if value is not None:
+        return value.strip().lower() in ('1', 'true', 'yes', 'on')
+    return get_settings().get('profiling_enabled')
+
+
+def get_profile_dir() -> str:
+    """Get the directory profile files are written to"""
+    return os.environ.get(f"{Config.PROFILE_ENV_VAR}_DIR") or Config.PROFILE_DIR
+
+
+def _profile_path(label: str, profile_dir: str) -> str:
+    """Build a unique file path for one profiled job"""
+    timestamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(profile_dir, f"{label}_{timestamp}_{next(_job_counter):04d}.prof")
+
+
+def write_profile(profiler: cProfile.Profile, path: str) -> str:
+    """Dump raw stats plus a readable summary next to them, returns the .prof path"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    profiler.dump_stats(path)
+    
+    summary = io.StringIO()
+    stats = pstats.Stats(profiler, stream=summary)
+    stats.sort_stats('cumulative').print_stats(Config.PROFILE_SUMMARY_LINES)
+    with open(os.path.splitext(path)[0] + '.txt', 'w', encoding='utf-8') as fh:
+        fh.write(summary.getvalue())
+    
+    return path
+
+
+@contextmanager
+def profile_job(label: str, profile_dir: Optional[str] = None):
+    """
+    Profile the enclosed block when profiling is enabled
+    Yields the path the profile will be written to, or None when disabled
+    """
+    if not profiling_enabled():
+        yield None
+        return
+    
+    path = _profile_path(label, profile_dir or get_profile_dir())
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as e:
+        # Python 3.12+ allows only one active profiler per process
+        print(f"Profiling skipped for {label}: {str(e)}")
+        yield None
+        return
+    
+    try:
+        yield path
+    finally:
+        profiler.disable()
+        try:
+            write_profile(profiler, path)
+        except OSError as e:
+            print(f"Error writing profile {path}: {str(e)}")
+
+
+@contextmanager
+def sample_thread(label: str, profile_dir: Optional[str] = None, interval: Optional[float] = None):
+    """
+    Sample the calling thread's stack while the block runs, when profiling is enabled
+    Used for the Tk main loop: it runs for the whole session, and a cProfile
+    profiler there would take the only profiler slot (Python 3.12+) from the
+    download and lookup jobs. Writes a .txt summary of where the thread spent
+    its time; yields that path, or None when disabled
+    """
+    if not profiling_enabled():
+        yield None
+        return
+    
+    path = os.path.splitext(_profile_path(label, profile_dir or get_profile_dir()))[0] + '.txt'
+    thread_id = threading.get_ident()
+    interval = interval or Config.PROFILE_SAMPLE_INTERVAL
+    inclusive = Counter()   # Samples with the function anywhere on the stack
+    own = Counter()         # Samples with the function at the top of the stack
+    samples = 0
+    stopped = threading.Event()
+    
+    def sample():
+        nonlocal samples
+        while not stopped.wait(interval):
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                continue
+            samples += 1
+            own[_frame_name(frame)] += 1
+            seen = set()
+            while frame is not None:
+                seen.add(_frame_name(frame))
+                frame = frame.f_back
+            inclusive.update(seen)
+    
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    try:
+        yield path
+    finally:
+        stopped.set()
+        sampler.join()
+        try:
+            write_samples(path, samples, interval, inclusive, own)
+        except OSError as e:
+            print(f"Error writing profile {path}: {str(e)}")
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_filename}:{code.co_firstlineno}({code.co_name})"
+
+
+def write_samples(path: str, samples: int, interval: float, inclusive: Counter, own: Counter) -> str:
+    """Write a sampled profile summary, busiest functions first"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as fh:
+        fh.write(f"{samples} samples every {interval * 1000:.0f} ms\n\n")
+        fh.write(f"{'total %':>8}{'own %':>8}  function\n")
+        for name, count in inclusive.most_common(Config.PROFILE_SUMMARY_LINES):
+            fh.write(f"{count * 100 / max(samples, 1):>8.1f}{own[name] * 100 / max(samples, 1):>8.1f}  {name}\n")
+    return path
+
+
+def profiled(label: str) -> Callable:
+    """Decorator that runs the wrapped function inside profile_job"""
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with profile_job(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
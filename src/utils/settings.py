@@ -0,0 +1,188 @@
+"""
+Persistent user settings for YouTube Video Downloader
+JSON file with schema validation and atomic writes; Config supplies the defaults
+"""
+
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Optional
+
+from utils.config import Config
+
+
+SETTINGS_VERSION = 1
+
+
+def _positive(value) -> bool:
+    return value >= 1
+
+
+def _non_negative(value) -> bool:
+    return value >= 0
+
+
+def _string_list(value) -> bool:
+    return all(isinstance(item, str) for item in value)
+
+
+# name: (type, default factory, extra validator)
+# Defaults are factories so they are only computed when a value was never set
+SETTINGS_SCHEMA = {
+    'download_path': (str, lambda: Config.DEFAULT_DOWNLOAD_PATH, bool),
+    'format': (str, lambda: Config.DEFAULT_QUALITY, bool),
+    'output_template': (str, lambda: Config.OUTPUT_TEMPLATE, lambda value: bool(value.strip(' /'))),
+    'filename_max_bytes': (int, lambda: Config.FILENAME_MAX_BYTES, lambda value: 16 <= value <= 240),
+    'max_concurrent_downloads': (int, lambda: Config.MAX_CONCURRENT_DOWNLOADS, lambda value: 1 <= value <= 32),
+    'rate_limit': (int, lambda: 0, _non_negative),  # Bytes per second per download, 0 = unlimited
+    'download_backend': (str, lambda: Config.DOWNLOAD_BACKEND, bool),
+    'adaptive_concurrency': (bool, lambda: Config.ADAPTIVE_CONCURRENCY, None),
+    'write_buffer_kb': (int, lambda: Config.WRITE_BUFFER_SIZE // 1024, _non_negative),
+    'preallocate_downloads': (bool, lambda: Config.PREALLOCATE_DOWNLOADS, None),
+    'fsync_policy': (str, lambda: Config.FSYNC_POLICY, lambda value: value in ('never', 'end', 'interval')),
+    'postprocess_workers': (int, lambda: Config.POSTPROCESS_WORKERS, _positive),
+    'postprocess_steps': (dict, lambda: dict(Config.POSTPROCESS_STEPS), None),
+    'download_assets': (dict, lambda: dict(Config.DOWNLOAD_ASSETS), None),
+    'subtitle_languages': (list, lambda: list(Config.SUBTITLE_LANGUAGES), _string_list),
+    'asset_cache_size': (int, lambda: Config.ASSET_CACHE_SIZE, _positive),
+    'thumbnail_cache_mb': (int, lambda: Config.THUMBNAIL_CACHE_MB, _non_negative),
+    'extraction_process_pool': (bool, lambda: Config.EXTRACTION_PROCESS_POOL, None),
+    'extraction_workers': (int, lambda: Config.EXTRACTION_WORKERS, _positive),
+    'playlist_page_size': (int, lambda: Config.PLAYLIST_PAGE_SIZE, _positive),
+    'verify_downloads': (bool, lambda: Config.VERIFY_DOWNLOADS, None),
+    'verify_probe': (bool, lambda: True, None),  # Probe containers with ffprobe when available
+    'verify_workers': (int, lambda: Config.VERIFY_WORKERS, _positive),
+    'verify_delete_incomplete': (bool, lambda: Config.VERIFY_DELETE_INCOMPLETE, None),
+    'clip_precise_cuts': (bool, lambda: False, None),  # Re-encode around clip cuts instead of cutting at keyframes
+    'live_segment_seconds': (int, lambda: Config.LIVE_SEGMENT_SECONDS, lambda value: value >= 10),
+    'subscription_poll_minutes': (int, lambda: Config.SUBSCRIPTION_POLL_MINUTES, _non_negative),  # 0 = never
+    'subscription_backfill': (bool, lambda: False, None),  # Queue a channel's existing videos when subscribing
+    'staging_enabled': (bool, lambda: Config.STAGING_ENABLED, None),
+    'staging_path': (str, lambda: '', None),  # Empty = hidden folder next to the download folder
+    'profiling_enabled': (bool, lambda: Config.PROFILING_ENABLED, None),
+    'single_instance': (bool, lambda: Config.SINGLE_INSTANCE, None),
+}
+
+
+def validate_setting(name: str, value: Any) -> Any:
+    """Check a value against the schema, raising ValueError when it does not fit"""
+    if name not in SETTINGS_SCHEMA:
+        raise ValueError(f"Unknown setting: {name}")
+    
+    expected_type, _, validator = SETTINGS_SCHEMA[name]
+    # bool is an int subclass; don't let True pass as a worker count
+    if isinstance(value, bool) and expected_type is not bool:
+        raise ValueError(f"Setting {name} must be {expected_type.__name__}")
+    if not isinstance(value, expected_type):
+        raise ValueError(f"Setting {name} must be {expected_type.__name__}")
+    if validator and not validator(value):
+        raise ValueError(f"Invalid value for setting {name}: {value!r}")
+    return value
+
+
+class Settings:
+    """User settings loaded from and saved to a JSON file"""
+    
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or get_settings_path()
+        self._values = {}
+        self._lock = threading.RLock()
+    
+    def load(self) -> 'Settings':
+        """Read the settings file; invalid or unknown entries fall back to defaults"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as fh:
+                data = json.load(fh)
+        except FileNotFoundError:
+            return self
+        except (OSError, ValueError) as e:
+            print(f"Error reading settings from {self.path}: {str(e)}")
+            return self
+        
+        if not isinstance(data, dict) or not isinstance(data.get('settings', {}), dict):
+            print(f"Error reading settings from {self.path}: unexpected file structure")
+            return self
+        
+        values = {}
+        for name, value in (data.get('settings') or {}).items():
+            try:
+                values[name] = validate_setting(name, value)
+            except ValueError as e:
+                print(f"Ignoring setting: {str(e)}")
+        
+        with self._lock:
+            self._values = values
+        return self
+    
+    def get(self, name: str) -> Any:
+        """Get a setting, falling back to its default"""
+        with self._lock:
+            if name in self._values:
+                return self._values[name]
+        if name not in SETTINGS_SCHEMA:
+            raise KeyError(name)
+        return SETTINGS_SCHEMA[name][1]()
+    
+    def set(self, name: str, value: Any):
+        """Validate and change a setting (call save() to persist)"""
+        validate_setting(name, value)
+        with self._lock:
+            self._values[name] = value
+    
+    def update(self, **values):
+        """Validate and change several settings at once"""
+        for name, value in values.items():
+            validate_setting(name, value)
+        with self._lock:
+            self._values.update(values)
+    
+    def reset(self, name: str):
+        """Forget a stored value so the default applies again"""
+        with self._lock:
+            self._values.pop(name, None)
+    
+    def as_dict(self) -> dict:
+        """All settings including defaults"""
+        return {name: self.get(name) for name in SETTINGS_SCHEMA}
+    
+    def save(self):
+        """Write explicitly set values atomically (temp file + rename)"""
+        with self._lock:
+            data = {'version': SETTINGS_VERSION, 'settings': dict(self._values)}
+        atomic_write_json(self.path, data)
+
+
+def atomic_write_json(path: str, data: Any):
+    """Write JSON to a temp file in the same folder, fsync it and rename it over path"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=f'.{os.path.basename(path)}-', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+            json.dump(data, fh, indent=2, sort_keys=True)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+_settings: Optional[Settings] = None
+_settings_lock = threading.Lock()
+
+
+def get_settings_path() -> str:
+    """Settings file location (YTD_SETTINGS_FILE overrides the default)"""
+    return os.environ.get(Config.SETTINGS_ENV_VAR) or Config.SETTINGS_FILE
+
+
+def get_settings() -> Settings:
+    """Get the application settings, loading them on first use"""
+    global _settings
+    with _settings_lock:
+        if _settings is None:
+            _settings = Settings().load()
+        return _settings
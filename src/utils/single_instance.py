@@ -0,0 +1,170 @@
+"""
+Single-instance support for YouTube Video Downloader
+The first instance holds an OS lock on a file and listens on a local
+socket; later launches send their URLs there and exit
+"""
+
+import hmac
+import json
+import os
+import secrets
+import socket
+import threading
+import time
+from typing import Callable, Optional
+
+from utils.config import Config
+from utils.settings import atomic_write_json
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+
+MAX_MESSAGE_BYTES = 64 * 1024
+
+
+def _try_lock(fh) -> bool:
+    """Take an exclusive lock without waiting (released by the OS if the process dies)"""
+    try:
+        if os.name == 'nt':
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def _read_line(conn: socket.socket) -> bytes:
+    """Read one newline-terminated message"""
+    data = b''
+    while b'\n' not in data and len(data) < MAX_MESSAGE_BYTES:
+        chunk = conn.recv(4096)
+        if not chunk:
+            break
+        data += chunk
+    return data.split(b'\n', 1)[0]
+
+
+class SingleInstance:
+    """
+    Lock file plus local socket handoff
+    The lock itself is an OS file lock, so a crashed instance never leaves a
+    stale lock behind; the port and a random token are kept in a separate file
+    """
+    
+    def __init__(self, lock_path: Optional[str] = None, info_path: Optional[str] = None):
+        self.lock_path = lock_path or Config.INSTANCE_LOCK_FILE
+        self.info_path = info_path or Config.INSTANCE_INFO_FILE
+        self._lock_file = None
+        self._server: Optional[socket.socket] = None
+        self._token = None
+        self._handler: Optional[Callable[[list], None]] = None
+        self._received = []  # URL lists that arrived before a handler was set
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> bool:
+        """Become the running instance (False if another one already is)"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.lock_path)), exist_ok=True)
+        lock_file = open(self.lock_path, 'a+')
+        if not _try_lock(lock_file):
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        
+        # Listen straight away so launches during startup are not lost
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.bind(('127.0.0.1', 0))
+        self._server.listen(8)
+        self._token = secrets.token_hex(16)
+        atomic_write_json(self.info_path, {
+            'pid': os.getpid(),
+            'port': self._server.getsockname()[1],
+            'token': self._token
+        })
+        threading.Thread(target=self._serve, args=(self._server,), daemon=True).start()
+        return True
+    
+    def set_handler(self, handler: Callable[[list], None]):
+        """Receive handed-off URL lists (including any that arrived earlier)"""
+        with self._lock:
+            self._handler = handler
+            received, self._received = self._received, []
+        for urls in received:
+            handler(urls)
+    
+    def hand_off(self, urls: list, timeout: Optional[float] = None) -> bool:
+        """Send URLs to the running instance; False if it cannot be reached in time"""
+        deadline = time.monotonic() + (Config.INSTANCE_HANDOFF_TIMEOUT if timeout is None else timeout)
+        while True:
+            try:
+                with open(self.info_path, 'r', encoding='utf-8') as fh:
+                    info = json.load(fh)
+                message = json.dumps({'token': info['token'], 'urls': list(urls)}).encode('utf-8') + b'\n'
+                with socket.create_connection(('127.0.0.1', info['port']), timeout=2) as conn:
+                    conn.sendall(message)
+                    if _read_line(conn) == b'ok':
+                        return True
+            except (OSError, ValueError, KeyError, TypeError):
+                pass  # Not listening yet (the running instance may still be starting)
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.2)
+    
+    def release(self):
+        """Stop listening and give up the lock"""
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+            try:
+                os.remove(self.info_path)
+            except OSError:
+                pass
+        if self._lock_file is not None:
+            self._lock_file.close()  # Closing the file drops the lock
+            self._lock_file = None
+    
+    def _serve(self, server: socket.socket):
+        """Accept handoffs until the socket is closed"""
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            with conn:
+                try:
+                    conn.settimeout(2)
+                    urls = self._read_message(conn)
+                    if urls is not None:
+                        conn.sendall(b'ok\n')
+                except OSError:
+                    continue
+            if urls is not None:
+                self._deliver(urls)
+    
+    def _read_message(self, conn: socket.socket) -> Optional[list]:
+        """URLs of a valid handoff message (None if malformed or the token is wrong)"""
+        try:
+            message = json.loads(_read_line(conn).decode('utf-8'))
+            token = str(message['token'])
+            urls = message['urls']
+        except (ValueError, KeyError, TypeError):
+            return None
+        if not hmac.compare_digest(token.encode('utf-8'), self._token.encode('utf-8')) or not isinstance(urls, list):
+            return None
+        return [url for url in urls if isinstance(url, str)]
+    
+    def _deliver(self, urls: list):
+        """Pass URLs to the handler, or keep them until there is one"""
+        with self._lock:
+            handler = self._handler
+            if handler is None:
+                self._received.append(urls)
+                return
+        try:
+            handler(urls)
+        except Exception as e:
+            print(f"Error handling URLs from another launch: {str(e)}")
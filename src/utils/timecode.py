@@ -0,0 +1,49 @@
+"""
+Time code helpers for YouTube Video Downloader
+Parses the clip start/end fields ('90', '1:30', '01:02:03.5')
+"""
+
+from typing import Optional
+
+
+def parse_timestamp(text: str) -> Optional[float]:
+    """Parse [[HH:]MM:]SS[.fff] into seconds; empty text means no limit"""
+    text = (text or '').strip()
+    if not text:
+        return None
+    
+    parts = text.split(':')
+    if len(parts) > 3:
+        raise ValueError(f"Invalid time: {text}")
+    try:
+        values = [float(part) for part in parts]
+    except ValueError:
+        raise ValueError(f"Invalid time: {text}")
+    if any(value < 0 for value in values) or any(value >= 60 for value in values[1:]):
+        raise ValueError(f"Invalid time: {text}")
+    
+    seconds = 0.0
+    for value in values:
+        seconds = seconds * 60 + value
+    return seconds
+
+
+def format_timestamp(seconds: float) -> str:
+    """Format seconds as HH:MM:SS"""
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def parse_clip(start_text: str, end_text: str, chapters_text: str = '') -> Optional[dict]:
+    """
+    Build a clip selection from the view's fields
+    Returns None when every field is empty; raises ValueError for bad input
+    """
+    start = parse_timestamp(start_text)
+    end = parse_timestamp(end_text)
+    chapters = [name.strip() for name in (chapters_text or '').split(',') if name.strip()]
+    if start is None and end is None and not chapters:
+        return None
+    if start is not None and end is not None and end <= start:
+        raise ValueError("Clip end must be after the start")
+    return {'start': start, 'end': end, 'chapters': chapters}
@@ -0,0 +1,502 @@
+"""
+Recorded extractor responses for YouTube Video Downloader
+Captures what yt-dlp's extractor returned for a URL (the info dict before
+format selection) together with the media and thumbnail bytes of chosen
+formats, and replays them offline: while a Replay is active every
+YoutubeDL.extract_info call is answered from the captures and the media is
+served by a local HTTP server, so format selection, progress hooks, the
+download backends and the write path all run for real without the network
+"""
+
+import copy
+import hashlib
+import itertools
+import json
+import os
+import threading
+import time
+import urllib.parse
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Iterable, Optional
+
+import yt_dlp
+from yt_dlp.networking import Request
+from yt_dlp.utils import DownloadError
+
+from core import extraction
+from core.assets import select_assets
+from utils.config import Config
+
+
+CAPTURE_FILE = 'info.json'
+CAPTURE_FORMAT = 'worst[protocol^=http]'  # Formats whose media is captured
+MAX_CAPTURE_BYTES = 8 * 1024 * 1024       # Captured media is cut to this size
+
+# Per-format fields that only make sense against the real site
+_PRIVATE_FIELDS = ('cookies', 'fragments', 'manifest_url', 'fragment_base_url')
+
+
+def _video_key(url: str, noplaylist: bool = False) -> Optional[str]:
+    """
+    Video or playlist ID named by a YouTube URL (None for other URLs)
+    Like yt-dlp, a watch link that carries a list means the list unless noplaylist is set
+    """
+    parsed = urllib.parse.urlparse(url)
+    query = urllib.parse.parse_qs(parsed.query)
+    if query.get('list') and query.get('v') and not noplaylist:
+        return query['list'][0]
+    if query.get('v'):
+        return query['v'][0]
+    if parsed.netloc.endswith('youtu.be'):
+        return parsed.path.strip('/') or None
+    if parsed.path.startswith(('/shorts/', '/live/')):
+        return parsed.path.split('/')[2] or None
+    if query.get('list'):
+        return query['list'][0]
+    return None
+
+
+def _media_urls(info: dict) -> Iterable[tuple]:
+    """(container, key) of every media URL in an info dict: formats, thumbnails and subtitles"""
+    for fmt in info.get('formats') or []:
+        if fmt.get('url'):
+            yield fmt, 'url'
+    for thumbnail in info.get('thumbnails') or []:
+        if thumbnail.get('url'):
+            yield thumbnail, 'url'
+    if info.get('thumbnail'):
+        yield info, 'thumbnail'
+    for source in ('subtitles', 'automatic_captions'):
+        for tracks in (info.get(source) or {}).values():
+            for track in tracks:
+                if track.get('url'):
+                    yield track, 'url'
+
+
+class Capture:
+    """One recorded extraction: the extractor's info dict and the media bytes captured for it (by original URL)"""
+    
+    def __init__(self, url: str, info: dict, media: Optional[dict] = None):
+        self.url = url
+        self.info = info
+        self.media = media or {}
+    
+    def keys(self) -> list:
+        """URLs and IDs this capture answers for"""
+        keys = [self.url, self.info.get('webpage_url'), self.info.get('original_url'), self.info.get('id')]
+        return [key for key in dict.fromkeys(keys) if key]
+    
+    def save(self, directory: str) -> str:
+        """Write the capture to directory/<id>/ (info.json plus one file per media URL); returns that folder"""
+        folder = os.path.join(directory, self.info.get('id') or hashlib.sha1(self.url.encode()).hexdigest()[:16])
+        os.makedirs(folder, exist_ok=True)
+        files = {}
+        for media_url, data in self.media.items():
+            name = hashlib.sha1(media_url.encode()).hexdigest()[:16] + '.bin'
+            with open(os.path.join(folder, name), 'wb') as fh:
+                fh.write(data)
+            files[media_url] = name
+        with open(os.path.join(folder, CAPTURE_FILE), 'w', encoding='utf-8') as fh:
+            json.dump({'url': self.url, 'info': self.info, 'media': files}, fh, ensure_ascii=False, indent=1)
+        return folder
+    
+    @classmethod
+    def load(cls, folder: str) -> 'Capture':
+        """Read a capture written by save()"""
+        with open(os.path.join(folder, CAPTURE_FILE), 'r', encoding='utf-8') as fh:
+            data = json.load(fh)
+        media = {}
+        for media_url, name in data.get('media', {}).items():
+            with open(os.path.join(folder, name), 'rb') as fh:
+                media[media_url] = fh.read()
+        return cls(data['url'], data['info'], media)
+
+
+def load_captures(directory: str) -> list:
+    """Every capture saved under directory (empty when it does not exist)"""
+    if not os.path.isdir(directory):
+        return []
+    return [Capture.load(os.path.join(directory, name)) for name in sorted(os.listdir(directory))
+            if os.path.isfile(os.path.join(directory, name, CAPTURE_FILE))]
+
+
+def capture(url: str, format_selector: Optional[str] = None, max_bytes: Optional[int] = None,
+            max_entries: Optional[int] = None) -> Capture:
+    """
+    Record a URL from the real site (needs the network)
+    Media is captured for the formats format_selector picks (only plain HTTP
+    formats can be replayed) and for the thumbnails the app shows; each file
+    is cut to max_bytes and its filesize adjusted to match. Playlists keep
+    their first max_entries flat entries.
+    """
+    format_selector = format_selector or CAPTURE_FORMAT
+    max_bytes = max_bytes or MAX_CAPTURE_BYTES
+    with yt_dlp.YoutubeDL(extraction.INFO_OPTIONS) as ydl:
+        info = extraction.extract_unprocessed(ydl, url)
+        if info.get('_type') == 'playlist':
+            info['entries'] = list(itertools.islice(info.get('entries') or [], max_entries or Config.PLAYLIST_PAGE_SIZE))
+            return Capture(url, ydl.sanitize_info(info))
+        
+        info = ydl.sanitize_info(info)
+        for fmt in info.get('formats') or []:
+            for field in _PRIVATE_FIELDS:
+                fmt.pop(field, None)
+            (fmt.get('http_headers') or {}).pop('Cookie', None)
+        
+        with yt_dlp.YoutubeDL(dict(extraction.INFO_OPTIONS, format=format_selector)) as chooser:
+            chosen = chooser.process_ie_result(copy.deepcopy(info), download=False)
+        wanted = {fmt.get('format_id') for fmt in chosen.get('requested_formats') or [chosen]}
+        
+        media = {}
+        for fmt in info.get('formats') or []:
+            if fmt.get('format_id') not in wanted:
+                continue
+            if fmt.get('protocol') not in ('http', 'https'):
+                print(f"Not capturing format {fmt.get('format_id')}: {fmt.get('protocol')} cannot be replayed")
+                continue
+            media[fmt['url']] = _fetch(ydl, fmt['url'], fmt.get('http_headers'), max_bytes)
+            fmt['filesize'] = len(media[fmt['url']])
+            fmt.pop('filesize_approx', None)
+        
+        assets = select_assets(info)
+        for thumbnail_url in {assets['thumbnail'], assets['preview_thumbnail']} - {None}:
+            try:
+                media[thumbnail_url] = _fetch(ydl, thumbnail_url, None, max_bytes)
+            except Exception as e:
+                print(f"Error capturing thumbnail: {str(e)}")
+    return Capture(url, info, media)
+
+
+def _fetch(ydl: yt_dlp.YoutubeDL, url: str, headers: Optional[dict], max_bytes: int) -> bytes:
+    """First max_bytes of a URL through yt-dlp's networking (same headers, cookies and proxy)"""
+    headers = dict(headers or {}, Range=f'bytes=0-{max_bytes - 1}')
+    with ydl.urlopen(Request(url, headers=headers)) as response:
+        return response.read(max_bytes)
+
+
+def _pattern(seed: str, size: int) -> bytes:
+    """Deterministic filler bytes"""
+    block = hashlib.sha256(seed.encode()).digest() * 128
+    return (block * (size // len(block) + 1))[:size]
+
+
+# (format_id, ext, vcodec, acodec, height, tbr) in yt-dlp's order, worst to best
+SYNTHETIC_FORMATS = [
+    ('139', 'm4a', 'none', 'mp4a.40.5', None, 48),
+    ('140', 'm4a', 'none', 'mp4a.40.2', None, 129),
+    ('251', 'webm', 'none', 'opus', None, 135),
+    ('160', 'mp4', 'avc1.4d400c', 'none', 144, 110),
+    ('133', 'mp4', 'avc1.4d4015', 'none', 240, 250),
+    ('18', 'mp4', 'avc1.42001E', 'mp4a.40.2', 360, 500),
+    ('134', 'mp4', 'avc1.4d401e', 'none', 360, 650),
+    ('135', 'mp4', 'avc1.4d401f', 'none', 480, 1200),
+    ('22', 'mp4', 'avc1.64001F', 'mp4a.40.2', 720, 1500),
+    ('136', 'mp4', 'avc1.4d401f', 'none', 720, 2500),
+    ('137', 'mp4', 'avc1.640028', 'none', 1080, 4500),
+]
+
+
+def synthetic_video(video_id: str, title: Optional[str] = None, duration: int = 212,
+                    media_size: int = 256 * 1024, **fields) -> Capture:
+    """
+    A capture shaped like a YouTube extraction, with generated media for every format
+    Sizes follow each format's bitrate, media_size being the largest; fields override the info dict
+    """
+    url = f'https://www.youtube.com/watch?v={video_id}'
+    top = max(tbr for *_, tbr in SYNTHETIC_FORMATS)
+    media = {}
+    formats = []
+    for format_id, ext, vcodec, acodec, height, tbr in SYNTHETIC_FORMATS:
+        format_url = f'https://media.invalid/{video_id}/{format_id}.{ext}'
+        media[format_url] = _pattern(f'{video_id}:{format_id}', max(4096, media_size * tbr // top))
+        formats.append({
+            'format_id': format_id,
+            'url': format_url,
+            'ext': ext,
+            'vcodec': vcodec,
+            'acodec': acodec,
+            'height': height,
+            'width': height * 16 // 9 if height else None,
+            'fps': 30 if height else None,
+            'tbr': tbr,
+            'filesize': len(media[format_url]),
+            'protocol': 'https',
+            'resolution': f'{height * 16 // 9}x{height}' if height else 'audio only',
+            'http_headers': {'User-Agent': 'Mozilla/5.0'}
+        })
+    thumbnails = []
+    for index, (name, width) in enumerate((('default', 120), ('mqdefault', 320), ('maxresdefault', 1280))):
+        thumbnail_url = f'https://media.invalid/{video_id}/{name}.jpg'
+        media[thumbnail_url] = _pattern(f'{video_id}:{name}', 2048)
+        thumbnails.append({'url': thumbnail_url, 'width': width, 'height': width * 9 // 16, 'preference': index})
+    subtitle_url = f'https://media.invalid/{video_id}/en.vtt'
+    media[subtitle_url] = b'WEBVTT\n\n00:00:00.000 --> 00:00:02.000\nReplayed subtitle\n'
+    
+    info = {
+        'id': video_id,
+        'title': title or f'Replayed video {video_id}',
+        'duration': duration,
+        'uploader': 'Replay Channel',
+        'channel': 'Replay Channel',
+        'view_count': 123456,
+        'upload_date': '20240315',
+        'description': f'Synthetic capture of {video_id} for offline tests',
+        'live_status': 'not_live',
+        'formats': formats,
+        'thumbnails': thumbnails,
+        'thumbnail': thumbnails[-1]['url'],
+        'subtitles': {'en': [{'ext': 'vtt', 'url': subtitle_url}]},
+        'extractor': 'youtube',
+        'extractor_key': 'Youtube',
+        'webpage_url': url,
+        'original_url': url,
+        'webpage_url_basename': 'watch',
+        'webpage_url_domain': 'youtube.com'
+    }
+    info.update(fields)
+    return Capture(url, info, media)
+
+
+def synthetic_playlist(playlist_id: str, video_ids: list, title: Optional[str] = None) -> Capture:
+    """A flat playlist capture whose entries point at video_ids"""
+    url = f'https://www.youtube.com/playlist?list={playlist_id}'
+    entries = [{
+        '_type': 'url',
+        'ie_key': 'Youtube',
+        'id': video_id,
+        'url': f'https://www.youtube.com/watch?v={video_id}',
+        'title': f'Replayed video {video_id}',
+        'duration': 212
+    } for video_id in video_ids]
+    return Capture(url, {
+        '_type': 'playlist',
+        'id': playlist_id,
+        'title': title or f'Replayed playlist {playlist_id}',
+        'playlist_count': len(entries),
+        'entries': entries,
+        'extractor': 'youtube:tab',
+        'extractor_key': 'YoutubeTab',
+        'webpage_url': url,
+        'original_url': url
+    })
+
+
+class ReplayServer:
+    """Local HTTP server for captured media (single-range requests, optional latency and per-connection rate)"""
+    
+    def __init__(self, latency: float = 0.0, rate: Optional[int] = None):
+        self.latency = latency
+        self.rate = rate
+        self.routes = {}              # path -> bytes
+        self.requests = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+    
+    def start(self) -> 'ReplayServer':
+        """Start serving on a free local port"""
+        if self._server is None:
+            self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+            self._server.daemon_threads = True
+            threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+    
+    def stop(self):
+        """Stop serving"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+    
+    def url(self, path: str) -> str:
+        """Address of a path on this server"""
+        return f'http://127.0.0.1:{self._server.server_address[1]}{path}'
+    
+    def _count(self, requests: int = 0, sent: int = 0):
+        with self._lock:
+            self.requests += requests
+            self.bytes_sent += sent
+    
+    def _handler(self):
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            
+            def do_HEAD(self):
+                self._respond(body=False)
+            
+            def do_GET(self):
+                self._respond(body=True)
+            
+            def _respond(self, body: bool):
+                server._count(requests=1)
+                if server.latency:
+                    time.sleep(server.latency)
+                payload = server.routes.get(self.path.split('?')[0])
+                if payload is None:
+                    self.send_error(404)
+                    return
+                start, end = 0, len(payload) - 1
+                header = self.headers.get('Range')
+                if header and header.startswith('bytes=') and payload:
+                    first, last = header[6:].split(',')[0].split('-')
+                    start = int(first or 0)
+                    end = min(int(last), end) if last else end
+                    self.send_response(206)
+                    self.send_header('Content-Range', f'bytes {start}-{end}/{len(payload)}')
+                else:
+                    self.send_response(200)
+                self.send_header('Content-Length', str(max(end - start + 1, 0)))
+                self.send_header('Accept-Ranges', 'bytes')
+                self.end_headers()
+                if body:
+                    self._send(memoryview(payload)[start:end + 1])
+            
+            def _send(self, view):
+                block = 64 * 1024
+                started = time.monotonic()
+                for offset in range(0, len(view), block):
+                    chunk = view[offset:offset + block]
+                    try:
+                        self.wfile.write(chunk)
+                    except (BrokenPipeError, ConnectionResetError):
+                        return
+                    server._count(sent=len(chunk))
+                    if server.rate:
+                        # Sleep until this connection is back under the rate
+                        ahead = (offset + len(chunk)) / server.rate - (time.monotonic() - started)
+                        if ahead > 0:
+                            time.sleep(ahead)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return Handler
+
+
+class Replay:
+    """
+    Answer yt-dlp extractions from captures while active (a context manager)
+    URLs without a capture fail with a DownloadError instead of reaching the
+    network, and media URLs that were not captured answer 404. Extractions
+    are counted per video (or playlist) ID in extractions. Only this process is patched, so keep
+    the extraction_process_pool setting off.
+    """
+    
+    _active: Optional['Replay'] = None
+    
+    def __init__(self, captures: Iterable[Capture] = (), latency: float = 0.0, rate: Optional[int] = None):
+        self.server = ReplayServer(latency, rate)
+        self.extractions = Counter()
+        self._captures = list(captures)
+        self._infos = {}             # URL or ID -> info with media URLs pointing at the server
+        self._original: Optional[Callable] = None
+        self._lock = threading.Lock()
+    
+    def __enter__(self) -> 'Replay':
+        if Replay._active is not None:
+            raise RuntimeError('Another replay is already active')
+        self.server.start()
+        for item in self._captures:
+            self._serve(item)
+        replay = self
+        self._original = yt_dlp.YoutubeDL.extract_info
+        
+        def extract_info(ydl, url, download=True, ie_key=None, extra_info=None, process=True,
+                         force_generic_extractor=False):
+            info = replay.lookup(url, ydl.params.get('noplaylist', False))
+            if not process:
+                return info
+            return ydl.process_ie_result(info, download=download, extra_info=extra_info or {})
+        
+        yt_dlp.YoutubeDL.extract_info = extract_info
+        Replay._active = self
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        yt_dlp.YoutubeDL.extract_info = self._original
+        Replay._active = None
+        self.server.stop()
+    
+    def add(self, item: Capture):
+        """Replay another capture (also while active)"""
+        self._captures.append(item)
+        if Replay._active is self:
+            self._serve(item)
+    
+    def lookup(self, url: str, noplaylist: bool = False) -> dict:
+        """A fresh copy of the info captured for url (yt-dlp modifies what it is given)"""
+        with self._lock:
+            key = url if url in self._infos else _video_key(url, noplaylist)
+            info = self._infos.get(key)
+            if info is None:
+                raise DownloadError(f'ERROR: No capture for {url} (replay is offline)')
+            self.extractions[info.get('id') or key] += 1
+            return copy.deepcopy(info)
+    
+    @property
+    def total_extractions(self) -> int:
+        """Extractions answered so far"""
+        return sum(self.extractions.values())
+    
+    def _serve(self, item: Capture):
+        """Route the capture's media and point its info at the server"""
+        info = copy.deepcopy(item.info)
+        with self._lock:
+            for container, field in _media_urls(info):
+                original = container[field]
+                path = f'/{len(self.server.routes)}/' + os.path.basename(urllib.parse.urlparse(original).path)
+                if original in item.media:
+                    self.server.routes[path] = item.media[original]
+                container[field] = self.server.url(path)
+            for key in item.keys():
+                self._infos[key] = info
+
+
+class HeadlessView:
+    """
+    Stands in for YouTubeDownloaderView where there is no display
+    Posted updates are applied at once (there is no event loop) and every
+    view call is kept in calls as (name, args); show_video_info_window only
+    records the info it would show
+    """
+    
+    def __init__(self):
+        self.calls = []
+        self.callbacks = {}
+        self.thumbnails = None
+        self._lock = threading.Lock()
+    
+    def set_callbacks(self, **callbacks):
+        self.callbacks.update(callbacks)
+    
+    def set_file_callbacks(self, **callbacks):
+        self.callbacks.update(callbacks)
+    
+    def set_thumbnail_cache(self, thumbnails):
+        self.thumbnails = thumbnails
+    
+    def post(self, func: Callable, *args):
+        func(*args)
+    
+    def post_latest(self, key: str, func: Callable, *args):
+        func(*args)
+    
+    def mark_job_dirty(self, job_id):
+        self._record('mark_job_dirty', (job_id,))
+    
+    def named(self, name: str) -> list:
+        """Arguments of every call to one view method"""
+        with self._lock:
+            return [args for call, args in self.calls if call == name]
+    
+    def _record(self, name: str, args: tuple):
+        with self._lock:
+            self.calls.append((name, args))
+    
+    def __getattr__(self, name: str):
+        if not name.startswith(('show_', 'update_', 'bring_')):
+            raise AttributeError(name)
+        return lambda *args: self._record(name, args)
@@ -1,64 +1,203 @@
 """
 Test file for YouTube Video Downloader
-Simple tests to verify functionality
+Model and controller tests run offline against recorded extractor responses
+(see tests/replay.py), so they never reach YouTube
 """
 
 import sys
 import os
+import tempfile
 
-# Add current directory to Python path
+# Add src directory to Python path
 current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
 if current_dir not in sys.path:
-    sys.path.insert(0, current_dir)
+    sys.path.append(current_dir)  # For the replay harness (tests/replay.py)
 
-from model import YouTubeDownloaderModel
+from core.controller import YouTubeDownloaderController
+from core.history import DownloadHistory
+from core.model import YouTubeDownloaderModel
+from core.results import ErrorCategory
+from replay import HeadlessView, Replay, load_captures, synthetic_playlist, synthetic_video
+from utils.settings import Settings
+
+
+VIDEO_URL = 'https://www.youtube.com/watch?v=replay00001'
+PLAYLIST_URL = 'https://www.youtube.com/playlist?list=PLreplay'
+FIXTURES_DIR = os.path.join(current_dir, 'fixtures', 'replay')
+
+
+def _captures() -> list:
+    """Synthetic captures plus any real ones recorded into tests/fixtures/replay"""
+    return [
+        synthetic_video('replay00001', 'Replayed Video'),
+        synthetic_video('replay00002'),
+        synthetic_playlist('PLreplay', ['replay00001', 'replay00002'])
+    ] + load_captures(FIXTURES_DIR)
+
+
+def _model(temp_dir: str, **settings_values) -> YouTubeDownloaderModel:
+    settings = Settings(os.path.join(temp_dir, 'settings.json'))
+    settings.set('download_path', os.path.join(temp_dir, 'downloads'))
+    for key, value in settings_values.items():
+        settings.set(key, value)
+    return YouTubeDownloaderModel(settings)
 
 
 def test_url_validation():
     """Test URL validation functionality"""
-    model = YouTubeDownloaderModel()
-    
-    # Valid URLs
-    valid_urls = [
-        "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
-        "https://youtu.be/dQw4w9WgXcQ",
-        "https://m.youtube.com/watch?v=dQw4w9WgXcQ"
-    ]
-    
-    # Invalid URLs
-    invalid_urls = [
-        "https://www.google.com",
-        "not_a_url",
-        "",
-        None,
-        "https://vimeo.com/123456"
-    ]
-    
-    print("Testing URL validation...")
-    
-    # Test valid URLs
-    for url in valid_urls:
-        result = model.validate_url(url)
-        print(f"✓ {url}: {result}")
-        assert result == True, f"Should be valid: {url}"
-    
-    # Test invalid URLs
-    for url in invalid_urls:
-        result = model.validate_url(url)
-        print(f"✗ {url}: {result}")
-        assert result == False, f"Should be invalid: {url}"
-    
-    print("URL validation tests passed!")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        model = _model(temp_dir)
+        try:
+            # Valid URLs
+            valid_urls = [
+                "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+                "https://youtu.be/dQw4w9WgXcQ",
+                "https://m.youtube.com/watch?v=dQw4w9WgXcQ"
+            ]
+            
+            # Invalid URLs
+            invalid_urls = [
+                "https://www.google.com",
+                "not_a_url",
+                "",
+                None,
+                "https://vimeo.com/123456"
+            ]
+            
+            for url in valid_urls:
+                assert model.validate_url(url) == True, f"Should be valid: {url}"
+            for url in invalid_urls:
+                assert model.validate_url(url) == False, f"Should be invalid: {url}"
+        finally:
+            model.shutdown()
 
 
 def test_model_initialization():
     """Test model initialization"""
-    model = YouTubeDownloaderModel()
-    
-    assert hasattr(model, 'download_path'), "Model should have download_path attribute"
-    assert os.path.exists(model.download_path), "Download directory should be created"
-    
-    print("Model initialization test passed!")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        model = _model(temp_dir)
+        try:
+            assert hasattr(model, 'download_path'), "Model should have download_path attribute"
+            assert os.path.exists(model.download_path), "Download directory should be created"
+        finally:
+            model.shutdown()
+
+
+def test_video_info_is_replayed():
+    """Info lookups come from the capture; the format list reuses the lookup"""
+    with tempfile.TemporaryDirectory() as temp_dir, Replay(_captures()) as replay:
+        model = _model(temp_dir, format='best[height<=720]')
+        try:
+            result = model.get_video_info(VIDEO_URL)
+            assert result.success, result.error_message
+            assert result.info['title'] == 'Replayed Video'
+            assert result.info['id'] == 'replay00001'
+            assert result.info['subtitle_languages'] == ['en']
+            # Size estimate of the format the download will pick (720p, format 22)
+            assert result.info['filesize'] == _captures()[0].info['formats'][8]['filesize']
+            assert replay.extractions['replay00001'] == 1
+            
+            result = model.get_available_formats(VIDEO_URL)
+            assert result.success, result.error_message
+            formats = result.formats
+            assert len(formats) == 8 and formats[-1]['format_id'] == '137'
+            assert replay.extractions['replay00001'] == 1  # No second extraction
+        finally:
+            model.shutdown()
+
+
+def test_download_is_replayed_by_each_backend():
+    """The captured bytes of the ranked format end up on disk, with progress reported"""
+    for backend in ('yt-dlp', 'native'):
+        with tempfile.TemporaryDirectory() as temp_dir, Replay(_captures()) as replay:
+            model = _model(temp_dir, format='best[height<=720]', verify_downloads=False)
+            try:
+                progress = []
+                result = model.download_video(VIDEO_URL, lambda percent, speed: progress.append(percent),
+                                              backend=backend)
+                assert result.success, result.error_message
+                assert result.backend == backend
+                assert result.title == 'Replayed Video'
+                expected = _captures()[0].media['https://media.invalid/replay00001/22.mp4']
+                with open(result.filepath, 'rb') as fh:
+                    assert fh.read() == expected
+                assert result.bytes_downloaded == len(expected)
+                assert progress
+                assert replay.server.bytes_sent >= len(expected)
+                assert replay.extractions['replay00001'] == 1  # The backend reuses the probe
+            finally:
+                model.shutdown()
+
+
+def test_playlist_and_unknown_urls_stay_offline():
+    """Playlists are detected from the capture and uncaptured URLs fail instead of going online"""
+    with tempfile.TemporaryDirectory() as temp_dir, Replay(_captures()):
+        model = _model(temp_dir)
+        try:
+            result = model.download_video(PLAYLIST_URL)
+            assert not result.success
+            assert result.error.category == ErrorCategory.PLAYLIST
+            assert result.first_video_url == VIDEO_URL
+            
+            pages = list(model.iter_playlist(PLAYLIST_URL, page_size=1))
+            assert [page[0]['id'] for page in pages] == ['replay00001', 'replay00002']
+            
+            result = model.get_video_info('https://www.youtube.com/watch?v=notcaptured')
+            assert not result.success
+            assert 'No capture' in result.error_message
+        finally:
+            model.shutdown()
+
+
+def test_watch_link_with_list_downloads_the_video():
+    """A watch link inside a playlist downloads the video instead of failing as a playlist"""
+    url = f'{VIDEO_URL}&list=PLreplay'
+    with tempfile.TemporaryDirectory() as temp_dir, Replay(_captures()) as replay:
+        model = _model(temp_dir, verify_downloads=False)
+        try:
+            # yt-dlp itself resolves the link to the playlist unless noplaylist is set
+            assert replay.lookup(url)['_type'] == 'playlist'
+            assert not model.is_playlist_url(url)
+            
+            result = model.download_video(url)
+            assert result.success, result.error_message
+            assert result.video_id == 'replay00001'
+        finally:
+            model.shutdown()
+
+
+def test_controller_replays_info_and_download():
+    """Controller handlers drive a headless view from replayed responses"""
+    with tempfile.TemporaryDirectory() as temp_dir, Replay(_captures()):
+        settings = Settings(os.path.join(temp_dir, 'settings.json'))
+        settings.set('download_path', os.path.join(temp_dir, 'downloads'))
+        settings.set('verify_downloads', False)
+        view = HeadlessView()
+        controller = YouTubeDownloaderController(settings, view)
+        controller.model.history = DownloadHistory(os.path.join(temp_dir, 'history.jsonl'))
+        try:
+            assert view.callbacks['get_info_callback'] == controller.handle_get_info
+            
+            controller.handle_get_info(VIDEO_URL)
+            [(info,)] = view.named('show_video_info_window')
+            assert info['title'] == 'Replayed Video'
+            assert info['download_path'] == controller.model.download_path
+            assert view.named('show_error') == []
+            
+            controller.handle_download(VIDEO_URL)
+            assert view.named('show_error') == []
+            assert len(view.named('show_success')) == 2
+            assert view.named('update_progress')
+            assert view.calls[-1][0] == 'show_idle'
+            [entry] = controller.model.history.iter_entries()
+            assert entry['id'] == 'replay00001'
+            assert os.path.exists(entry['filepath'])
+        finally:
+            controller.queue.stop()
+            controller.model.shutdown()
 
 
 def run_tests():
@@ -66,6 +205,11 @@ def run_tests():
     try:
         test_model_initialization()
         test_url_validation()
+        test_video_info_is_replayed()
+        test_download_is_replayed_by_each_backend()
+        test_playlist_and_unknown_urls_stay_offline()
+        test_watch_link_with_list_downloads_the_video()
+        test_controller_replays_info_and_download()
         print("\n🎉 All tests passed successfully!")
         
     except AssertionError as e:
@@ -0,0 +1,113 @@
+"""
+Test subtitle and thumbnail fetching
+Serves assets from local file:// URLs so no network access is needed
+"""
+
+import sys
+import os
+import pathlib
+import tempfile
+import time
+
+# Add src directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from core.assets import AssetCache, AssetFetcher, select_assets
+from core.templates import OutputTemplate
+
+
+def _sample_info(asset_dir: str) -> dict:
+    """Build a minimal full info dict pointing at local files"""
+    files = {}
+    for name, content in (('en.vtt', 'WEBVTT'), ('de.vtt', 'WEBVTT de'), ('thumb.jpg', 'jpeg')):
+        path = os.path.join(asset_dir, name)
+        with open(path, 'w') as fh:
+            fh.write(content)
+        files[name] = pathlib.Path(path).as_uri()
+    
+    return {
+        'id': 'abc123',
+        'title': 'Sample: Video',
+        'uploader': 'Someone',
+        'webpage_url': 'https://www.youtube.com/watch?v=abc123',
+        'subtitles': {'en-US': [{'ext': 'srv3', 'url': 'unused'}, {'ext': 'vtt', 'url': files['en.vtt']}]},
+        'automatic_captions': {'de': [{'ext': 'vtt', 'url': files['de.vtt']}]},
+        'thumbnails': [
+            {'url': 'small', 'preference': -10, 'width': 120},
+            {'url': files['thumb.jpg'], 'preference': 0, 'width': 1280},
+        ],
+    }
+
+
+def test_select_assets():
+    """Subtitle tracks and the best thumbnail are kept, everything else dropped"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        info = _sample_info(temp_dir)
+        assets = select_assets(info)
+        
+        assert sorted(assets['subtitles']) == ['de', 'en-US']
+        assert assets['thumbnail'].endswith('thumb.jpg')
+
+
+def test_batch_fetch_uses_cache():
+    """Remembered videos are fetched without calling the extractor again"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        info = _sample_info(temp_dir)
+        calls = []
+        
+        def extractor(url):
+            calls.append(url)
+            return info
+        
+        fetcher = AssetFetcher(extractor, cache_size=8, max_workers=2)
+        fetcher.remember(info, info['webpage_url'])
+        
+        output_dir = os.path.join(temp_dir, 'out')
+        os.makedirs(output_dir)
+        results = fetcher.fetch_batch([info['webpage_url'], 'abc123'], output_dir, languages=['en', 'fr'])
+        
+        assert calls == []
+        assert all(result['success'] for result in results)
+        names = sorted(os.listdir(output_dir))
+        assert 'Sample： Video.en-US.vtt' in names
+        assert 'Sample： Video.jpg' in names
+        assert not any(name.endswith('.part') for name in names)
+
+
+
+def test_assets_follow_the_output_template():
+    """Subtitles and thumbnail are named like the video, folders included"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        info = _sample_info(temp_dir)
+        template = OutputTemplate('{uploader}/{title} [{id}]')
+        fetcher = AssetFetcher(lambda url: info, output_name=lambda metadata: template.render(metadata))
+        
+        output_dir = os.path.join(temp_dir, 'out')
+        result = fetcher.fetch(info['webpage_url'], output_dir, languages=['de'])
+        
+        assert result['success'], result.get('error')
+        assert sorted(os.listdir(os.path.join(output_dir, 'Someone'))) == [
+            'Sample_ Video [abc123].de.vtt', 'Sample_ Video [abc123].jpg'
+        ]
+
+
+def test_cached_assets_expire():
+    """Signed URLs are not served from the cache once they may have expired"""
+    cache = AssetCache(max_entries=4, max_age=0.05)
+    cache.put(['abc123', 'https://www.youtube.com/watch?v=abc123'], {'id': 'abc123'})
+    assert cache.get('abc123') == {'id': 'abc123'}
+    
+    time.sleep(0.1)
+    assert cache.get('abc123') is None
+    assert cache.get('https://www.youtube.com/watch?v=abc123') is None
+
+
+if __name__ == "__main__":
+    test_select_assets()
+    test_batch_fetch_uses_cache()
+    test_assets_follow_the_output_template()
+    test_cached_assets_expire()
+    print("Asset fetching tests passed!")
@@ -0,0 +1,61 @@
+"""
+Test clip (time range and chapter) selection
+"""
+
+import sys
+import os
+import tempfile
+
+# Add src directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from core.model import YouTubeDownloaderModel
+from utils.settings import Settings
+from utils.timecode import parse_clip, parse_timestamp
+
+
+def test_parse_clip_fields():
+    """Start/end accept seconds or time codes; bad or reversed ranges are rejected"""
+    assert parse_timestamp('90') == 90
+    assert parse_timestamp('1:02:03.5') == 3723.5
+    assert parse_clip('', '', '') is None
+    assert parse_clip('1:00:00', '1:02:00') == {'start': 3600, 'end': 3720, 'chapters': []}
+    assert parse_clip('', '', 'Intro, Q&A') == {'start': None, 'end': None, 'chapters': ['Intro', 'Q&A']}
+    
+    for start, end in (('1:75', ''), ('abc', ''), ('2:00', '1:00')):
+        try:
+            parse_clip(start, end)
+        except ValueError:
+            continue
+        raise AssertionError(f"{start!r}-{end!r} should be rejected")
+
+
+def test_clip_options_select_sections():
+    """Clips become yt-dlp download ranges; chapters match by title, ignoring case"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        settings = Settings(os.path.join(temp_dir, 'settings.json'))
+        settings.set('download_path', os.path.join(temp_dir, 'Downloads'))
+        model = YouTubeDownloaderModel(settings)
+        info = {'id': 'abc', 'duration': 7200, 'chapters': [
+            {'title': 'Intro', 'start_time': 0, 'end_time': 60},
+            {'title': 'Q&A session', 'start_time': 6000, 'end_time': 7200},
+        ]}
+        
+        ranges = model._clip_options({'start': 3600, 'end': 3720, 'chapters': []})['download_ranges']
+        assert [(s['start_time'], s['end_time']) for s in ranges(info, None)] == [(3600, 3720)]
+        
+        ranges = model._clip_options({'start': None, 'end': None, 'chapters': ['q&a']})['download_ranges']
+        assert [s['title'] for s in ranges(info, None)] == ['Q&A session']
+        
+        assert model._clip_suffix({'start': 3600, 'end': 3720}) == ' [01.00.00-01.02.00]'
+        model.shutdown()
+
+
+if __name__ == "__main__":
+    print("Testing clip selection...")
+    test_parse_clip_fields()
+    test_clip_options_select_sections()
+    print("✅ Clip tests passed!")
@@ -0,0 +1,61 @@
+"""
+Test the UI dispatch queue (drained by hand, no display needed)
+"""
+
+import sys
+import os
+import threading
+
+# Add src directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from ui.dispatcher import UIDispatcher
+
+
+def test_updates_are_batched_in_order():
+    """Calls from many threads run in one batch, in posting order per thread"""
+    dispatcher = UIDispatcher(root=None)
+    applied = []
+    
+    def worker(name):
+        for index in range(100):
+            dispatcher.post(applied.append, (name, index))
+    
+    threads = [threading.Thread(target=worker, args=(name,)) for name in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert applied == []
+    assert dispatcher.drain() == 400
+    for name in range(4):
+        assert [index for who, index in applied if who == name] == list(range(100))
+    assert dispatcher.drain() == 0
+
+
+def test_latest_update_replaces_older_ones():
+    """Only the newest progress update per key is applied, after earlier plain calls"""
+    dispatcher = UIDispatcher(root=None)
+    applied = []
+    frames = []
+    dispatcher.add_frame_callback(lambda: frames.append(len(applied)))
+    
+    dispatcher.post(applied.append, 'busy')
+    for percent in range(50):
+        dispatcher.post_latest('progress', applied.append, f'{percent}%')
+    dispatcher.post(lambda: 1 / 0)  # A failing update does not stop the batch
+    dispatcher.post(applied.append, 'done')
+    
+    assert dispatcher.drain() == 4
+    assert applied == ['busy', '49%', 'done']
+    assert frames == [3]
+
+
+if __name__ == "__main__":
+    test_updates_are_batched_in_order()
+    test_latest_update_replaces_older_ones()
+    print("All dispatcher tests passed!")
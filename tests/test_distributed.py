@@ -0,0 +1,130 @@
+"""
+Test the coordinator/worker mode with worker processes on this machine
+"""
+
+import sys
+import os
+import subprocess
+import tempfile
+import time
+
+# Add src directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from core.distributed import Coordinator, Worker, model_runner
+from core.history import DownloadHistory
+from core.jobs import DownloadJob
+from core.results import DownloadResult
+
+
+# Worker process with a stand-in download: 'flaky' URLs fail with a network error once
+WORKER_SCRIPT = r'''
+import os, sys
+sys.path.insert(0, sys.argv[1])
+from core.distributed import Worker
+from core.history import make_entry
+from core.results import DownloadResult, ErrorCategory, ResultError
+
+coordinator_url, token, marker_dir, name = sys.argv[2:6]
+
+def run_job(url, options):
+    video_id = url.rsplit('=', 1)[1]
+    marker = os.path.join(marker_dir, video_id)
+    if 'flaky' in video_id and not os.path.exists(marker):
+        open(marker, 'w').close()
+        return DownloadResult.failure(ResultError.create(ErrorCategory.NETWORK, 'Connection reset'), url=url), None
+    result = DownloadResult(True, 'done', url=url, video_id=video_id, filepath=f'/{name}/{video_id}.mp4')
+    return result, make_entry(url, result, {'success': True, 'filepath': result.filepath, 'size': 1})
+
+Worker(coordinator_url, token, run_job, name=name, poll_seconds=0.05).run(exit_when_done=True)
+'''
+
+
+def test_local_worker_processes_share_the_queue():
+    """Several worker processes drain one queue; retries and history come back to the coordinator"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        history = DownloadHistory(os.path.join(temp_dir, 'history.jsonl'))
+        coordinator = Coordinator('127.0.0.1', 0, 'secret', history=history)
+        ids = [f'vid{index}' for index in range(8)] + ['flaky1']
+        for video_id in ids:
+            coordinator.add(f'https://www.youtube.com/watch?v={video_id}')
+        host, port = coordinator.start()
+        
+        workers = [
+            subprocess.Popen([sys.executable, '-c', WORKER_SCRIPT, src_dir, f'http://{host}:{port}', 'secret',
+                              temp_dir, f'worker{index}'])
+            for index in range(3)
+        ]
+        try:
+            assert coordinator.wait(timeout=60)
+            for worker in workers:
+                assert worker.wait(timeout=30) == 0
+        finally:
+            coordinator.stop()
+            for worker in workers:
+                if worker.poll() is None:
+                    worker.kill()
+        
+        assert all(job.status == DownloadJob.COMPLETED for job in coordinator.jobs)
+        flaky = [job for job in coordinator.jobs if job.url.endswith('flaky1')][0]
+        assert flaky.attempts == 1
+        
+        entries = list(history.iter_entries())
+        assert sorted(entry['id'] for entry in entries) == sorted(ids)
+        assert all(entry['worker'].startswith('worker') for entry in entries)
+        assert sum(coordinator.summary()['workers'].values()) == len(ids)
+
+
+def test_expired_lease_moves_to_another_worker():
+    """A silent worker loses its job; its late report is rejected"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        coordinator = Coordinator('127.0.0.1', 0, 'secret', lease_seconds=0.05,
+                                  history=DownloadHistory(os.path.join(temp_dir, 'history.jsonl')))
+        job = coordinator.add('https://www.youtube.com/watch?v=abc')
+        
+        assert coordinator.lease('slow')['job']['id'] == job.id
+        time.sleep(0.1)
+        assert coordinator.lease('fast')['job']['id'] == job.id
+        assert job.attempts == 1
+        
+        assert not coordinator.complete(job.id, 'slow', DownloadResult(True), None)
+        assert coordinator.complete(job.id, 'fast', DownloadResult(True, 'done'), None)
+        assert coordinator.wait(timeout=1) and job.status == DownloadJob.COMPLETED
+
+
+
+def test_worker_model_leaves_history_to_the_coordinator():
+    """The worker's model must not write the entry the coordinator records as well"""
+    class FakeModel:
+        pass
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'history.jsonl')
+        model = FakeModel()
+        model.history = DownloadHistory(path)
+        model_runner(model)
+        
+        assert model.history.path == path
+        model.history.record({'url': 'https://www.youtube.com/watch?v=abc', 'id': 'abc'})
+        assert model.history.record_many([{'id': 'def'}]) == 0
+        assert not os.path.exists(path)
+
+
+def test_unreported_result_is_dropped_with_a_message():
+    """A worker that cannot reach the coordinator gives up on the report and counts it as dropped"""
+    worker = Worker('http://127.0.0.1:9', 'secret', lambda url, options: (DownloadResult(True, 'done', url=url), None),
+                    name='lonely', poll_seconds=0.001)
+    worker._run({'id': 1, 'url': 'https://www.youtube.com/watch?v=abc', 'options': None}, lease_seconds=60)
+    assert worker.completed == 0
+    assert worker.dropped == 1
+
+
+if __name__ == "__main__":
+    test_local_worker_processes_share_the_queue()
+    test_expired_lease_moves_to_another_worker()
+    test_worker_model_leaves_history_to_the_coordinator()
+    test_unreported_result_is_dropped_with_a_message()
+    print("All distributed mode tests passed!")
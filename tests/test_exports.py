@@ -0,0 +1,89 @@
+"""
+Test queue and history export/import
+"""
+
+import sys
+import os
+import tempfile
+import tracemalloc
+
+# Add src directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from core.exports import batched, export_history, export_queue, import_history, iter_queue_file
+from core.history import DownloadHistory
+from core.jobs import DownloadJob
+
+
+def _jobs() -> list:
+    queued = DownloadJob('https://youtu.be/a', 'First, "quoted"', {'clip': {'start': 5.0, 'end': 10.0}, 'output_name': 'x'})
+    failed = DownloadJob('https://youtu.be/b', options={'backend': 'native', 'verify_attempts': 1})
+    failed.status = DownloadJob.FAILED
+    done = DownloadJob('https://youtu.be/c')
+    done.status = DownloadJob.COMPLETED
+    return [queued, failed, done]
+
+
+def test_queue_round_trip_in_both_formats():
+    """Unfinished jobs survive export/import as JSON Lines and CSV, with machine-specific options dropped"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for name in ('queue.jsonl', 'queue.csv'):
+            path = os.path.join(temp_dir, name)
+            assert export_queue(_jobs(), path) == 2
+            entries = list(iter_queue_file(path))
+            assert entries == [
+                {'url': 'https://youtu.be/a', 'title': 'First, "quoted"', 'options': {'clip': {'start': 5.0, 'end': 10.0}}},
+                {'url': 'https://youtu.be/b', 'title': None, 'options': {'backend': 'native'}},
+            ]
+            assert not os.path.exists(f'{path}.tmp')
+
+
+def test_history_import_skips_known_videos():
+    """History moves between machines without duplicating entries"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        source = DownloadHistory(os.path.join(temp_dir, 'source.jsonl'))
+        source.record_many({'url': f'https://youtu.be/v{index}', 'id': f'v{index}', 'size': index, 'verified': True}
+                           for index in range(5))
+        target = DownloadHistory(os.path.join(temp_dir, 'target.jsonl'))
+        target.record({'url': 'https://youtu.be/v0', 'id': 'v0', 'verified': True})
+        
+        for name in ('history.csv', 'history.jsonl'):
+            path = os.path.join(temp_dir, name)
+            assert export_history(source, path) == 5
+            added = import_history(target, path)
+            assert added == (4 if name == 'history.csv' else 0)
+        
+        entries = list(target.iter_entries())
+        assert sorted(entry['id'] for entry in entries) == [f'v{index}' for index in range(5)]
+        assert entries[-1]['size'] == 4 and entries[-1]['verified'] is True
+
+
+def test_large_queue_file_streams():
+    """A file with 200,000 lines is read batch by batch without holding it in memory"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'big.jsonl')
+        with open(path, 'w', encoding='utf-8') as fh:
+            for index in range(200_000):
+                fh.write(f'{{"url": "https://youtu.be/{index:011d}", "status": "queued"}}\n')
+        
+        tracemalloc.start()
+        try:
+            total = 0
+            for batch in batched(iter_queue_file(path), 1000):
+                assert len(batch) <= 1000
+                total += len(batch)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert total == 200_000
+        assert peak < 5 * 1024 * 1024
+
+
+if __name__ == "__main__":
+    test_queue_round_trip_in_both_formats()
+    test_history_import_skips_known_videos()
+    test_large_queue_file_streams()
+    print("All export/import tests passed!")
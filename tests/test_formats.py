@@ -0,0 +1,99 @@
+"""
+Test the format ranking index
+Uses a hand-written format list so no network access is needed
+"""
+
+import sys
+import os
+import tempfile
+
+# Add src directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from core import extraction
+from core.formats import AUDIO, VIDEO, FormatCache, FormatIndex, merge_selector, parse_selector
+from core.model import YouTubeDownloaderModel
+from utils.settings import Settings
+
+
+# yt-dlp order: worst to best
+FORMATS = [
+    {'format_id': 'sb0', 'ext': 'mhtml', 'vcodec': 'none', 'acodec': 'none'},
+    {'format_id': '139', 'ext': 'm4a', 'vcodec': 'none', 'acodec': 'mp4a.40.5', 'filesize': 100},
+    {'format_id': '18', 'ext': 'mp4', 'vcodec': 'avc1.42001E', 'acodec': 'mp4a.40.2', 'height': 360, 'filesize': 900},
+    {'format_id': 'hls-x', 'ext': 'mp4', 'vcodec': 'avc1.4d401f', 'acodec': 'mp4a.40.2', 'height': None},
+    {'format_id': '22', 'ext': 'mp4', 'vcodec': 'avc1.64001F', 'acodec': 'mp4a.40.2', 'height': 720, 'filesize_approx': 2000},
+    {'format_id': '140', 'ext': 'm4a', 'vcodec': 'none', 'acodec': 'mp4a.40.2', 'filesize': 300},
+    {'format_id': '247', 'ext': 'webm', 'vcodec': 'vp9', 'acodec': 'none', 'height': 720, 'filesize': 1500},
+    {'format_id': '248', 'ext': 'webm', 'vcodec': 'vp9', 'acodec': 'none', 'height': 1080, 'filesize': 4000},
+    {'format_id': '43', 'ext': 'webm', 'vcodec': 'vp8.0', 'acodec': 'vorbis', 'height': 1080},
+]
+
+
+def test_queries_pick_the_best_matching_format():
+    """Filters on height, container, codec and size; formats without a height never pass a height limit"""
+    index = FormatIndex('abc', FORMATS)
+    assert index.select(max_height=720)['format_id'] == '22'
+    assert index.select()['format_id'] == '43'
+    assert index.select(ext='mp4')['format_id'] == '22'
+    assert index.select(max_height=720, max_filesize=1000)['format_id'] == '18'
+    assert index.select(VIDEO, max_height=1080, vcodec='vp9')['format_id'] == '248'
+    assert index.select(AUDIO)['format_id'] == '140'
+    assert index.select(max_height=240) is None
+    assert index.select(max_height=720) is index.select(max_height=720)
+    
+    assert [fmt['format_id'] for fmt in index.with_video()] == ['18', 'hls-x', '22', '247', '248', '43']
+    assert index.selector(parse_selector('best[height<=720]'), 'best[height<=720]') == '22/best[height<=720]'
+    assert merge_selector(index, 720) == '247/bestvideo[height<=720],140/bestaudio'
+    assert merge_selector(None, None) == 'bestvideo,bestaudio'
+
+
+def test_parse_selector():
+    """Simple selectors become queries; anything else is left to yt-dlp"""
+    assert parse_selector('best[height<=720]') == {'kind': 'av', 'max_height': 720}
+    assert parse_selector('bv[height<=1080][ext=mp4]') == {'kind': 'video', 'max_height': 1080, 'ext': 'mp4'}
+    assert parse_selector('bestvideo+bestaudio') is None
+    assert parse_selector('best[height>=720]') is None
+
+
+def test_model_reuses_the_index():
+    """get_video_info and get_available_formats share one index per video"""
+    real_lookup = extraction.lookup_info
+    calls = []
+    
+    def lookup(url, page_size):
+        calls.append(url)
+        return {'id': 'abc', 'title': 'Video', 'webpage_url': 'https://www.youtube.com/watch?v=abc', 'formats': FORMATS}
+    
+    extraction.lookup_info = lookup
+    with tempfile.TemporaryDirectory() as temp_dir:
+        settings = Settings(os.path.join(temp_dir, 'settings.json'))
+        settings.set('download_path', os.path.join(temp_dir, 'Downloads'))
+        model = YouTubeDownloaderModel(settings)
+        try:
+            result = model.get_video_info('https://youtu.be/abc')
+            assert result.success and result.info['filesize'] == 2000
+            
+            formats = model.get_available_formats('https://www.youtube.com/watch?v=abc').formats
+            assert len(calls) == 1
+            assert [fmt['format_id'] for fmt in formats][:3] == ['18', 'hls-x', '22']
+            assert model.formats.get('abc') is model.formats.get('https://youtu.be/abc')
+        finally:
+            extraction.lookup_info = real_lookup
+            model.shutdown()
+    
+    cache = FormatCache(max_entries=2)
+    cache.index({'id': 'one', 'formats': FORMATS})
+    cache.index({'id': 'two', 'formats': []})
+    cache.index({'id': 'three', 'formats': []})
+    assert cache.get('one') is None and cache.get('three') is not None
+
+
+if __name__ == "__main__":
+    test_queries_pick_the_best_matching_format()
+    test_parse_selector()
+    test_model_reuses_the_index()
+    print("All format ranking tests passed!")
@@ -1,39 +1,54 @@
 """
-Test the new video info window functionality
+Test the video info window with replayed video information
+(skipped where there is no display)
 """
 
 import sys
 import os
+import tempfile
 
-# Add current directory to Python path
+# Add src directory to Python path
 current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
 if current_dir not in sys.path:
-    sys.path.insert(0, current_dir)
+    sys.path.append(current_dir)  # For the replay harness (tests/replay.py)
 
+import pytest
 import tkinter as tk
-from view import VideoInfoWindow
+from core.model import YouTubeDownloaderModel
+from replay import Replay, synthetic_video
+from ui.view import VideoInfoWindow
+from utils.settings import Settings
 
+
+@pytest.mark.skipif(not os.environ.get('DISPLAY'), reason="No display available for the info window")
 def test_info_window():
-    """Test the video info window with sample data"""
+    """The info window shows what the model looked up, without blocking in mainloop"""
     root = tk.Tk()
     root.withdraw()  # Hide the main window
     
-    # Sample video information
-    sample_info = {
-        'title': 'Sample YouTube Video Title - How to Learn Python Programming',
-        'uploader': 'TechChannel123',
-        'duration': 3665,  # 1 hour, 1 minute, 5 seconds
-        'view_count': 1234567,
-        'upload_date': '20240315',
-        'filesize': 157286400,  # ~150 MB
-        'url': 'https://www.youtube.com/watch?v=sample123',
-        'download_path': r'C:\Users\YourName\Downloads\YouTube_Videos'
-    }
-    
-    # Create and show the info window
-    info_window = VideoInfoWindow(root, sample_info)
-    
-    root.mainloop()
+    with tempfile.TemporaryDirectory() as temp_dir, Replay([synthetic_video('replay00001', 'Replayed Video')]):
+        settings = Settings(os.path.join(temp_dir, 'settings.json'))
+        settings.set('download_path', temp_dir)
+        model = YouTubeDownloaderModel(settings)
+        try:
+            url = 'https://www.youtube.com/watch?v=replay00001'
+            result = model.get_video_info(url)
+            assert result.success, result.error_message
+            sample_info = dict(result.info, url=url, download_path=temp_dir)
+            
+            # Create the window and let Tk lay it out once
+            info_window = VideoInfoWindow(root, sample_info, model.thumbnails)
+            root.update()
+            assert 'Replayed Video' in info_window.info_text.get('1.0', tk.END)
+            info_window.close_window()
+        finally:
+            model.shutdown()
+            root.destroy()
+
 
 if __name__ == "__main__":
     test_info_window()
+    print("All info window tests passed!")
@@ -0,0 +1,142 @@
+"""
+Test the download job queue
+"""
+
+import sys
+import os
+import threading
+import time
+
+# Add src directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from core.jobs import DownloadJob, DownloadQueue
+from core.results import DownloadResult, ErrorCategory, ResultError
+from utils.config import Config
+
+
+def _wait_for(condition, timeout: float = 5.0) -> bool:
+    """Poll until condition() is true or the timeout expires"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_queue_runs_jobs_with_bounded_concurrency():
+    """Never more than max_workers jobs run at once and all of them finish"""
+    lock = threading.Lock()
+    running = [0]
+    peak = [0]
+    
+    def run_job(job):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+        if job.url.endswith('bad'):
+            return DownloadResult.failure(ResultError.create(ErrorCategory.UNAVAILABLE, 'Download failed: bad'))
+        return DownloadResult(True, 'done')
+    
+    updates = []
+    queue = DownloadQueue(run_job, max_workers=2, on_update=lambda job: updates.append(job.id))
+    jobs = queue.add_many([{'url': f'https://youtu.be/{index}'} for index in range(9)])
+    jobs.append(queue.add('https://youtu.be/bad'))
+    
+    assert _wait_for(lambda: all(job.finished for job in jobs))
+    queue.stop()
+    
+    assert peak[0] <= 2
+    assert [job.status for job in jobs[:-1]] == [DownloadJob.COMPLETED] * 9
+    assert jobs[-1].status == DownloadJob.FAILED
+    assert jobs[-1].message == 'Download failed: bad'
+    assert len(updates) >= 3 * len(jobs)
+
+
+def test_cancel_pending_job():
+    """Queued jobs can be cancelled before a worker picks them up"""
+    release = threading.Event()
+    queue = DownloadQueue(lambda job: release.wait(5) and DownloadResult(True), max_workers=1)
+    first = queue.add('https://youtu.be/first')
+    second = queue.add('https://youtu.be/second')
+    
+    assert _wait_for(lambda: first.status == DownloadJob.DOWNLOADING)
+    assert queue.cancel(second.id)
+    assert not queue.cancel(first.id)
+    release.set()
+    
+    assert _wait_for(lambda: first.finished)
+    queue.stop()
+    assert second.status == DownloadJob.CANCELLED
+    assert queue.pending_count() == 0
+
+
+def test_retryable_failures_are_requeued():
+    """Network errors are retried with a backoff; other failures are final"""
+    original_delay = Config.RETRY_DELAY_SECONDS
+    Config.RETRY_DELAY_SECONDS = 0.01
+    try:
+        calls = {}
+        
+        def run_job(job):
+            calls[job.url] = calls.get(job.url, 0) + 1
+            if job.url.endswith('flaky') and calls[job.url] < 3:
+                return DownloadResult.failure(ResultError.create(ErrorCategory.NETWORK, 'Connection reset'))
+            if job.url.endswith('gone'):
+                return DownloadResult.failure(ResultError.create(ErrorCategory.UNAVAILABLE, 'Private video'))
+            return DownloadResult(True, 'done')
+        
+        queue = DownloadQueue(run_job, max_workers=2)
+        flaky = queue.add('https://youtu.be/flaky')
+        gone = queue.add('https://youtu.be/gone')
+        
+        assert _wait_for(lambda: flaky.finished and gone.finished)
+        queue.stop()
+        assert flaky.status == DownloadJob.COMPLETED and flaky.attempts == 2
+        assert gone.status == DownloadJob.FAILED and calls[gone.url] == 1
+    finally:
+        Config.RETRY_DELAY_SECONDS = original_delay
+
+
+def test_limit_can_change_while_running():
+    """set_limit raises and lowers the number of jobs running at once"""
+    lock = threading.Lock()
+    running = [0]
+    peaks = []
+    release = threading.Event()
+    
+    def run_job(job):
+        with lock:
+            running[0] += 1
+            peaks.append(running[0])
+        release.wait(5)
+        with lock:
+            running[0] -= 1
+        return DownloadResult(True, 'done')
+    
+    queue = DownloadQueue(run_job, max_workers=1)
+    jobs = queue.add_many([{'url': f'https://youtu.be/{index}'} for index in range(6)])
+    assert _wait_for(lambda: running[0] == 1)
+    queue.set_limit(3)
+    assert _wait_for(lambda: running[0] == 3)
+    
+    queue.set_limit(1)
+    release.set()
+    assert _wait_for(lambda: all(job.finished for job in jobs))
+    queue.stop()
+    assert max(peaks) == 3 and peaks[-1] == 1
+
+
+if __name__ == "__main__":
+    test_queue_runs_jobs_with_bounded_concurrency()
+    test_cancel_pending_job()
+    test_retryable_failures_are_requeued()
+    test_limit_can_change_while_running()
+    print("Job queue tests passed!")
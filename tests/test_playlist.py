@@ -0,0 +1,127 @@
+"""
+Test lazy playlist enumeration
+Feeds the model a generator of entries so no network access is needed
+"""
+
+import sys
+import os
+
+# Add src directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from core import extraction
+from core.extraction import ExtractionPool, compact_entry
+from core.model import YouTubeDownloaderModel
+from utils.config import Config
+
+
+_real_extract_unprocessed = extraction.extract_unprocessed
+
+
+class CountingEntries:
+    """Entry generator that records how many entries were produced"""
+    
+    def __init__(self, total: int):
+        self.total = total
+        self.produced = 0
+    
+    def __iter__(self):
+        for index in range(self.total):
+            self.produced += 1
+            yield {'id': f'vid{index:05d}', 'title': f'Video {index}', 'url': f'vid{index:05d}'}
+
+
+def _model_with_playlist(entries: CountingEntries) -> YouTubeDownloaderModel:
+    """Create a model whose extractor returns a playlist backed by entries"""
+    extraction.extract_unprocessed = lambda ydl, url: {'_type': 'playlist', 'title': 'Big Channel', 'entries': iter(entries)}
+    return YouTubeDownloaderModel()
+
+
+def teardown_function(function):
+    """Restore the real extractor after each test"""
+    extraction.extract_unprocessed = _real_extract_unprocessed
+
+
+def test_summary_reads_only_first_page():
+    """get_video_info on a huge playlist stops after the first page"""
+    entries = CountingEntries(20000)
+    model = _model_with_playlist(entries)
+    
+    result = model.get_video_info("https://www.youtube.com/playlist?list=PLtest")
+    info = result.info
+    
+    assert result.success
+    assert info['is_playlist']
+    assert entries.produced == Config.PLAYLIST_PAGE_SIZE
+    assert info['playlist_count'] == Config.PLAYLIST_PAGE_SIZE
+    assert info['playlist_count_is_estimate']
+    assert f"{Config.PLAYLIST_PAGE_SIZE}+ videos" in info['description']
+    assert info['first_video_url'] == "https://www.youtube.com/watch?v=vid00000"
+
+
+def test_iter_playlist_pages_lazily():
+    """Pages are produced on demand, one at a time"""
+    entries = CountingEntries(25)
+    model = _model_with_playlist(entries)
+    
+    pages = model.iter_playlist("https://www.youtube.com/playlist?list=PLtest", page_size=10)
+    first = next(pages)
+    assert len(first) == 10
+    assert entries.produced == 10
+    
+    remaining = list(pages)
+    assert [len(page) for page in remaining] == [10, 5]
+    assert remaining[-1][-1]['id'] == 'vid00024'
+
+
+def test_channel_root_lists_videos_of_every_tab():
+    """A channel's root URL yields the videos inside its tabs, never the tabs themselves"""
+    tabs = [
+        {'_type': 'playlist', 'id': 'UCexample', 'title': 'Example - Videos', 'entries': iter(CountingEntries(3))},
+        {'_type': 'playlist', 'id': 'UCexample', 'title': 'Example - Shorts',
+         'entries': iter([{'id': 'short00001', 'title': 'Short', 'url': 'https://www.youtube.com/shorts/short00001'}])}
+    ]
+    extraction.extract_unprocessed = lambda ydl, url: {'_type': 'playlist', 'id': 'UCexample', 'entries': iter(tabs)}
+    model = YouTubeDownloaderModel()
+    
+    pages = list(model.iter_playlist("https://www.youtube.com/@example", page_size=10))
+    assert [entry['id'] for entry in pages[0]] == ['vid00000', 'vid00001', 'vid00002', 'short00001']
+    assert pages[0][-1]['url'] == 'https://www.youtube.com/shorts/short00001'
+
+
+def test_extraction_pool_returns_results():
+    """Functions submitted to the warm worker pool run in another process"""
+    pool = ExtractionPool(max_workers=1)
+    try:
+        entry = pool.run(compact_entry, {'id': 'abc', 'title': 'Pooled'})
+    finally:
+        pool.shutdown()
+    
+    assert entry == {'id': 'abc', 'title': 'Pooled', 'duration': 0, 'url': 'https://www.youtube.com/watch?v=abc'}
+
+
+def test_video_links_inside_a_list_are_single_videos():
+    """A shared watch?v=...&list=... link is the video unless the whole list is asked for"""
+    model = _model_with_playlist(CountingEntries(0))
+    mix = "https://www.youtube.com/watch?v=dQw4w9WgXcQ&list=RDdQw4w9WgXcQ"
+    
+    assert not model.is_playlist_url(mix)
+    assert model.is_playlist_url(mix, with_video=True)
+    assert model.is_playlist_url("https://www.youtube.com/playlist?list=PLtest")
+    assert model.is_playlist_url("https://www.youtube.com/@channel")
+    assert not model.is_playlist_url("https://youtu.be/dQw4w9WgXcQ")
+
+
+if __name__ == "__main__":
+    test_summary_reads_only_first_page()
+    teardown_function(None)
+    test_iter_playlist_pages_lazily()
+    teardown_function(None)
+    test_channel_root_lists_videos_of_every_tab()
+    teardown_function(None)
+    test_extraction_pool_returns_results()
+    test_video_links_inside_a_list_are_single_videos()
+    print("Playlist tests passed!")
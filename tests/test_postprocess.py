@@ -0,0 +1,156 @@
+"""
+Test the post-processing pipeline
+Uses a stand-in ffmpeg script so no real media tools are required
+"""
+
+import sys
+import os
+import stat
+import tempfile
+import threading
+import time
+from concurrent.futures.process import EXTRA_QUEUED_CALLS
+
+# Add src directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from core.postprocess import PostProcessor, run_postprocess_job
+from utils.config import Config
+
+
+FAKE_FFMPEG = """#!/bin/sh
+# Write the concatenated inputs to the output path (last argument)
+out=""
+for arg in "$@"; do out="$arg"; done
+: > "$out"
+prev=""
+for arg in "$@"; do
+    if [ "$prev" = "-i" ]; then cat "$arg" >> "$out"; fi
+    prev="$arg"
+done
+"""
+
+# Signals that it started, then holds its worker process until the release file exists
+BLOCKING_FFMPEG = """#!/bin/sh
+: > "{started}"
+while [ ! -e "{release}" ]; do sleep 0.01; done
+out=""
+for arg in "$@"; do out="$arg"; done
+: > "$out"
+"""
+
+
+def _make_fake_ffmpeg(directory: str, script: str = FAKE_FFMPEG) -> str:
+    """Create an executable ffmpeg stand-in"""
+    path = os.path.join(directory, 'ffmpeg')
+    with open(path, 'w') as fh:
+        fh.write(script)
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    return path
+
+
+def _wait_for(condition, timeout: float = 30):
+    """Poll until condition() holds"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out waiting for the post-processing pool"
+        time.sleep(0.01)
+
+
+def test_missing_files_reports_error():
+    """A job without files fails cleanly instead of raising"""
+    result = run_postprocess_job({'files': [], 'steps': {'merge': True}})
+    assert result['success'] is False
+    assert 'No downloaded files' in result['error']
+
+
+def test_merge_runs_in_process_pool():
+    """Merging two streams produces one output and removes the inputs"""
+    if os.name == 'nt':
+        return
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        original_ffmpeg = Config.FFMPEG_PATH
+        Config.FFMPEG_PATH = _make_fake_ffmpeg(temp_dir)
+        try:
+            video = os.path.join(temp_dir, 'clip.f137.mp4')
+            audio = os.path.join(temp_dir, 'clip.f140.m4a')
+            with open(video, 'w') as fh:
+                fh.write('video')
+            with open(audio, 'w') as fh:
+                fh.write('audio')
+            
+            processor = PostProcessor(max_workers=1)
+            future = processor.submit({
+                'files': [video, audio],
+                'output_path': os.path.join(temp_dir, 'clip.mp4'),
+                'steps': {'merge': True}
+            })
+            result = future.result(timeout=30)
+            processor.shutdown()
+        finally:
+            Config.FFMPEG_PATH = original_ffmpeg
+        
+        assert result['success'], result.get('error')
+        with open(result['filepath']) as fh:
+            assert fh.read() == 'videoaudio'
+        assert not os.path.exists(video)
+        assert not os.path.exists(audio)
+
+
+def test_shutdown_cancels_queued_jobs():
+    """Shutting down drops jobs that have not started and waits only for the running ones"""
+    if os.name == 'nt':
+        return
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        started = os.path.join(temp_dir, 'started')
+        release = os.path.join(temp_dir, 'release')
+        original_ffmpeg = Config.FFMPEG_PATH
+        Config.FFMPEG_PATH = _make_fake_ffmpeg(temp_dir, BLOCKING_FFMPEG.format(started=started, release=release))
+        try:
+            inputs = []
+            for name in ('clip.f137.mp4', 'clip.f140.m4a'):
+                inputs.append(os.path.join(temp_dir, name))
+                open(inputs[-1], 'w').close()
+            
+            processor = PostProcessor(max_workers=1)
+            blocked = processor.submit({'files': inputs, 'output_path': os.path.join(temp_dir, 'clip.mp4'),
+                                        'steps': {'merge': True}})
+            _wait_for(lambda: os.path.exists(started))
+            futures = [processor.submit({'files': [], 'steps': {'merge': True}}) for _ in range(20)]
+            
+            # The running job plus the max_workers + EXTRA_QUEUED_CALLS queued for the processes cannot be cancelled
+            handed_out = 2 * processor.max_workers + EXTRA_QUEUED_CALLS
+            _wait_for(lambda: sum(1 for future in [blocked] + futures if future.running()) == handed_out)
+            
+            def release_when_cancelled():
+                try:
+                    _wait_for(lambda: sum(1 for future in futures if future.cancelled()) == len(futures) + 1 - handed_out)
+                finally:
+                    open(release, 'w').close()
+            
+            releaser = threading.Thread(target=release_when_cancelled, daemon=True)
+            releaser.start()
+            cancelled = processor.shutdown(wait=True, cancel_pending=True)
+            releaser.join(timeout=30)
+        finally:
+            open(release, 'w').close()  # Never leave the worker process blocked
+            Config.FFMPEG_PATH = original_ffmpeg
+        
+        assert cancelled == len(futures) + 1 - handed_out
+        assert blocked.result()['success'], blocked.result().get('error')
+        assert all(future.done() for future in futures)
+        for future in futures:
+            if not future.cancelled():
+                assert future.result()['success'] is False
+
+
+if __name__ == "__main__":
+    test_missing_files_reports_error()
+    test_merge_runs_in_process_pool()
+    test_shutdown_cancels_queued_jobs()
+    print("Post-processing tests passed!")
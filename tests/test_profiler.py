@@ -0,0 +1,69 @@
+"""
+Test the opt-in profiling hooks
+"""
+
+import sys
+import os
+import tempfile
+import time
+
+# Add src directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from utils.config import Config
+from utils.profiler import profile_job, sample_thread
+
+
+def _busy(seconds: float):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        sum(range(1000))
+
+
+def test_job_profiles_are_written_inside_the_sampled_main_loop():
+    """Sampling the UI thread leaves cProfile free for the jobs"""
+    previous = os.environ.get(Config.PROFILE_ENV_VAR)
+    os.environ[Config.PROFILE_ENV_VAR] = '1'
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with sample_thread('mainloop', temp_dir, interval=0.005) as summary_path:
+                with profile_job('download', temp_dir) as job_path:
+                    _busy(0.2)
+            
+            assert job_path is not None and os.path.exists(job_path)
+            assert os.path.exists(os.path.splitext(job_path)[0] + '.txt')
+            with open(summary_path, 'r', encoding='utf-8') as fh:
+                summary = fh.read()
+            assert 'samples every 5 ms' in summary
+            assert '(_busy)' in summary
+    finally:
+        if previous is None:
+            os.environ.pop(Config.PROFILE_ENV_VAR, None)
+        else:
+            os.environ[Config.PROFILE_ENV_VAR] = previous
+
+
+def test_disabled_profiling_writes_nothing():
+    """Without the switch both hooks are no-ops"""
+    previous = os.environ.get(Config.PROFILE_ENV_VAR)
+    os.environ[Config.PROFILE_ENV_VAR] = '0'
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with sample_thread('mainloop', temp_dir) as summary_path, profile_job('download', temp_dir) as job_path:
+                pass
+            assert summary_path is None and job_path is None
+            assert os.listdir(temp_dir) == []
+    finally:
+        if previous is None:
+            os.environ.pop(Config.PROFILE_ENV_VAR, None)
+        else:
+            os.environ[Config.PROFILE_ENV_VAR] = previous
+
+
+if __name__ == "__main__":
+    test_job_profiles_are_written_inside_the_sampled_main_loop()
+    test_disabled_profiling_writes_nothing()
+    print("All profiler tests passed!")
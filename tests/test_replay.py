@@ -0,0 +1,99 @@
+"""
+Test the record/replay harness for extractor responses
+"""
+
+import sys
+import os
+import tempfile
+import urllib.error
+import urllib.request
+
+# Add src directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+if current_dir not in sys.path:
+    sys.path.append(current_dir)  # For the replay harness (tests/replay.py)
+
+import yt_dlp
+from yt_dlp.utils import DownloadError
+
+from replay import Capture, HeadlessView, Replay, load_captures, synthetic_video
+
+
+def _fetch(url: str, headers: dict = None) -> bytes:
+    with urllib.request.urlopen(urllib.request.Request(url, headers=headers or {}), timeout=5) as response:
+        return response.read()
+
+
+def test_capture_round_trip():
+    """Saved captures load back with their info and media"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        original = synthetic_video('replay00001', media_size=10_000)
+        folder = original.save(temp_dir)
+        assert os.path.basename(folder) == 'replay00001'
+        
+        [loaded] = load_captures(temp_dir)
+        assert loaded.url == original.url
+        assert loaded.info == original.info
+        assert loaded.media == original.media
+        assert load_captures(os.path.join(temp_dir, 'missing')) == []
+
+
+def test_extractions_are_answered_offline():
+    """Any URL form of a captured video is answered; media is served, everything else fails"""
+    item = synthetic_video('replay00001', media_size=100_000)
+    original_extract = yt_dlp.YoutubeDL.extract_info
+    with Replay([item]) as replay:
+        with yt_dlp.YoutubeDL({'quiet': True, 'format': '18'}) as ydl:
+            info = ydl.extract_info('https://youtu.be/replay00001', download=False)
+        assert info['format_id'] == '18'
+        assert info['url'].startswith('http://127.0.0.1:')
+        
+        expected = item.media['https://media.invalid/replay00001/18.mp4']
+        assert _fetch(info['url']) == expected
+        assert _fetch(info['url'], {'Range': 'bytes=100-199'}) == expected[100:200]
+        
+        # Media that was not captured answers 404 rather than going online
+        item.info['formats'][0]['url'] = 'https://media.invalid/not-captured.m4a'
+        replay.add(Capture('https://www.youtube.com/watch?v=replay00002', dict(item.info, id='replay00002')))
+        missing = replay.lookup('https://www.youtube.com/watch?v=replay00002')['formats'][0]['url']
+        try:
+            _fetch(missing)
+            assert False, "Uncaptured media should not be served"
+        except urllib.error.HTTPError as e:
+            assert e.code == 404
+        
+        try:
+            replay.lookup('https://www.youtube.com/watch?v=notcaptured')
+            assert False, "Uncaptured URL should fail"
+        except DownloadError as e:
+            assert 'No capture' in str(e)
+        
+        assert replay.extractions['replay00001'] == 1
+        assert replay.server.requests == 3
+    assert yt_dlp.YoutubeDL.extract_info is original_extract
+
+
+def test_headless_view_records_calls():
+    """Posted updates run at once and are recorded by name"""
+    view = HeadlessView()
+    view.post(view.show_busy, "Working...")
+    view.post_latest('progress', view.update_progress, '50%', '1MiB/s')
+    view.mark_job_dirty(3)
+    assert view.calls == [('show_busy', ('Working...',)), ('update_progress', ('50%', '1MiB/s')),
+                          ('mark_job_dirty', (3,))]
+    assert view.named('show_busy') == [('Working...',)]
+    try:
+        view.run()
+        assert False, "Only view updates are stood in for"
+    except AttributeError:
+        pass
+
+
+if __name__ == "__main__":
+    test_capture_round_trip()
+    test_extractions_are_answered_offline()
+    test_headless_view_records_calls()
+    print("All replay tests passed!")
@@ -0,0 +1,90 @@
+"""
+Test result types and error classification
+"""
+
+import sys
+import os
+import tempfile
+
+# Add src directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+if current_dir not in sys.path:
+    sys.path.append(current_dir)  # For the replay harness (tests/replay.py)
+
+from yt_dlp.utils import DownloadError
+
+from core import extraction
+from core.model import YouTubeDownloaderModel
+from core.results import DownloadResult, ErrorCategory, ResultError, classify_exception
+from replay import Replay
+from utils.settings import Settings
+
+
+def test_classify_exception():
+    """Errors are classified by type, through yt-dlp's wrapping, and by message"""
+    wrapped = DownloadError('ERROR: timed out', exc_info=(TimeoutError, TimeoutError('read'), None))
+    assert classify_exception(wrapped) == ErrorCategory.NETWORK
+    assert classify_exception(Exception('HTTP Error 429: Too Many Requests')) == ErrorCategory.RATE_LIMITED
+    assert classify_exception(Exception('ERROR: Private video')) == ErrorCategory.UNAVAILABLE
+    assert classify_exception(PermissionError(13, 'denied')) == ErrorCategory.FILESYSTEM
+    assert classify_exception(ValueError('odd')) == ErrorCategory.UNKNOWN
+
+
+def test_result_retryability():
+    """Only network and rate-limit failures are worth retrying"""
+    assert DownloadResult.failure(ResultError.create(ErrorCategory.NETWORK, 'reset')).retryable
+    assert not DownloadResult.failure(ResultError.create(ErrorCategory.UNAVAILABLE, 'gone')).retryable
+    
+    result = DownloadResult(True, 'done')
+    assert not result.retryable and result.error_message == ''
+
+
+def test_invalid_url_result():
+    """The model reports invalid URLs as a typed failure without any request"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        settings = Settings(os.path.join(temp_dir, 'settings.json'))
+        settings.set('download_path', os.path.join(temp_dir, 'Downloads'))
+        model = YouTubeDownloaderModel(settings)
+        try:
+            result = model.download_video('https://example.com/not-youtube')
+            assert not result.success and not result.retryable
+            assert result.error.category == ErrorCategory.INVALID_URL
+        finally:
+            model.shutdown()
+
+
+
+def test_lookup_failures_are_typed_results():
+    """A failed probe or format listing comes back as a result with a categorised error"""
+    real_extract = extraction.extract_unprocessed
+    
+    def private_video(ydl, url):
+        raise DownloadError('ERROR: [youtube] abc: Private video')
+    
+    with tempfile.TemporaryDirectory() as temp_dir, Replay([]):
+        settings = Settings(os.path.join(temp_dir, 'settings.json'))
+        settings.set('download_path', os.path.join(temp_dir, 'Downloads'))
+        model = YouTubeDownloaderModel(settings)
+        extraction.extract_unprocessed = private_video
+        try:
+            result = model.download_video('https://www.youtube.com/watch?v=abc')
+            assert not result.success and result.error.category == ErrorCategory.UNAVAILABLE
+            assert 'Private video' in result.error_message
+            
+            formats = model.get_available_formats('https://www.youtube.com/watch?v=abc')
+            assert not formats.success and formats.formats == []
+            assert formats.error_message.startswith('Error getting formats: ')
+        finally:
+            extraction.extract_unprocessed = real_extract
+            model.shutdown()
+
+
+if __name__ == "__main__":
+    test_classify_exception()
+    test_result_retryability()
+    test_invalid_url_result()
+    test_lookup_failures_are_typed_results()
+    print("All result tests passed!")
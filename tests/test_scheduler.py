@@ -0,0 +1,163 @@
+"""
+Test the per-host request scheduler
+"""
+
+import sys
+import os
+import tempfile
+import threading
+import time
+import urllib.error
+
+# Add src directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+if current_dir not in sys.path:
+    sys.path.append(current_dir)  # For the replay harness (tests/replay.py)
+
+from core import scheduler as scheduler_module
+from core.model import YouTubeDownloaderModel
+from core.scheduler import RequestScheduler, host_key, is_rate_limited
+from core.subscriptions import iter_feed
+from replay import Replay, synthetic_playlist, synthetic_video
+from utils.config import Config
+from utils.settings import Settings
+
+
+URL = 'https://www.youtube.com/watch?v=abc'
+
+
+def _http_error(code: int) -> urllib.error.HTTPError:
+    return urllib.error.HTTPError(URL, code, 'error', {}, None)
+
+
+def test_host_key_and_rate_limit_detection():
+    """Hosts of one site share a key; 429 is recognised even when wrapped, 403 is not throttling"""
+    assert host_key('https://m.youtube.com/watch?v=a') == host_key('https://youtu.be/a') == 'youtube.com'
+    assert is_rate_limited(_http_error(429))
+    assert is_rate_limited(RuntimeError('ERROR: [youtube] abc: HTTP Error 429: Too Many Requests'))
+    try:
+        try:
+            raise _http_error(429)
+        except urllib.error.HTTPError as e:
+            raise RuntimeError('Download failed') from e
+    except RuntimeError as wrapped:
+        assert is_rate_limited(wrapped)
+    assert not is_rate_limited(_http_error(404))
+    assert not is_rate_limited(_http_error(403))
+    assert not is_rate_limited(RuntimeError('ERROR: [youtube] abc: HTTP Error 403: Forbidden'))
+
+
+def test_throttling_lowers_limit_and_retries():
+    """A 429 halves the limit, the call is retried after a backoff and then succeeds"""
+    originals = Config.SCHEDULER_BACKOFF_SECONDS, Config.SCHEDULER_MIN_INTERVAL
+    Config.SCHEDULER_BACKOFF_SECONDS, Config.SCHEDULER_MIN_INTERVAL = 0.01, 0.01
+    try:
+        scheduler = RequestScheduler()
+        calls = []
+        
+        def flaky():
+            calls.append(time.monotonic())
+            if len(calls) < 3:
+                raise _http_error(429)
+            return 'info'
+        
+        assert scheduler.run(URL, flaky) == 'info'
+        assert len(calls) == 3
+        assert scheduler.stats(URL)['limit'] == 1
+        
+        try:
+            scheduler.run(URL, lambda: (_ for _ in ()).throw(_http_error(404)))
+        except urllib.error.HTTPError:
+            pass
+        else:
+            raise AssertionError("Other errors must not be retried")
+    finally:
+        Config.SCHEDULER_BACKOFF_SECONDS, Config.SCHEDULER_MIN_INTERVAL = originals
+
+
+def test_limit_and_round_robin_fairness():
+    """Never more than the limit in flight; waiting sources take turns"""
+    originals = Config.SCHEDULER_START_CONCURRENCY, Config.SCHEDULER_MAX_CONCURRENCY
+    Config.SCHEDULER_START_CONCURRENCY = Config.SCHEDULER_MAX_CONCURRENCY = 1
+    try:
+        scheduler = RequestScheduler()
+        gate = threading.Event()
+        order = []
+        
+        def blocker():
+            gate.wait(5)
+        
+        def record(name):
+            order.append(name)
+        
+        first = threading.Thread(target=scheduler.run, args=(URL, blocker))
+        first.start()
+        while scheduler.stats(URL)['active'] == 0:
+            time.sleep(0.001)
+        
+        threads = []
+        for name in ['batch1', 'batch2', 'batch3', 'single']:
+            source = 'single' if name == 'single' else 'batch'
+            thread = threading.Thread(target=scheduler.run, args=(URL, record, name), kwargs={'source': source})
+            thread.start()
+            threads.append(thread)
+            while scheduler.stats(URL)['waiting'] < len(threads):
+                time.sleep(0.001)
+        
+        gate.set()
+        for thread in [first] + threads:
+            thread.join(5)
+        
+        assert order == ['batch1', 'single', 'batch2', 'batch3']
+    finally:
+        Config.SCHEDULER_START_CONCURRENCY, Config.SCHEDULER_MAX_CONCURRENCY = originals
+
+
+class RecordingScheduler(RequestScheduler):
+    """Scheduler that remembers which callers went through it"""
+    
+    def __init__(self):
+        super().__init__()
+        self.sources = []
+    
+    def run(self, url: str, func, *args, source: str = 'default'):
+        self.sources.append(source)
+        return super().run(url, func, *args, source=source)
+
+
+def test_extractions_go_through_the_scheduler():
+    """Playlist pages, subscription feeds, the download probe and native extraction are all scheduled"""
+    recorder = RecordingScheduler()
+    original = scheduler_module._scheduler
+    scheduler_module._scheduler = recorder
+    captures = [synthetic_video('sched000001'), synthetic_playlist('PLsched', ['sched000001'])]
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir, Replay(captures):
+            settings = Settings(os.path.join(temp_dir, 'settings.json'))
+            settings.set('download_path', temp_dir)
+            settings.set('verify_downloads', False)
+            model = YouTubeDownloaderModel(settings)
+            try:
+                playlist = 'https://www.youtube.com/playlist?list=PLsched'
+                assert [entry['id'] for page in model.iter_playlist(playlist) for entry in page] == ['sched000001']
+                assert [entry['id'] for entry in iter_feed(playlist)] == ['sched000001']
+                result = model.download_video('https://www.youtube.com/watch?v=sched000001', backend='native')
+                assert result.success, result.error_message
+            finally:
+                model.shutdown()
+    finally:
+        scheduler_module._scheduler = original
+    
+    assert recorder.sources == ['playlist', 'subscriptions', 'download']  # The backend reuses the probe
+
+
+if __name__ == "__main__":
+    print("Testing request scheduler...")
+    test_host_key_and_rate_limit_detection()
+    test_throttling_lowers_limit_and_retries()
+    test_limit_and_round_robin_fairness()
+    test_extractions_go_through_the_scheduler()
+    print("✅ Scheduler tests passed!")
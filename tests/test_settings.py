@@ -0,0 +1,69 @@
+"""
+Test the persistent settings store
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# Add src directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from utils.config import Config
+from utils.settings import Settings
+
+
+def test_defaults_come_from_config():
+    """Unset values fall back to Config without being written to disk"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        settings = Settings(os.path.join(temp_dir, 'settings.json')).load()
+        
+        assert settings.get('max_concurrent_downloads') == Config.MAX_CONCURRENT_DOWNLOADS
+        assert settings.get('download_path') == Config.DEFAULT_DOWNLOAD_PATH
+        assert not os.path.exists(settings.path)
+
+
+def test_round_trip_and_validation():
+    """Saved values survive a reload and invalid ones are rejected"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'nested', 'settings.json')
+        settings = Settings(path)
+        settings.update(download_path=temp_dir, max_concurrent_downloads=6, rate_limit=2_000_000)
+        settings.save()
+        
+        reloaded = Settings(path).load()
+        assert reloaded.get('download_path') == temp_dir
+        assert reloaded.get('max_concurrent_downloads') == 6
+        assert reloaded.get('rate_limit') == 2_000_000
+        assert os.listdir(os.path.dirname(path)) == ['settings.json']
+        
+        for name, value in (('max_concurrent_downloads', 0), ('max_concurrent_downloads', True),
+                            ('rate_limit', '1M'), ('no_such_setting', 1)):
+            try:
+                settings.set(name, value)
+            except ValueError:
+                continue
+            raise AssertionError(f"{name}={value!r} should be rejected")
+
+
+def test_invalid_file_entries_are_ignored():
+    """A hand-edited file with bad values still loads the good ones"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'settings.json')
+        with open(path, 'w') as fh:
+            json.dump({'version': 1, 'settings': {'rate_limit': -5, 'format': 'best', 'bogus': 1}}, fh)
+        
+        settings = Settings(path).load()
+        assert settings.get('format') == 'best'
+        assert settings.get('rate_limit') == 0
+
+
+if __name__ == "__main__":
+    test_defaults_come_from_config()
+    test_round_trip_and_validation()
+    test_invalid_file_entries_are_ignored()
+    print("Settings tests passed!")
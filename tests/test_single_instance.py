@@ -0,0 +1,78 @@
+"""
+Test the single-instance lock and URL handoff
+"""
+
+import sys
+import os
+import json
+import socket
+import tempfile
+import threading
+
+# Add src directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from utils.single_instance import SingleInstance
+
+
+def _instance(temp_dir: str) -> SingleInstance:
+    return SingleInstance(os.path.join(temp_dir, 'instance.lock'), os.path.join(temp_dir, 'instance.json'))
+
+
+def test_second_launch_hands_off_urls():
+    """Only one instance holds the lock; a second one passes its URLs over"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        first = _instance(temp_dir)
+        second = _instance(temp_dir)
+        try:
+            assert first.acquire()
+            assert not second.acquire()
+            
+            # URLs arriving before the app is ready are kept until it is
+            assert second.hand_off(['https://youtu.be/early'], timeout=5)
+            received = []
+            done = threading.Event()
+            
+            def handler(urls):
+                received.append(urls)
+                if len(received) == 2:
+                    done.set()
+            
+            first.set_handler(handler)
+            assert second.hand_off(['https://youtu.be/a', 'https://youtu.be/b'], timeout=5)
+            assert done.wait(5)
+            assert received == [['https://youtu.be/early'], ['https://youtu.be/a', 'https://youtu.be/b']]
+        finally:
+            first.release()
+        
+        # The lock is free again and a dead instance's port is not reused
+        assert not second.hand_off(['https://youtu.be/late'], timeout=0)
+        assert second.acquire()
+        second.release()
+
+
+def test_handoff_needs_the_token():
+    """Messages without the token from the info file are ignored"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        instance = _instance(temp_dir)
+        received = []
+        try:
+            assert instance.acquire()
+            instance.set_handler(received.append)
+            with open(instance.info_path, 'r', encoding='utf-8') as fh:
+                port = json.load(fh)['port']
+            with socket.create_connection(('127.0.0.1', port), timeout=2) as conn:
+                conn.sendall(json.dumps({'token': 'wrong', 'urls': ['https://youtu.be/x']}).encode('utf-8') + b'\n')
+                assert conn.recv(16) == b''
+        finally:
+            instance.release()
+        assert received == []
+
+
+if __name__ == "__main__":
+    test_second_launch_hands_off_urls()
+    test_handoff_needs_the_token()
+    print("All single-instance tests passed!")
@@ -5,13 +5,17 @@ Test the splash screen functionality
 import sys
 import os
 
-# Add current directory to Python path
+import pytest
+
+# Add src directory to Python path
 current_dir = os.path.dirname(os.path.abspath(__file__))
-if current_dir not in sys.path:
-    sys.path.insert(0, current_dir)
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
 
-from splash import show_splash_screen
+from ui.splash import show_splash_screen
 
+@pytest.mark.skipif(not os.environ.get('DISPLAY'), reason="No display available for the splash screen")
 def test_splash():
     """Test the splash screen with shorter duration"""
     print("Testing splash screen...")
@@ -0,0 +1,122 @@
+"""
+Test staging folders and atomic publishing of finished downloads
+"""
+
+import sys
+import os
+import tempfile
+from concurrent.futures import Future
+
+# Add src directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+if current_dir not in sys.path:
+    sys.path.append(current_dir)  # For the replay harness (tests/replay.py)
+
+from core.model import YouTubeDownloaderModel
+from core.results import ErrorCategory
+from core.staging import StagingArea
+from replay import Replay, synthetic_video
+from utils.settings import Settings
+
+
+def test_publish_moves_finished_files_only():
+    """Finished files keep their relative folders; partial files never reach the download folder"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        download_path = os.path.join(temp_dir, 'Downloads')
+        os.makedirs(download_path)
+        staging = StagingArea()
+        
+        staged_dir = staging.create(download_path)
+        assert not staged_dir.startswith(download_path + os.sep)
+        os.makedirs(os.path.join(staged_dir, 'Channel'))
+        with open(os.path.join(staged_dir, 'Channel', 'Video.mp4'), 'wb') as fh:
+            fh.write(b'video')
+        with open(os.path.join(staged_dir, 'Other.mp4.part'), 'wb') as fh:
+            fh.write(b'partial')
+        
+        moved = staging.publish(staged_dir, download_path)
+        
+        target = os.path.join(download_path, 'Channel', 'Video.mp4')
+        assert list(moved.values()) == [target]
+        with open(target, 'rb') as fh:
+            assert fh.read() == b'video'
+        assert not os.path.exists(os.path.join(download_path, 'Other.mp4.part'))
+        assert not os.path.exists(staged_dir)
+
+
+def test_publish_when_done_maps_result_paths():
+    """Post-processing results are rewritten to point at the published files"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        download_path = os.path.join(temp_dir, 'Downloads')
+        staging = StagingArea(os.path.join(temp_dir, 'staging'))
+        staged_dir = staging.create(download_path)
+        staged_file = os.path.join(staged_dir, 'Video.mkv')
+        with open(staged_file, 'wb') as fh:
+            fh.write(b'merged')
+        
+        future = Future()
+        published = staging.publish_when_done(future, staged_dir, download_path)
+        assert not published.done()
+        future.set_result({'success': True, 'filepath': staged_file, 'outputs': [staged_file]})
+        
+        result = published.result(timeout=5)
+        assert result['success']
+        assert result['filepath'] == os.path.join(download_path, 'Video.mkv')
+        assert result['outputs'] == [result['filepath']]
+        assert os.path.exists(result['filepath'])
+
+
+def test_cancelled_post_processing_still_publishes_streams():
+    """Jobs dropped at shutdown keep the downloaded streams"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        download_path = os.path.join(temp_dir, 'Downloads')
+        staging = StagingArea(os.path.join(temp_dir, 'staging'))
+        staged_dir = staging.create(download_path)
+        with open(os.path.join(staged_dir, 'Video.f137.mp4'), 'wb') as fh:
+            fh.write(b'video')
+        
+        future = Future()
+        published = staging.publish_when_done(future, staged_dir, download_path)
+        future.cancel()
+        
+        result = published.result(timeout=5)
+        assert not result['success']
+        assert 'cancelled' in result['error']
+        assert os.path.exists(os.path.join(download_path, 'Video.f137.mp4'))
+
+
+
+def test_failed_publish_keeps_the_download():
+    """A download whose files cannot be moved stays in its staging folder"""
+    with tempfile.TemporaryDirectory() as temp_dir, Replay([synthetic_video('staged00001')]):
+        settings = Settings(os.path.join(temp_dir, 'settings.json'))
+        settings.set('download_path', os.path.join(temp_dir, 'Downloads'))
+        settings.set('staging_path', os.path.join(temp_dir, 'staging'))
+        settings.set('staging_enabled', True)
+        settings.set('verify_downloads', False)
+        model = YouTubeDownloaderModel(settings)
+        
+        def fail(staged_dir, download_path):
+            raise OSError('disk full')
+        model.staging.publish = fail
+        try:
+            result = model.download_video('https://www.youtube.com/watch?v=staged00001', backend='native')
+            assert not result.success
+            assert result.error.category == ErrorCategory.FILESYSTEM
+            [staged_dir] = os.listdir(os.path.join(temp_dir, 'staging'))
+            assert os.path.join(temp_dir, 'staging', staged_dir) in result.error_message
+            assert os.listdir(os.path.join(temp_dir, 'staging', staged_dir))
+        finally:
+            model.shutdown()
+
+
+if __name__ == "__main__":
+    print("Testing staging...")
+    test_publish_moves_finished_files_only()
+    test_publish_when_done_maps_result_paths()
+    test_cancelled_post_processing_still_publishes_streams()
+    test_failed_publish_keeps_the_download()
+    print("✅ Staging tests passed!")
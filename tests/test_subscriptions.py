@@ -0,0 +1,120 @@
+"""
+Test subscription polling against the download archive
+"""
+
+import sys
+import os
+import tempfile
+
+# Add src directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from core import extraction
+from core.subscriptions import SubscriptionPoller, SubscriptionStore, feed_url, iter_feed
+from utils.config import Config
+
+
+CHANNEL = 'https://www.youtube.com/@example/videos'
+PLAYLIST = 'https://www.youtube.com/playlist?list=PLexample'
+
+
+class Feed:
+    """Fake feed that counts how many entries were read"""
+    
+    def __init__(self, ids: list):
+        self.ids = ids
+        self.read = 0
+    
+    def __call__(self, url: str):
+        for video_id in self.ids:
+            self.read += 1
+            yield {'id': video_id, 'title': video_id, 'url': f'https://www.youtube.com/watch?v={video_id}'}
+
+
+def test_channel_poll_queues_only_new_uploads():
+    """The first poll only remembers; later polls queue new videos and stop at known ones"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = SubscriptionStore(os.path.join(temp_dir, 'subscriptions.json'))
+        store.add(CHANNEL)
+        feed = Feed([f'old{n}' for n in range(1000)])
+        queued = []
+        poller = SubscriptionPoller(store, lambda: {'new2'}, queued.extend, get_entries=feed)
+        
+        assert poller.poll_once() == 0
+        assert feed.read == Config.SUBSCRIPTION_SEED_ENTRIES  # Only the first page is remembered
+        
+        feed.ids = ['new1', 'new2', 'new3'] + feed.ids
+        feed.read = 0
+        assert poller.poll_once() == 2
+        assert [entry['id'] for entry in queued] == ['new1', 'new3']
+        assert feed.read == 3 + 5  # Stopped after a run of known videos
+        
+        reloaded = SubscriptionStore(store.path).load()
+        assert 'new3' in reloaded.get(CHANNEL)['seen_ids']
+
+
+def test_playlist_is_read_to_the_end():
+    """Playlists add videos at the end, so known entries never stop the scan"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = SubscriptionStore(os.path.join(temp_dir, 'subscriptions.json'))
+        store.add(PLAYLIST)
+        feed = Feed([f'item{n}' for n in range(20)])
+        queued = []
+        poller = SubscriptionPoller(store, set, queued.extend, get_entries=feed)
+        poller.poll_once()
+        
+        feed.ids = feed.ids + ['item20']
+        assert poller.poll_once() == 1
+        assert queued[0]['id'] == 'item20'
+
+
+def test_channel_remembers_only_recent_ids():
+    """Seen IDs of a channel are capped to the most recent ones; playlists keep them all"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = SubscriptionStore(os.path.join(temp_dir, 'subscriptions.json'))
+        store.add(CHANNEL)
+        store.add(PLAYLIST)
+        ids = [f'video{n}' for n in range(Config.SUBSCRIPTION_MAX_SEEN_IDS + 10)]
+        for url in (CHANNEL, PLAYLIST):
+            store.mark_checked(url, ids[:20])
+            store.mark_checked(url, ids[20:])
+        
+        assert store.get(CHANNEL)['seen_ids'] == ids[-Config.SUBSCRIPTION_MAX_SEEN_IDS:]
+        assert store.get(PLAYLIST)['seen_ids'] == ids
+
+
+
+def test_channel_root_is_polled_through_its_videos_tab():
+    """A root channel URL polls the Videos tab; tab playlists are never taken for videos"""
+    assert feed_url('https://www.youtube.com/@example') == 'https://www.youtube.com/@example/videos'
+    assert feed_url('https://www.youtube.com/channel/UCexample') == 'https://www.youtube.com/channel/UCexample/videos'
+    assert feed_url(CHANNEL) == CHANNEL
+    assert feed_url(PLAYLIST) == PLAYLIST
+    
+    requested = []
+    
+    def extract(ydl, url):
+        requested.append(url)
+        tab = {'_type': 'playlist', 'id': 'UCexample', 'entries': iter([{'id': 'upload00001', 'title': 'Upload'}])}
+        return {'_type': 'playlist', 'id': 'UCexample', 'entries': iter([tab])}
+    
+    original = extraction.extract_unprocessed
+    extraction.extract_unprocessed = extract
+    try:
+        entries = list(iter_feed('https://www.youtube.com/@example'))
+    finally:
+        extraction.extract_unprocessed = original
+    assert requested == ['https://www.youtube.com/@example/videos']
+    assert [entry['id'] for entry in entries] == ['upload00001']
+
+
+if __name__ == "__main__":
+    print("Testing subscriptions...")
+    test_channel_poll_queues_only_new_uploads()
+    test_playlist_is_read_to_the_end()
+    test_channel_remembers_only_recent_ids()
+    test_channel_root_is_polled_through_its_videos_tab()
+    print("✅ Subscription tests passed!")
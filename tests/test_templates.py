@@ -0,0 +1,113 @@
+"""
+Test output templates and queue-wide collision handling
+"""
+
+import sys
+import os
+import tempfile
+
+# Add src directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from core.history import DownloadHistory
+from core.model import YouTubeDownloaderModel
+from core.templates import OutputTemplate, PathRegistry, sanitize_component, template_metadata
+from utils.settings import Settings
+
+
+def test_render_folders_and_sanitise():
+    """Fields are sanitised, dates split into folders and long names cut on byte limits"""
+    template = OutputTemplate('{uploader}/{year}-{month}/{title} [{id}]', max_bytes=40)
+    metadata = template_metadata({
+        'id': 'abc123',
+        'title': 'What? A "great" video: part 1/2 ' + 'é' * 40,
+        'uploader': 'CON',
+        'upload_date': '20240315',
+    })
+    
+    path = template.render(metadata)
+    uploader, month, name = path.split(os.sep)
+    
+    assert uploader == '_CON'
+    assert month == '2024-03'
+    assert name.startswith('What_ A _great_ video_ part 1_2')
+    assert len(name.encode('utf-8')) <= 40
+    assert sanitize_component('  trailing dots... ') == 'trailing dots'
+
+
+def test_can_render_needs_every_field():
+    """Flat playlist entries cannot render templates that need the upload date"""
+    entry = template_metadata({'id': 'abc', 'title': 'Title'})
+    
+    assert OutputTemplate('{title} [{id}]').can_render(entry)
+    assert not OutputTemplate('{year}/{title}').can_render(entry)
+    assert OutputTemplate('{year}/{title}').render(entry) == os.path.join('NA', 'Title')
+
+
+def test_registry_resolves_collisions_deterministically():
+    """Duplicate titles get ID suffixes, then counters, including files already on disk"""
+    with tempfile.TemporaryDirectory() as root:
+        with open(os.path.join(root, 'Existing.mp4'), 'w') as fh:
+            fh.write('x')
+        
+        registry = PathRegistry()
+        assert registry.reserve(root, 'Same Title', 'id1') == 'Same Title'
+        assert registry.reserve(root, 'same title', 'id2') == 'same title [id2]'
+        assert registry.reserve(root, 'Same Title', 'id2') == 'Same Title (2)'
+        assert registry.reserve(root, 'Existing', 'id3') == 'Existing [id3]'
+        
+        registry.release(root, 'Same Title')
+        assert registry.reserve(root, 'Same Title', 'id4') == 'Same Title'
+
+
+def test_registry_reuses_names_of_earlier_downloads():
+    """A file on disk from the same video keeps its name; a deleted file frees its name"""
+    with tempfile.TemporaryDirectory() as root:
+        for name in ('Title.mp4', 'Other.mp4', 'Other [id2].mp4'):
+            with open(os.path.join(root, name), 'w') as fh:
+                fh.write('x')
+        
+        owners = {os.path.join(root, 'Title'): 'id1'}
+        registry = PathRegistry(owners.get)
+        assert registry.reserve(root, 'Title', 'id1') == 'Title'
+        assert registry.reserve(root, 'Other', 'id2') == 'Other [id2]'
+        assert registry.reserve(root, 'Title', 'id3') == 'Title [id3]'
+        
+        os.remove(os.path.join(root, 'Title.mp4'))
+        registry.forget(os.path.join(root, 'Title.mp4'))
+        registry.release(root, 'Title')
+        assert registry.reserve(root, 'Title', 'id4') == 'Title'
+
+
+
+def test_model_reuses_names_from_history():
+    """Re-downloading a video keeps the name the history records; released names are free again"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        settings = Settings(os.path.join(temp_dir, 'settings.json'))
+        settings.set('download_path', os.path.join(temp_dir, 'downloads'))
+        model = YouTubeDownloaderModel(settings)
+        try:
+            model.history = DownloadHistory(os.path.join(temp_dir, 'history.jsonl'))
+            filepath = os.path.join(model.download_path, 'Title.mp4')
+            with open(filepath, 'w') as fh:
+                fh.write('x')
+            model.history.record({'id': 'id1', 'filepath': filepath, 'verified': True})
+            
+            assert model.reserve_output_name({'id': 'id1', 'title': 'Title'}) == 'Title'
+            assert model.reserve_output_name({'id': 'id2', 'title': 'Title'}) == 'Title [id2]'
+            model.release_output_name('Title [id2]')
+            assert model.reserve_output_name({'id': 'id2', 'title': 'Title'}) == 'Title [id2]'
+        finally:
+            model.shutdown()
+
+
+if __name__ == "__main__":
+    test_render_folders_and_sanitise()
+    test_can_render_needs_every_field()
+    test_registry_resolves_collisions_deterministically()
+    test_registry_reuses_names_of_earlier_downloads()
+    test_model_reuses_names_from_history()
+    print("Output template tests passed!")
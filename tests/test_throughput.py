@@ -0,0 +1,76 @@
+"""
+Test the adaptive concurrency controller against a simulated link
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# Add src directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from core.throughput import ThroughputController
+
+
+MB = 1024 * 1024
+
+
+def _link(downloads: int, connections: int) -> float:
+    """Bytes per second of a 10 MB/s link where each stream gets at most 1.5 MB/s and congestion hurts"""
+    streams = downloads * connections
+    return min(streams * 1.5 * MB, 10 * MB) - max(0, streams - 12) * 0.4 * MB
+
+
+def _run(controller: ThroughputController, link, samples: int) -> list:
+    """Feed the controller one sample per simulated second"""
+    changes = []
+    controller.on_change = lambda downloads, connections: changes.append((downloads, connections))
+    for second in range(1, samples + 1):
+        controller.add_bytes(int(link(controller.downloads, controller.connections)))
+        controller.tick(now=controller._window_start + 1)
+    return changes
+
+
+def test_climbs_to_the_fastest_setting():
+    """From one stream the controller finds a setting that fills the link, and logs why"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        log_path = os.path.join(temp_dir, 'diagnostics.jsonl')
+        controller = ThroughputController(1, 1, max_downloads=8, max_connections=8, log_path=log_path)
+        changes = _run(controller, _link, 40)
+        
+        assert changes
+        recent = [decision['throughput'] for decision in controller.decisions][-10:]
+        assert sum(recent) / len(recent) >= 0.85 * 10 * MB
+        assert controller.downloads * controller.connections <= 16
+        
+        diagnostics = controller.diagnostics()
+        assert diagnostics['best_throughput'] >= 10 * MB * 0.99
+        assert {decision['action'] for decision in diagnostics['decisions']} >= {'baseline', 'keep', 'revert'}
+        with open(log_path, 'r', encoding='utf-8') as fh:
+            logged = [json.loads(line) for line in fh]
+        assert len(logged) == 40 and all('reason' in entry for entry in logged)
+
+
+def test_backs_off_on_a_congested_link():
+    """Too much parallelism on a slow link is reduced; idle periods are ignored"""
+    def dsl(downloads, connections):
+        streams = downloads * connections
+        return max(0.2 * MB, 2 * MB - (streams - 2) * 0.3 * MB) if streams > 2 else streams * MB
+    
+    controller = ThroughputController(6, 4, max_downloads=8, max_connections=8)
+    _run(controller, dsl, 80)
+    assert controller.downloads * controller.connections <= 6
+    
+    before = (controller.downloads, controller.connections)
+    assert controller.tick(now=controller._window_start + 1) is None
+    assert (controller.downloads, controller.connections) == before
+
+
+if __name__ == "__main__":
+    test_climbs_to_the_fastest_setting()
+    test_backs_off_on_a_congested_link()
+    print("All adaptive concurrency tests passed!")
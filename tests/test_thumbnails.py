@@ -0,0 +1,68 @@
+"""
+Test the thumbnail preview cache
+"""
+
+import sys
+import os
+import tempfile
+
+# Add src directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from core.assets import select_assets
+from core.thumbnails import ThumbnailCache
+
+
+def test_disk_hit_is_promoted_to_memory():
+    """A preview on disk is loaded once and then served from memory"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        fetched = []
+        cache = ThumbnailCache(temp_dir, fetch=lambda url: fetched.append(url))
+        with open(os.path.join(temp_dir, 'abc.png'), 'wb') as fh:
+            fh.write(b'png-bytes')
+        
+        assert cache.get_cached('abc') is None
+        assert cache.load('abc', 'https://i.ytimg.com/vi/abc/mqdefault.jpg').result(timeout=5) == b'png-bytes'
+        assert cache.get_cached('abc') == b'png-bytes'
+        assert fetched == []
+        cache.shutdown()
+
+
+def test_memory_and_disk_limits():
+    """Both caches drop their least recently used previews first"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = ThumbnailCache(temp_dir, memory_items=2, disk_bytes=350)
+        for video_id in ('a', 'b', 'c'):
+            cache._remember(video_id, b'x')
+        assert cache.get_cached('a') is None and cache.get_cached('c') == b'x'
+        
+        for index, video_id in enumerate(('v1', 'v2', 'v3')):
+            cache._write_disk(video_id, b'x' * 100)
+            os.utime(os.path.join(temp_dir, f'{video_id}.png'), (index, index))
+        cache._read_disk('v1')  # Recently used again
+        cache._write_disk('v4', b'x' * 100)
+        
+        assert sorted(os.listdir(temp_dir)) == ['v1.png', 'v3.png', 'v4.png']
+
+
+def test_preview_url_prefers_small_jpeg():
+    """The info window preview uses the smallest JPEG that fills it"""
+    info = {'id': 'abc', 'thumbnails': [
+        {'url': 'https://i.ytimg.com/vi/abc/default.jpg', 'width': 120, 'preference': -10},
+        {'url': 'https://i.ytimg.com/vi/abc/mqdefault.jpg', 'width': 320, 'preference': -5},
+        {'url': 'https://i.ytimg.com/vi_webp/abc/sddefault.webp', 'width': 640, 'preference': 0},
+        {'url': 'https://i.ytimg.com/vi/abc/maxresdefault.jpg', 'width': 1280, 'preference': 1},
+    ]}
+    assets = select_assets(info)
+    assert assets['thumbnail'].endswith('maxresdefault.jpg')
+    assert assets['preview_thumbnail'].endswith('mqdefault.jpg')
+
+
+if __name__ == "__main__":
+    test_disk_hit_is_promoted_to_memory()
+    test_memory_and_disk_limits()
+    test_preview_url_prefers_small_jpeg()
+    print("All thumbnail tests passed!")
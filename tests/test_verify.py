@@ -0,0 +1,123 @@
+"""
+Test verification of finished downloads and the download history
+"""
+
+import sys
+import os
+import hashlib
+import tempfile
+
+# Add src directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from core.history import DownloadHistory
+from core.model import YouTubeDownloaderModel
+from core.verify import Verifier, expected_size, probe_container, verify_file
+from utils.config import Config
+from utils.settings import Settings
+
+
+def test_expected_size():
+    """Exact sizes are used for single formats, approximate sums otherwise"""
+    assert expected_size({'filesize': 1000}) == (1000, True)
+    assert expected_size({'filesize_approx': 1000}) == (1000, False)
+    assert expected_size({'requested_formats': [{'filesize': 700}, {'filesize_approx': 300}]}) == (1000, False)
+    assert expected_size({'title': 'No size'}) is None
+
+
+def test_verify_file_size_and_checksum():
+    """Complete files get a checksum; truncated files are reported as a mismatch"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'video.mp4')
+        with open(path, 'wb') as fh:
+            fh.write(b'x' * 1000)
+        
+        verifier = Verifier(max_workers=2)
+        try:
+            ok = verifier.submit({'filepath': path, 'expected_size': (1000, True)}).result(timeout=5)
+            truncated = verifier.submit({'filepath': path, 'expected_size': (2000, True)}).result(timeout=5)
+        finally:
+            verifier.shutdown()
+        
+        assert ok['success']
+        assert ok['checksum'] == 'sha256:' + hashlib.sha256(b'x' * 1000).hexdigest()
+        assert not truncated['success'] and truncated['mismatch']
+        assert verify_file({'filepath': path, 'expected_size': (1030, False)})['success']
+        assert verify_file({'filepath': path, 'expected_size': (900, True)})['success']  # Only a shortfall counts
+        assert verify_file({'filepath': os.path.join(temp_dir, 'missing.mp4')})['mismatch']
+
+
+def test_history_round_trip():
+    """History entries are appended and read back in order, skipping damaged lines"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        history = DownloadHistory(os.path.join(temp_dir, 'history.jsonl'))
+        assert list(history.iter_entries()) == []
+        
+        history.record({'url': 'https://youtu.be/a', 'verified': True})
+        with open(history.path, 'a', encoding='utf-8') as fh:
+            fh.write('{"url": "cut short\n')
+        history.record({'url': 'https://youtu.be/b', 'verified': False})
+        
+        entries = list(history.iter_entries())
+        assert [entry['url'] for entry in entries] == ['https://youtu.be/a', 'https://youtu.be/b']
+        assert all(entry['timestamp'] for entry in entries)
+
+
+
+def test_probe_ignores_warnings():
+    """ffprobe warnings are not a mismatch; a failed probe or a short duration is"""
+    if os.name != 'posix':
+        return
+    with tempfile.TemporaryDirectory() as temp_dir:
+        fake = os.path.join(temp_dir, 'ffprobe')
+        with open(fake, 'w') as fh:
+            fh.write('#!/bin/sh\necho "$FAKE_WARNING" >&2\necho "$FAKE_DURATION"\nexit "$FAKE_EXIT"\n')
+        os.chmod(fake, 0o755)
+        original = Config.FFPROBE_PATH
+        Config.FFPROBE_PATH = fake
+        try:
+            def probe(warning, duration, code):
+                os.environ.update(FAKE_WARNING=warning, FAKE_DURATION=duration, FAKE_EXIT=str(code))
+                return probe_container(fake, 100)
+            
+            assert probe('Invalid timestamp in stream 1', '100.0', 0) is None
+            assert probe('', 'N/A', 0) is None
+            assert 'shorter' in probe('', '50.0', 0)
+            assert probe('moov atom not found', '', 1) == 'moov atom not found'
+        finally:
+            Config.FFPROBE_PATH = original
+            for name in ('FAKE_WARNING', 'FAKE_DURATION', 'FAKE_EXIT'):
+                os.environ.pop(name, None)
+
+
+def test_incomplete_files_are_renamed_unless_deletion_is_enabled():
+    """discard_download keeps the file as <name>.incomplete by default"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        settings = Settings(os.path.join(temp_dir, 'settings.json'))
+        settings.set('download_path', temp_dir)
+        model = YouTubeDownloaderModel(settings)
+        try:
+            path = os.path.join(temp_dir, 'video.mp4')
+            for delete in (False, True):
+                with open(path, 'wb') as fh:
+                    fh.write(b'partial')
+                settings.set('verify_delete_incomplete', delete)
+                kept = model.discard_download(path)
+                assert not os.path.exists(path)
+                assert kept == (None if delete else path + '.incomplete')
+            assert os.path.exists(path + '.incomplete')
+        finally:
+            model.shutdown()
+
+
+if __name__ == "__main__":
+    print("Testing download verification...")
+    test_expected_size()
+    test_verify_file_size_and_checksum()
+    test_history_round_trip()
+    test_probe_ignores_warnings()
+    test_incomplete_files_are_renamed_unless_deletion_is_enabled()
+    print("✅ Verification tests passed!")
@@ -0,0 +1,61 @@
+"""
+Test the buffered download writer
+"""
+
+import sys
+import os
+import tempfile
+
+# Add src directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from core.writer import DownloadWriter
+
+
+def test_streams_write_large_aligned_blocks():
+    """Small blocks from two connections end up as a few aligned writes in the right places"""
+    data = os.urandom(200_000)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'video.mp4.part')
+        with DownloadWriter(path, len(data), buffer_size=32 * 1024, fsync='end') as writer:
+            halves = [(0, 100_000), (100_000, 200_000)]
+            streams = [writer.stream(start) for start, _ in halves]
+            for position in range(0, 100_000, 1000):
+                for stream, (start, _) in zip(streams, halves):
+                    stream.write(data[start + position:start + position + 1000])
+            for stream in streams:
+                flushed_from = stream.offset
+                assert flushed_from % 4096 == 0 or flushed_from == 100_000
+                stream.flush()
+            assert writer.writes <= 2 * (100_000 // (32 * 1024) + 2)
+            assert os.path.getsize(path) == len(data)
+        
+        with open(path, 'rb') as fh:
+            assert fh.read() == data
+
+
+def test_wrong_size_hint_is_trimmed():
+    """A file preallocated from a bad size hint is cut to the bytes actually written"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'video.mp4.part')
+        with DownloadWriter(path, 10_000, buffer_size=0, allocate=True) as writer:
+            assert os.path.getsize(path) == 10_000
+            stream = writer.stream()
+            stream.write(b'x' * 6000)
+            assert writer.writes == 1
+        assert os.path.getsize(path) == 6000
+        
+        try:
+            DownloadWriter(path, fsync='sometimes')
+            assert False, 'unknown fsync policy accepted'
+        except ValueError:
+            pass
+
+
+if __name__ == "__main__":
+    test_streams_write_large_aligned_blocks()
+    test_wrong_size_hint_is_trimmed()
+    print("All writer tests passed!")